@@ -0,0 +1,135 @@
+"""Peak memory of large proofs, measured with tracemalloc.
+
+Run from the repository root:
+
+    python -m benchmarks.memory [lines] [width]
+
+Besides the measured sizes, each build reports what it would retain if its __slots__ classes
+used the default __dict__ layout instead, estimated from the per-instance cost of both
+layouts on this interpreter, and the ratio of the two.
+"""
+from array import array
+from collections import Counter
+import gc
+import sys
+import tracemalloc
+
+from src.core.arena import SentenceArena
+from src.core.proof import Proof
+from src.parsing.proof_parser import line2sequent, gamma_cache
+from src.parsing.propositional_parser import parse_cache, parse_uncached
+
+def proof_lines(lines: int, width: int):
+    """Generate a sequent proof whose lines have wide, mostly distinct gammas."""
+    for i in range(lines):
+        gamma = [rf"(P{j} \implies P{j + 1}) \and (\not Q{j % 97})" for j in range(i, i + width)]
+        yield f"[{', '.join(gamma)}] |- {gamma[i % width]} :AX"
+
+def measure(build):
+    """Run build and return its result, the bytes still allocated for it, and the peak."""
+    parse_cache.clear()
+    gamma_cache.clear()
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    parse_cache.clear()
+    gamma_cache.clear()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak
+
+def slot_names(cls) -> list:
+    """Get the instance attributes a class declares in __slots__, across its bases."""
+    names = []
+    for base in cls.__mro__:
+        slots = base.__dict__.get("__slots__", ())
+        names += [slots] if isinstance(slots, str) else [name for name in slots if name != "__weakref__"]
+    return names
+
+def is_slotted(cls) -> bool:
+    """Check whether instances of a class have no __dict__."""
+    return cls.__module__.startswith("src.") and "__dict__" not in dir(cls) and "__slots__" in cls.__dict__
+
+def instance_cost(make, count: int = 2000) -> float:
+    """Bytes tracemalloc sees per object made by make."""
+    gc.collect()
+    tracemalloc.start()
+    objects = [make() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - sys.getsizeof(objects)
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+def dict_layout_extra(cls) -> float:
+    """Bytes per instance a class would take in addition if it used __dict__ instead of __slots__."""
+    names = slot_names(cls)
+    unslotted = type(cls.__name__, (), {})
+
+    def make_unslotted():
+        obj = unslotted()
+        for name in names:
+            setattr(obj, name, None)
+        return obj
+
+    return instance_cost(make_unslotted) - instance_cost(lambda: object.__new__(cls))
+
+def slotted_instances(root) -> Counter:
+    """Count the instances of __slots__ classes reachable from root."""
+    counts = Counter()
+    seen = {id(root)}
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if is_slotted(type(obj)):
+            counts[type(obj)] += 1
+        for child in gc.get_referents(obj):
+            if id(child) not in seen and not isinstance(child, type):
+                seen.add(id(child))
+                stack.append(child)
+    return counts
+
+def build_proof(lines, width):
+    proof = Proof()
+    for number, line in enumerate(proof_lines(lines, width), 1):
+        proof.add_sequent(line2sequent(line), line=number)
+    return proof
+
+def build_sequents(lines, width):
+    return [line2sequent(line) for line in proof_lines(lines, width)]
+
+def build_arena(lines, width):
+    # each sentence is parsed past the caches and dropped once its nodes are in the arena, so
+    # no Sentence trees are kept alongside it; repeated texts are looked up by their node id
+    arena = SentenceArena()
+    ids = {}
+    gammas = []
+    for line in proof_lines(lines, width):
+        assumptions, conclusion = line.split("|-")
+        texts = [text.strip() for text in assumptions.strip().strip("[]").split(",")]
+        texts.append(conclusion.rsplit(":", 1)[0].strip())
+        row = array("i")
+        for text in texts:
+            sid = ids.get(text)
+            if sid is None:
+                sid = ids[text] = arena.add(parse_uncached(text))
+            row.append(sid)
+        gammas.append(row)
+    return arena, gammas
+
+def main(lines: int = 10000, width: int = 20):
+    print(f"{lines} lines, {width} assumptions per line")
+    extra = {}
+    for name, build in [("checked Proof", build_proof), ("parsed Sequents", build_sequents), ("SentenceArena", build_arena)]:
+        result, retained, peak = measure(lambda: build(lines, width))
+        counts = slotted_instances(result)
+        for cls in counts:
+            if cls not in extra:
+                extra[cls] = dict_layout_extra(cls)
+        unslotted = retained + sum(count * extra[cls] for cls, count in counts.items())
+        del result
+        print(f"{name:>16}: {retained / 2 ** 20:8.1f} MiB retained, {peak / 2 ** 20:8.1f} MiB peak, "
+              f"{unslotted / 2 ** 20:8.1f} MiB with __dict__ instances ({retained / unslotted:.2f}x)")
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,89 @@
+"""Check proof files from the command line, writing one JSON line per file.
+
+    python -m src.check [-j WORKERS] [--style STYLE] [--summary] [-o OUT] PATH [PATH ...]
+
+A PATH can be a file, a directory, which is searched recursively for files matching
+--include, or a glob such as "proofs/**/*.txt". The exit status is 0 if every proof is
+valid, 1 if any is not, and 2 for bad arguments.
+"""
+from typing import Iterator, List, Optional
+import argparse
+import fnmatch
+import glob
+import json
+import os
+import sys
+
+from src.check.batch import check_files
+from src.check.proofs import STYLES
+
+def expand_paths(patterns: List[str], include: str = "*") -> Iterator[str]:
+    """Expand files, directories and globs into proof file paths.
+
+    Args:
+        patterns: Paths and glob patterns from the command line
+        include: Pattern the names of files found in directories must match
+
+    Returns:
+        Iterator over file paths, each directory's files in sorted order
+
+    Raises:
+        FileNotFoundError: If a pattern matches nothing
+    """
+    for pattern in patterns:
+        if os.path.exists(pattern) or not glob.has_magic(pattern):
+            matches = [pattern]
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True))
+        if not matches or not os.path.exists(matches[0]):
+            raise FileNotFoundError(f"No proof files match {pattern}!")
+        for match in matches:
+            if not os.path.isdir(match):
+                yield match
+                continue
+            for root, dirs, files in os.walk(match):
+                dirs.sort()
+                for name in sorted(files):
+                    if fnmatch.fnmatch(name, include):
+                        yield os.path.join(root, name)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line checker.
+
+    Args:
+        argv: Command line arguments; defaults to sys.argv[1:]
+
+    Returns:
+        Exit status
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.check", description="Check sequent and Fitch proof files.")
+    parser.add_argument("paths", nargs="+", help="proof files, directories or globs")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: number of CPUs)")
+    parser.add_argument("--style", choices=STYLES + ("auto",), default="auto",
+                        help="proof style; auto treats files whose first line has |- as sequent proofs")
+    parser.add_argument("--include", default="*", help="file name pattern for files found in directories")
+    parser.add_argument("--summary", action="store_true", help="leave out per-line results")
+    parser.add_argument("-o", "--output", default="-", help="file to write JSON lines to (default: stdout)")
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be positive")
+
+    try:
+        paths = list(expand_paths(args.paths, args.include))
+    except FileNotFoundError as e:
+        parser.error(str(e))
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    all_valid = True
+    try:
+        for result in check_files(paths, workers=args.workers, style=args.style, keep_results=not args.summary):
+            all_valid = all_valid and result['valid']
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0 if all_valid else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Union
+import os
+import time
+import traceback
+
+from src.check.proofs import check_proof, iter_file_results, summarize, STYLES
+
+def timed_check(proof: str, style: str = "sequent") -> dict:
+    """Check one proof, reporting how long it took.
+
+    Errors while checking are reported in the result instead of raised, so one malformed
+    submission does not abort a batch.
+
+    Args:
+        proof: Proof text, one line per step
+        style: "sequent" or "fitch"
+
+    Returns:
+        The check_proof result with an added 'time' entry in seconds
+    """
+    start = time.perf_counter()
+    try:
+        result = check_proof(proof, style)
+    except Exception as e:
+        result = {
+            'valid': False,
+            'error': f'Server error: {str(e)}',
+            'traceback': traceback.format_exc()
+        }
+    result['time'] = time.perf_counter() - start
+    return result
+
+def detect_style(path: Union[str, os.PathLike]) -> str:
+    """Guess the style of a proof file from its first non-empty line.
+
+    Args:
+        path: Path of the proof file
+
+    Returns:
+        "sequent" if that line has a turnstile "|-", else "fitch"
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                return "sequent" if "|-" in line else "fitch"
+    return "sequent"
+
+def timed_check_file(path: Union[str, os.PathLike], style: str = "auto", keep_results: bool = True) -> dict:
+    """Check one proof file, reading it line by line, and report how long it took.
+
+    Errors while reading or checking are reported in the result instead of raised.
+
+    Args:
+        path: Path of the proof file
+        style: "sequent", "fitch" or "auto" to pick one with detect_style
+        keep_results: Include the per-line results; without them memory does not grow with
+            the number of lines reported
+
+    Returns:
+        Dict with the path, the style, overall validity, the per-line results unless left
+        out, their count and the time taken in seconds
+    """
+    start = time.perf_counter()
+    result = {'path': str(path), 'style': style}
+    try:
+        if style == "auto":
+            result['style'] = detect_style(path)
+        results = iter_file_results(path, result['style'])
+        if keep_results:
+            result.update(summarize(list(results)))
+        else:
+            count, invalid = 0, 0
+            for line_result in results:
+                count += 1
+                invalid += not line_result['valid']
+            result.update({'valid': invalid == 0, 'total_lines': count})
+    except Exception as e:
+        result.update({
+            'valid': False,
+            'error': f'Error checking {path}: {str(e)}',
+            'traceback': traceback.format_exc()
+        })
+    result['time'] = time.perf_counter() - start
+    return result
+
+def _check_chunk(check: Callable[..., dict], items: list, style: str) -> List[dict]:
+    return [check(item, style) for item in items]
+
+def _map_ordered(check: Callable[..., dict], items: Iterable, workers: Optional[int], style: str, chunksize: int) -> Iterator[dict]:
+    # run check(item, style) over a pool, keeping only a few chunks per worker in flight
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1 or chunksize < 1:
+        raise ValueError("workers and chunksize must be positive!")
+
+    items = iter(items)
+    if workers == 1:
+        for item in items:
+            yield check(item, style)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(islice(items, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_check_chunk, check, chunk, style))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+def check_proofs(proofs: Iterable[str], workers: Optional[int] = None, style: str = "sequent", chunksize: int = 16) -> Iterator[dict]:
+    """Check independent proofs across a pool of worker processes.
+
+    Proofs are sent to the workers in chunks, and only a few chunks per worker are in flight
+    at a time, so the input can be an arbitrarily long iterator.
+
+    Args:
+        proofs: Proof texts, one line per step
+        workers: Number of worker processes; defaults to the number of CPUs, and 1 checks
+            everything in the calling process
+        style: "sequent" or "fitch"
+        chunksize: Number of proofs sent to a worker at once
+
+    Returns:
+        Iterator over one timed result per proof, in input order, yielded as soon as it and
+        every result before it are ready
+    """
+    if style not in STYLES:
+        raise ValueError(f"Proof style {style} not supported! Expected one of {STYLES}")
+    return _map_ordered(timed_check, proofs, workers, style, chunksize)
+
+def check_files(paths: Iterable[Union[str, os.PathLike]], workers: Optional[int] = None, style: str = "auto", chunksize: int = 1, keep_results: bool = True) -> Iterator[dict]:
+    """Check proof files across a pool of worker processes.
+
+    Each worker reads its files itself, line by line, so only paths and results cross
+    process boundaries.
+
+    Args:
+        paths: Paths of the proof files
+        workers: Number of worker processes; defaults to the number of CPUs, and 1 checks
+            everything in the calling process
+        style: "sequent", "fitch" or "auto" to detect the style of each file
+        chunksize: Number of files sent to a worker at once
+        keep_results: Include the per-line results of each file
+
+    Returns:
+        Iterator over one timed_check_file result per path, in input order
+    """
+    if style != "auto" and style not in STYLES:
+        raise ValueError(f"Proof style {style} not supported! Expected one of {STYLES + ('auto',)}")
+    return _map_ordered(partial(timed_check_file, keep_results=keep_results), paths, workers, style, chunksize)
@@ -0,0 +1,293 @@
+from typing import IO, Iterable, Iterator, List, Tuple, Union
+import os
+from src.core.errors import ParseError
+from src.core.proof import Proof, Sequent, InferenceRule
+from src.core.fitch_style import FitchSubProof
+from src.core.ir import ProofIR, IRRecorder, RULES, ACCEPTED, REJECTED, PARSE_ERROR, check_ir
+from src.core.sentence import Gamma
+from src.parsing.proof_parser import line2sequent, line2conclusion
+
+STYLES = ("sequent", "fitch")
+
+def _sequent_steps(proof_lines: Iterable[str]) -> Iterator[Tuple[int, Union[Sequent, ParseError]]]:
+    # (line number, parsed sequent or the parse error) for each non-empty line
+    for i, line in enumerate(proof_lines):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield i + 1, line2sequent(line)
+        except ParseError as e:
+            yield i + 1, e
+
+def _fitch_steps(proof_lines: Iterable[str], fs: FitchSubProof) -> Iterator[Tuple[int, FitchSubProof, Union[tuple, ParseError]]]:
+    # (line number, scope, parsed line or the parse error) for each non-empty line, moving
+    # between scopes by indentation and "--" lines
+    space_count = 0
+
+    for i, line in enumerate(proof_lines):
+        if line == "--":
+            fs.close()
+            fs = fs.outer_proof
+            space_count -= 1
+            continue
+
+        line = line.rstrip()
+        if not line:
+            continue
+
+        ind = 0
+        while line[ind] == " ":
+            ind += 1
+
+        if ind < space_count:
+            fs.close()
+            fs = fs.outer_proof
+        elif ind > space_count:
+            fs = fs.add_subproof()
+
+        space_count = ind
+
+        try:
+            yield i + 1, fs, line2conclusion(line[ind:])
+        except ParseError as e:
+            yield i + 1, fs, e
+
+def iter_sequent_results(proof_lines: Iterable[str]) -> Iterator[dict]:
+    """Check a sequent-style proof line by line.
+
+    Args:
+        proof_lines: Lines in format "[assumptions] |- conclusion :RULE"
+
+    Returns:
+        Iterator over one result dict per non-empty line, yielded as soon as the line is checked
+    """
+    # the proof is never edited, so it only keeps the facts lines derive
+    proof = Proof(track_edits=False)
+
+    for number, sequent in _sequent_steps(proof_lines):
+        if isinstance(sequent, ParseError):
+            yield {
+                'line': number,
+                'valid': False,
+                'error': sequent.args[0]
+            }
+            continue
+
+        if proof.add_sequent(sequent, line=number):
+            yield {
+                'line': number,
+                'valid': True,
+                'sequent': str(sequent)
+            }
+        else:
+            yield {
+                'line': number,
+                'valid': False,
+                'error': f'Invalid inference for rule {sequent.rule}'
+            }
+
+def iter_fitch_results(proof_lines: Iterable[str]) -> Iterator[dict]:
+    """Check a Fitch-style proof line by line.
+
+    Subproofs are opened by indenting and closed by dedenting or by a "--" line.
+
+    Args:
+        proof_lines: Lines in format "conclusion :RULE", indented by subproof depth
+
+    Returns:
+        Iterator over one result dict per non-empty line, yielded as soon as the line is checked
+    """
+    for number, fs, parsed in _fitch_steps(proof_lines, FitchSubProof()):
+        if isinstance(parsed, ParseError):
+            yield {
+                'line': number,
+                'valid': False,
+                'error': parsed.args[0]
+            }
+            continue
+
+        conclusion, rule, premises = parsed
+        if rule == InferenceRule.axiom:
+            val = fs.add_assumption(conclusion, line=number)
+        else:
+            val = fs.add_conclusion(conclusion, rule, premises=premises, line=number)
+
+        if val:
+            yield {
+                'line': number,
+                'valid': True,
+                'sequent': "hi"
+            }
+        else:
+            yield {
+                'line': number,
+                'valid': False,
+                'error': f'Invalid inference for rule {rule}'
+            }
+
+def iter_results(proof_lines: Iterable[str], style: str = "sequent") -> Iterator[dict]:
+    """Check a proof of the given style line by line.
+
+    Args:
+        proof_lines: Lines of the proof
+        style: "sequent" or "fitch"
+
+    Returns:
+        Iterator over one result dict per non-empty line
+    """
+    if style == "sequent":
+        return iter_sequent_results(proof_lines)
+    elif style == "fitch":
+        return iter_fitch_results(proof_lines)
+    else:
+        raise ValueError(f"Proof style {style} not supported! Expected one of {STYLES}")
+
+def _text_lines(lines: Iterable[Union[str, bytes]]) -> Iterator[str]:
+    # lines as read from a file: decode bytes and drop the line ending, keeping indentation
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        yield line.rstrip("\r\n")
+
+def iter_line_results(lines: Union[IO, Iterable[Union[str, bytes]]], style: str = "sequent") -> Iterator[dict]:
+    """Check a proof read lazily from an iterator of lines, such as an open file.
+
+    Lines are consumed one at a time as results are requested, so memory is bounded by the
+    checked proof rather than the input. Line endings are dropped; unlike check_proof, the
+    text is not stripped, so line numbers are those of the input.
+
+    Args:
+        lines: Text or binary file object, or any iterable of lines with or without their
+            line endings
+        style: "sequent" or "fitch"
+
+    Returns:
+        Iterator over one result dict per non-empty line
+    """
+    if isinstance(lines, (str, bytes)):
+        raise TypeError("Expected an iterable of lines, not a whole proof; use check_proof for proof text")
+    return iter_results(_text_lines(lines), style)
+
+def iter_file_results(path: Union[str, os.PathLike], style: str = "sequent", encoding: str = "utf-8") -> Iterator[dict]:
+    """Check a proof file line by line without reading it into memory.
+
+    Args:
+        path: Path of the proof file
+        style: "sequent" or "fitch"
+        encoding: Text encoding of the file
+
+    Returns:
+        Iterator over one result dict per non-empty line; the file is closed once it is
+        exhausted
+    """
+    if style not in STYLES:
+        raise ValueError(f"Proof style {style} not supported! Expected one of {STYLES}")
+    return _file_results(path, style, encoding)
+
+def _file_results(path, style, encoding):
+    with open(path, encoding=encoding) as f:
+        yield from iter_line_results(f, style)
+
+def lower_proof(proof_lines: Iterable[str], style: str = "sequent") -> ProofIR:
+    """Parse a proof and lower it to integer-indexed form for check_ir.
+
+    Args:
+        proof_lines: Lines of the proof
+        style: "sequent" or "fitch"
+
+    Returns:
+        ProofIR with one row per sequent to check and one report entry per non-empty line
+    """
+    if style == "sequent":
+        ir = ProofIR()
+        for number, sequent in _sequent_steps(proof_lines):
+            if isinstance(sequent, ParseError):
+                ir.report(number, PARSE_ERROR, sequent.args[0])
+            else:
+                ir.report(number, ir.add_row(sequent, number))
+    elif style == "fitch":
+        ir = ProofIR(implicit_axioms=True)
+        recorder = IRRecorder(ir)
+        for number, fs, parsed in _fitch_steps(proof_lines, FitchSubProof(proof=recorder)):
+            if isinstance(parsed, ParseError):
+                ir.report(number, PARSE_ERROR, parsed.args[0])
+                continue
+            conclusion, rule, premises = parsed
+            if rule == InferenceRule.axiom:
+                # assumptions are checked when their scope is loaded, and always hold there
+                ir.report(number, ACCEPTED if fs.add_assumption(conclusion, line=number) else REJECTED)
+            else:
+                fs.add_conclusion(conclusion, rule, premises=premises, line=number)
+                ir.report(number, recorder.last_row)
+    else:
+        raise ValueError(f"Proof style {style} not supported! Expected one of {STYLES}")
+    return ir
+
+def iter_ir_results(ir: ProofIR) -> Iterator[dict]:
+    """Check a lowered proof and report it like iter_results does.
+
+    Args:
+        ir: Proof lowered by lower_proof
+
+    Returns:
+        Iterator over one result dict per reported line
+    """
+    accepted = check_ir(ir)
+    arena = ir.arena
+    for number, row in zip(ir.report_lines, ir.report_rows):
+        if row == PARSE_ERROR:
+            yield {
+                'line': number,
+                'valid': False,
+                'error': ir.errors[number]
+            }
+            continue
+
+        rule = InferenceRule.axiom if row < 0 else RULES[ir.rules[row]]
+        if row == ACCEPTED or row >= 0 and accepted[row]:
+            if ir.implicit_axioms:
+                text = "hi"
+            else:
+                gamma = Gamma([arena.sentence(sid) for sid in ir.contexts[ir.context_ids[row]]])
+                text = str(Sequent(gamma, arena.sentence(ir.conclusions[row]), rule, ir.row_premises(row)))
+            yield {
+                'line': number,
+                'valid': True,
+                'sequent': text
+            }
+        else:
+            yield {
+                'line': number,
+                'valid': False,
+                'error': f'Invalid inference for rule {rule}'
+            }
+
+def summarize(results: List[dict]) -> dict:
+    """Build the response body for a checked proof.
+
+    Args:
+        results: Per-line result dicts
+
+    Returns:
+        Dict with overall validity, the per-line results and their count
+    """
+    all_valid = all(result['valid'] for result in results)
+
+    return {
+        'valid': all_valid,
+        'results': results,
+        'total_lines': len(results)
+    }
+
+def check_proof(proof: str, style: str = "sequent") -> dict:
+    """Check a complete proof text the way the web endpoints do.
+
+    Args:
+        proof: Proof text, one line per step
+        style: "sequent" or "fitch"
+
+    Returns:
+        Dict with overall validity, the per-line results and their count
+    """
+    return summarize(list(iter_results(proof.strip().split('\n'), style)))
@@ -0,0 +1,345 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, List, Optional, Tuple, Union
+import secrets
+import time
+
+from src.core.errors import ParseError
+from src.core.proof import Proof, Sequent
+from src.parsing.proof_parser import line2sequent
+from src.check.proofs import iter_fitch_results, summarize, STYLES
+
+PATCH_OPS = ("insert", "replace", "delete")
+
+def _parse_patches(patches: list, length: int) -> List[Tuple[str, int, str]]:
+    # validate a whole patch list up front, so a bad patch leaves the session untouched;
+    # returns (op, 0-based index, text) triples
+    if not isinstance(patches, list):
+        raise ValueError("patches must be a list!")
+    ops = []
+    for patch in patches:
+        if not isinstance(patch, dict):
+            raise ValueError("Each patch must be an object!")
+        op, line, text = patch.get('op'), patch.get('line'), patch.get('text', '')
+        if op not in PATCH_OPS:
+            raise ValueError(f"Patch op {op} not supported! Expected one of {PATCH_OPS}")
+        if not isinstance(line, int) or isinstance(line, bool):
+            raise ValueError("Patch line must be an integer!")
+        if not isinstance(text, str) or "\n" in text:
+            raise ValueError("Patch text must be a single line!")
+        # inserting at length + 1 appends
+        last = length + 1 if op == "insert" else length
+        if not 1 <= line <= last:
+            raise ValueError(f"Patch line {line} out of range 1-{last}!")
+        length += 1 if op == "insert" else -1 if op == "delete" else 0
+        ops.append((op, line - 1, text))
+    return ops
+
+class ProofSession:
+    """A proof kept on the server between edits, so a client only sends the lines it changed.
+
+    Results are kept per line without their line number, so inserting or deleting a line
+    moves the later results along with their lines, and a patch reports only the lines whose
+    result actually differs.
+    """
+    style: str
+    lines: List[str]
+    def __init__(self, proof: str):
+        """Initialize a session and check its proof.
+
+        Args:
+            proof: Proof text, one line per step
+        """
+        self.lines = proof.strip().split('\n')
+        # 0-based line index -> result without its 'line' entry, None for lines not reported
+        self._results: List[Optional[dict]] = [None] * len(self.lines)
+        self._load()
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _edit(self, ops: List[Tuple[str, int, str]]):
+        raise NotImplementedError
+
+    def results(self) -> List[dict]:
+        """Get the current result of every reported line."""
+        return [{'line': i + 1, **result} for i, result in enumerate(self._results) if result is not None]
+
+    def apply(self, patches: list) -> dict:
+        """Apply line patches in order and re-check what they affect.
+
+        Each patch is a dict with 'op' ("insert", "replace" or "delete"), 'line' (1-based, in
+        the numbering left by the patches before it) and, except for deletes, 'text'. An
+        insert at line k makes the new line line k, moving line k and later lines down.
+
+        Args:
+            patches: List of patches
+
+        Returns:
+            Dict with overall validity, the results that changed and the line numbers that
+            no longer have a result, all in the numbering after the patches, and the number
+            of reported lines
+
+        Raises:
+            ValueError: If a patch is malformed or out of range; no patch is applied then
+        """
+        ops = _parse_patches(patches, len(self.lines))
+        # what the client holds after moving its results the way the patches move lines
+        before = list(self._results)
+        for op, index, _ in ops:
+            if op == "insert":
+                before.insert(index, None)
+            elif op == "delete":
+                del before[index]
+        self._edit(ops)
+
+        changed, removed = [], []
+        for i, (old, new) in enumerate(zip(before, self._results)):
+            if old is new or old == new:
+                continue
+            if new is None:
+                removed.append(i + 1)
+            else:
+                changed.append({'line': i + 1, **new})
+        reported = [result for result in self._results if result is not None]
+        return {
+            'valid': all(result['valid'] for result in reported),
+            'changed': changed,
+            'removed': removed,
+            'total_lines': len(reported)
+        }
+
+class SequentSession(ProofSession):
+    """Session for a sequent-style proof, re-checking only the lines an edit can affect."""
+    style = "sequent"
+    def _load(self):
+        self._proof = Proof()
+        self._parsed: List[Union[Sequent, ParseError, None]] = []
+        for i, line in enumerate(self.lines):
+            parsed = self._parse(line)
+            self._parsed.append(parsed)
+            if isinstance(parsed, Sequent):
+                self._set_result(i, self._proof.add_sequent(parsed, line=i + 1))
+            else:
+                self._set_result(i)
+
+    @staticmethod
+    def _parse(line: str) -> Union[Sequent, ParseError, None]:
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            return line2sequent(line)
+        except ParseError as e:
+            return e
+
+    def _set_result(self, index: int, accepted: bool = False):
+        parsed = self._parsed[index]
+        if parsed is None:
+            result = None
+        elif isinstance(parsed, ParseError):
+            result = {'valid': False, 'error': parsed.args[0]}
+        elif accepted:
+            result = {'valid': True, 'sequent': str(parsed)}
+        else:
+            result = {'valid': False, 'error': f'Invalid inference for rule {parsed.rule}'}
+        self._results[index] = result
+
+    def _edit(self, ops: List[Tuple[str, int, str]]):
+        for op, index, text in ops:
+            line = index + 1
+            if op == "delete":
+                del self.lines[index], self._parsed[index], self._results[index]
+                statuses = self._proof.remove_line(line)
+            else:
+                parsed = self._parse(text)
+                if op == "insert":
+                    self.lines.insert(index, text)
+                    self._parsed.insert(index, parsed)
+                    self._results.insert(index, None)
+                    statuses = self._proof.insert_line(line, parsed if isinstance(parsed, Sequent) else None)
+                else:
+                    had_sequent = isinstance(self._parsed[index], Sequent)
+                    self.lines[index] = text
+                    self._parsed[index] = parsed
+                    if isinstance(parsed, Sequent):
+                        statuses = self._proof.replace_line(line, parsed)
+                    elif had_sequent:
+                        statuses = self._proof.delete_line(line)
+                    else:
+                        statuses = {}
+                if not isinstance(parsed, Sequent):
+                    self._set_result(index)
+            for checked, accepted in statuses.items():
+                self._set_result(checked - 1, accepted)
+
+class FitchSession(ProofSession):
+    """Session for a Fitch-style proof.
+
+    An edit can open or close subproofs and so change the scope of every later line, so the
+    whole proof is re-checked; only the changed results are sent back.
+    """
+    style = "fitch"
+    def _load(self):
+        self._results = self._check(self.lines)
+
+    @staticmethod
+    def _check(lines: List[str]) -> List[Optional[dict]]:
+        results = [None] * len(lines)
+        for result in iter_fitch_results(lines):
+            result = dict(result)
+            results[result.pop('line') - 1] = result
+        return results
+
+    def _edit(self, ops: List[Tuple[str, int, str]]):
+        lines = list(self.lines)
+        for op, index, text in ops:
+            if op == "insert":
+                lines.insert(index, text)
+            elif op == "replace":
+                lines[index] = text
+            else:
+                del lines[index]
+        # check before committing, so a proof the checker cannot handle leaves the session as it was
+        results = self._check(lines)
+        self.lines, self._results = lines, results
+
+_SESSION_TYPES = {"sequent": SequentSession, "fitch": FitchSession}
+
+class _Entry:
+    """A stored session with its edit lock, last use and the line count it is charged for."""
+    __slots__ = ("session", "lock", "used", "size")
+    def __init__(self, session: ProofSession, used: float):
+        self.session = session
+        self.lock = Lock()
+        self.used = used
+        self.size = len(session.lines)
+
+class SessionStore:
+    """Thread-safe set of proof sessions that evicts idle and least recently used sessions.
+
+    A session expires once it has not been used for ttl seconds. The total number of proof
+    lines across sessions stands in for their memory use: past max_lines, the least recently
+    used sessions are evicted until the total fits again.
+
+    The store lock only guards the table of sessions; edits to a session are serialized by
+    that session's own lock, so checking one session does not hold up the others.
+    """
+    def __init__(self, ttl: float = 1800.0, max_lines: int = 200_000, clock: Callable[[], float] = time.monotonic):
+        """Initialize an empty store.
+
+        Args:
+            ttl: Seconds a session may stay idle before it is evicted
+            max_lines: Total proof lines kept across sessions before evicting; the session
+                being used is never evicted for size
+            clock: Time source in seconds
+        """
+        if ttl <= 0 or max_lines < 1:
+            raise ValueError("ttl and max_lines must be positive!")
+        self.ttl = ttl
+        self.max_lines = max_lines
+        self._clock = clock
+        # session id -> entry, least recently used first
+        self._sessions: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._total_lines = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        """Get the number of live sessions."""
+        with self._lock:
+            self._evict()
+            return len(self._sessions)
+
+    def __contains__(self, session_id: str):
+        """Check whether a session is live."""
+        with self._lock:
+            self._evict()
+            return session_id in self._sessions
+
+    def create(self, proof: str, style: str = "sequent") -> Tuple[str, dict]:
+        """Start a session and check its proof.
+
+        Args:
+            proof: Proof text, one line per step
+            style: "sequent" or "fitch"
+
+        Returns:
+            The new session id, and a dict with overall validity, the per-line results and
+            their count
+        """
+        if style not in STYLES:
+            raise ValueError(f"Proof style {style} not supported! Expected one of {STYLES}")
+        session = _SESSION_TYPES[style](proof)
+        session_id = secrets.token_urlsafe(16)
+        with self._lock:
+            entry = self._sessions[session_id] = _Entry(session, self._clock())
+            self._total_lines += entry.size
+            self._evict()
+        return session_id, summarize(session.results())
+
+    def patch(self, session_id: str, patches: list) -> dict:
+        """Apply line patches to a session, see ProofSession.apply.
+
+        Args:
+            session_id: Id returned by create
+            patches: List of patches
+
+        Returns:
+            Dict with overall validity, the changed results, the removed line numbers and
+            the number of reported lines
+
+        Raises:
+            KeyError: If there is no live session with the id
+            ValueError: If a patch is malformed or out of range
+        """
+        entry = self._touch(session_id)
+        with entry.lock:
+            try:
+                return entry.session.apply(patches)
+            finally:
+                size = len(entry.session.lines)
+                with self._lock:
+                    # the session may have been closed or evicted while it was being edited
+                    if self._sessions.get(session_id) is entry:
+                        self._total_lines += size - entry.size
+                        entry.size = size
+                        self._touch_entry(session_id, entry)
+                        self._evict()
+
+    def _touch(self, session_id: str) -> _Entry:
+        with self._lock:
+            self._evict()
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                raise KeyError(f"Session {session_id} not found!")
+            self._touch_entry(session_id, entry)
+            return entry
+
+    def _touch_entry(self, session_id: str, entry: _Entry):
+        entry.used = self._clock()
+        self._sessions.move_to_end(session_id)
+
+    def close(self, session_id: str) -> bool:
+        """End a session.
+
+        Args:
+            session_id: Id returned by create
+
+        Returns:
+            True if the session was live
+        """
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                self._total_lines -= entry.size
+            return entry is not None
+
+    def _evict(self):
+        # sessions are kept in order of last use, so expired ones are all at the front
+        deadline = self._clock() - self.ttl
+        while self._sessions:
+            entry = next(iter(self._sessions.values()))
+            if entry.used > deadline and (self._total_lines <= self.max_lines or len(self._sessions) == 1):
+                break
+            self._sessions.popitem(last=False)
+            self._total_lines -= entry.size
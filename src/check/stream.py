@@ -0,0 +1,66 @@
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+import json
+
+def with_summary(results: Iterable[dict]) -> Iterator[dict]:
+    """Pass per-line results through, then report on the whole proof.
+
+    Errors while checking end the stream with an error summary instead of being raised, since
+    a streamed response has already been sent in part when they happen.
+
+    Args:
+        results: Per-line result dicts, e.g. from iter_results
+
+    Returns:
+        Iterator over the results followed by one dict with 'done' set, overall validity and
+        the number of results
+    """
+    all_valid, count = True, 0
+    try:
+        for result in results:
+            all_valid = all_valid and result['valid']
+            count += 1
+            yield result
+    except Exception as e:
+        yield {
+            'done': True,
+            'valid': False,
+            'total_lines': count,
+            'error': f'Server error: {str(e)}'
+        }
+        return
+    yield {
+        'done': True,
+        'valid': all_valid,
+        'total_lines': count
+    }
+
+def ndjson(results: Iterable[dict]) -> Iterator[str]:
+    """Encode results as newline-delimited JSON, one result and then the summary per line.
+
+    Args:
+        results: Per-line result dicts
+
+    Returns:
+        Iterator over encoded lines
+    """
+    for record in with_summary(results):
+        yield json.dumps(record) + "\n"
+
+def sse(results: Iterable[dict]) -> Iterator[str]:
+    """Encode results as server-sent events: a "result" event per line, then a "done" event.
+
+    Args:
+        results: Per-line result dicts
+
+    Returns:
+        Iterator over encoded events
+    """
+    for record in with_summary(results):
+        event = "done" if record.get('done') else "result"
+        yield f"event: {event}\ndata: {json.dumps(record)}\n\n"
+
+# format name -> (MIME type, encoder)
+FORMATS: Dict[str, Tuple[str, Callable[[Iterable[dict]], Iterator[str]]]] = {
+    "ndjson": ("application/x-ndjson", ndjson),
+    "sse": ("text/event-stream", sse),
+}
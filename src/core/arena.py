@@ -0,0 +1,184 @@
+from array import array
+from typing import Dict, List
+from .sentence import Sentence, Atomic, Negation, TwoSided, Operator, True_Sym, False_Sym
+from .errors import VariableNotAssignedError
+
+# Node opcodes. An ATOM node keeps the index of its name in left; NOT uses only left.
+ATOM, TRUE, FALSE, NOT, AND, OR, IMPLIES = range(7)
+_OPCODES = {Operator.AND: AND, Operator.OR: OR, Operator.IMPLIES: IMPLIES}
+_OPERATORS = {code: oper for oper, code in _OPCODES.items()}
+
+class SentenceArena:
+    """Compact storage for many sentences as (op, left, right) integer triples.
+
+    Node k is stored in three parallel arrays instead of as an object, and nodes are
+    hash-consed within the arena, so a node is an int id and children always have smaller ids
+    than their parents. This trades the convenience of Sentence objects for a few bytes of
+    array storage plus one int-keyed table entry per distinct node.
+    """
+    __slots__ = ("ops", "lefts", "rights", "names", "_name_ids", "_unique")
+    ops: array
+    lefts: array
+    rights: array
+    names: List[str]
+    def __init__(self):
+        """Initialize an empty arena."""
+        self.ops = array("b")
+        self.lefts = array("i")
+        self.rights = array("i")
+        self.names = []
+        self._name_ids: Dict[str, int] = {}
+        # packed (op, left, right) -> node id
+        self._unique: Dict[int, int] = {}
+
+    @classmethod
+    def from_nodes(cls, ops: array, lefts: array, rights: array, names: List[str]) -> "SentenceArena":
+        """Rebuild an arena from its node arrays and names.
+
+        Args:
+            ops: Opcode of each node
+            lefts: Left field of each node
+            rights: Right field of each node
+            names: Atom names, indexed by the left field of ATOM nodes
+
+        Returns:
+            Arena holding the same nodes under the same ids
+        """
+        arena = cls()
+        arena.ops, arena.lefts, arena.rights, arena.names = ops, lefts, rights, list(names)
+        arena._name_ids = {name: index for index, name in enumerate(arena.names)}
+        arena._unique = {(right << 35) | (left << 3) | op: node
+                         for node, (op, left, right) in enumerate(zip(ops, lefts, rights))}
+        return arena
+
+    def __len__(self):
+        """Get the number of distinct nodes in the arena."""
+        return len(self.ops)
+
+    def node(self, op: int, left: int = 0, right: int = 0) -> int:
+        """Get the id of a node, adding it if it is not in the arena yet.
+
+        Args:
+            op: Opcode of the node
+            left: Name index for ATOM, operand id for NOT, left operand id otherwise
+            right: Right operand id for binary connectives
+
+        Returns:
+            Id of the node
+        """
+        key = (right << 35) | (left << 3) | op
+        node = self._unique.get(key)
+        if node is None:
+            node = self._unique[key] = len(self.ops)
+            self.ops.append(op)
+            self.lefts.append(left)
+            self.rights.append(right)
+        return node
+
+    def atom(self, name: str) -> int:
+        """Get the id of the atomic sentence with the given name."""
+        index = self._name_ids.get(name)
+        if index is None:
+            index = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return self.node(ATOM, index)
+
+    def add(self, sentence: Sentence) -> int:
+        """Store a sentence in the arena.
+
+        Args:
+            sentence: Sentence to store
+
+        Returns:
+            Id of its root node
+        """
+        ids = {}
+        for s in sentence.postorder():
+            if isinstance(s, True_Sym):
+                ids[s] = self.node(TRUE)
+            elif isinstance(s, False_Sym):
+                ids[s] = self.node(FALSE)
+            elif isinstance(s, Atomic):
+                ids[s] = self.atom(s.name)
+            elif isinstance(s, Negation):
+                ids[s] = self.node(NOT, ids[s.inner])
+            else:
+                ids[s] = self.node(_OPCODES[s.oper], ids[s.left], ids[s.right])
+        return ids[sentence]
+
+    def _reachable(self, root: int) -> List[int]:
+        # ids of the nodes under root in increasing order, so children come before parents
+        seen = {root}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            op = self.ops[node]
+            if op >= NOT:
+                children = (self.lefts[node],) if op == NOT else (self.lefts[node], self.rights[node])
+                for child in children:
+                    if child not in seen:
+                        seen.add(child)
+                        stack.append(child)
+        return sorted(seen)
+
+    def sentence(self, root: int) -> Sentence:
+        """Rebuild the Sentence stored at a node.
+
+        Args:
+            root: Id of the node
+
+        Returns:
+            The equivalent interned Sentence
+        """
+        built = {}
+        for node in self._reachable(root):
+            op, left, right = self.ops[node], self.lefts[node], self.rights[node]
+            if op == ATOM:
+                built[node] = Atomic(self.names[left])
+            elif op == TRUE:
+                built[node] = True_Sym()
+            elif op == FALSE:
+                built[node] = False_Sym()
+            elif op == NOT:
+                built[node] = Negation(built[left])
+            else:
+                built[node] = TwoSided(built[left], built[right], _OPERATORS[op])
+        return built[root]
+
+    def evaluate(self, root: int, variable_assignment: dict) -> bool:
+        """Evaluate the sentence stored at a node under a variable assignment.
+
+        Unlike Sentence.evaluate, every variable under the node must be assigned.
+
+        Args:
+            root: Id of the node
+            variable_assignment: Dict mapping variable names to boolean values
+
+        Returns:
+            Boolean value of the sentence under the assignment
+        """
+        values = {}
+        for node in self._reachable(root):
+            op, left, right = self.ops[node], self.lefts[node], self.rights[node]
+            if op == ATOM:
+                try:
+                    values[node] = variable_assignment[self.names[left]]
+                except KeyError:
+                    raise VariableNotAssignedError(f"Variable {self.names[left]} not found in variable assignment!") from None
+            elif op == TRUE:
+                values[node] = True
+            elif op == FALSE:
+                values[node] = False
+            elif op == NOT:
+                values[node] = not values[left]
+            elif op == AND:
+                values[node] = values[left] and values[right]
+            elif op == OR:
+                values[node] = values[left] or values[right]
+            else:
+                values[node] = (not values[left]) or values[right]
+        return values[root]
+
+    def nbytes(self) -> int:
+        """Get the size in bytes of the node arrays."""
+        return sum(a.itemsize * len(a) for a in (self.ops, self.lefts, self.rights))
@@ -0,0 +1,223 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+import sys
+import weakref
+from .sentence import Sentence, Atomic, Negation, Operator, True_Sym, False_Sym
+from .compiled import variables
+
+FALSE = 0
+TRUE = 1
+_TERMINAL_LEVEL = sys.maxsize
+
+class BDD:
+    """A manager for reduced ordered binary decision diagrams.
+
+    Nodes are ints indexing the manager's tables, and the unique table guarantees one node per
+    (level, low, high) triple, so two sentences built in the same manager are equivalent
+    exactly when they get the same node. Operations share a fixed-size ITE cache where a new
+    entry overwrites whatever was in its slot, which bounds its memory, and the nodes of built
+    sentences are remembered only while the sentences are alive.
+    """
+    order: List[str]
+    def __init__(self, order: Optional[Sequence[str]] = None, cache_size: int = 1 << 16):
+        """Initialize a manager.
+
+        Args:
+            order: Variable names from the top of the diagrams down; variables not listed are
+                appended in the order they are first built
+            cache_size: Number of slots in the ITE cache, rounded up to a power of two
+        """
+        if cache_size < 1:
+            raise ValueError("cache_size must be positive!")
+        self.order = []
+        self._levels = {}  # variable name -> level
+        self._level = [_TERMINAL_LEVEL, _TERMINAL_LEVEL]  # node -> level
+        self._low = [FALSE, TRUE]
+        self._high = [FALSE, TRUE]
+        self._unique = {}  # (level, low, high) -> node
+        # sentence -> node, held weakly so the memo does not keep sentences alive
+        self._nodes = weakref.WeakKeyDictionary()
+        size = 1 << (cache_size - 1).bit_length()
+        self._cache = [None] * size
+        self._mask = size - 1
+        for name in order or ():
+            self._add_variable(name)
+
+    def __len__(self):
+        """Get the number of nodes, including the two terminals."""
+        return len(self._level)
+
+    def _add_variable(self, name: str) -> int:
+        if name not in self._levels:
+            self._levels[name] = len(self.order)
+            self.order.append(name)
+        return self._levels[name]
+
+    def _make(self, level: int, low: int, high: int) -> int:
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = len(self._level)
+            self._level.append(level)
+            self._low.append(low)
+            self._high.append(high)
+            self._unique[key] = node
+        return node
+
+    def variable(self, name: str) -> int:
+        """Get the node of a single variable.
+
+        Args:
+            name: Variable name
+
+        Returns:
+            Node that is true exactly when the variable is
+        """
+        return self._make(self._add_variable(name), FALSE, TRUE)
+
+    def ite(self, f: int, g: int, h: int) -> int:
+        """Compute if-then-else: the node of (f and g) or (not f and h).
+
+        Args:
+            f: Condition node
+            g: Node used where f holds
+            h: Node used where f does not hold
+
+        Returns:
+            Resulting node
+        """
+        level, low, high = self._level, self._low, self._high
+        cache, mask = self._cache, self._mask
+        results = []
+        stack = [(f, g, h)]
+        while stack:
+            frame = stack.pop()
+            if len(frame) == 2:
+                key, top = frame
+                high_result = results.pop()
+                node = self._make(top, results.pop(), high_result)
+                cache[hash(key) & mask] = (key, node)
+                results.append(node)
+                continue
+
+            f, g, h = frame
+            if f == TRUE or g == h:
+                results.append(g)
+            elif f == FALSE:
+                results.append(h)
+            elif g == TRUE and h == FALSE:
+                results.append(f)
+            else:
+                entry = cache[hash(frame) & mask]
+                if entry is not None and entry[0] == frame:
+                    results.append(entry[1])
+                    continue
+                top = min(level[f], level[g], level[h])
+                f0, f1 = (low[f], high[f]) if level[f] == top else (f, f)
+                g0, g1 = (low[g], high[g]) if level[g] == top else (g, g)
+                h0, h1 = (low[h], high[h]) if level[h] == top else (h, h)
+                stack.append((frame, top))
+                stack.append((f1, g1, h1))
+                stack.append((f0, g0, h0))
+        return results[0]
+
+    def build(self, sentence: Sentence) -> int:
+        """Get the node of a sentence, building it and any new subsentences.
+
+        Args:
+            sentence: Sentence to build
+
+        Returns:
+            Node equivalent to the sentence
+        """
+        nodes = self._nodes
+        if sentence in nodes:
+            return nodes[sentence]
+        for s in sentence.postorder():
+            if s in nodes:
+                continue
+            if isinstance(s, True_Sym):
+                node = TRUE
+            elif isinstance(s, False_Sym):
+                node = FALSE
+            elif isinstance(s, Atomic):
+                node = self.variable(s.name)
+            elif isinstance(s, Negation):
+                node = self.ite(nodes[s.inner], FALSE, TRUE)
+            elif s.oper == Operator.AND:
+                node = self.ite(nodes[s.left], nodes[s.right], FALSE)
+            elif s.oper == Operator.OR:
+                node = self.ite(nodes[s.left], TRUE, nodes[s.right])
+            elif s.oper == Operator.IMPLIES:
+                node = self.ite(nodes[s.left], nodes[s.right], TRUE)
+            else:
+                raise NotImplementedError()
+            nodes[s] = node
+        return nodes[sentence]
+
+    def equivalent(self, a: Sentence, b: Sentence) -> bool:
+        """Check whether two sentences have the same value under every assignment."""
+        return self.build(a) == self.build(b)
+
+    def is_tautology(self, sentence: Sentence) -> bool:
+        """Check whether a sentence is true under every assignment."""
+        return self.build(sentence) == TRUE
+
+    def is_satisfiable(self, sentence: Sentence) -> bool:
+        """Check whether a sentence is true under some assignment."""
+        return self.build(sentence) != FALSE
+
+    def equivalence_classes(self, sentences: Iterable[Sentence]) -> List[List[Sentence]]:
+        """Group sentences that are equivalent to each other.
+
+        Args:
+            sentences: Sentences to group
+
+        Returns:
+            Lists of equivalent sentences, in order of first appearance
+        """
+        classes: Dict[int, List[Sentence]] = {}
+        for sentence in sentences:
+            classes.setdefault(self.build(sentence), []).append(sentence)
+        return list(classes.values())
+
+    def count_models(self, sentence: Sentence, atoms: Optional[Sequence[str]] = None) -> int:
+        """Count the assignments that make a sentence true.
+
+        Args:
+            sentence: Sentence to count models of
+            atoms: Variables the assignments range over; defaults to the variables of the
+                sentence, and must include all of them
+
+        Returns:
+            Number of satisfying assignments of the atoms
+        """
+        atoms = set(variables(sentence) if atoms is None else atoms)
+        missing = set(variables(sentence)) - atoms
+        if missing:
+            raise ValueError(f"Variables {sorted(missing)} of the sentence are not among the atoms!")
+        root = self.build(sentence)
+        for name in sorted(atoms):
+            self._add_variable(name)
+
+        # count over every variable of the manager, then drop the ones outside atoms
+        n = len(self.order)
+        level, low, high = self._level, self._low, self._high
+        def depth(node):
+            return n if node <= TRUE else level[node]
+        counts = {FALSE: 0, TRUE: 1}
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if node in counts:
+                stack.pop()
+                continue
+            pending = [child for child in (low[node], high[node]) if child not in counts]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            counts[node] = sum(counts[child] << (depth(child) - level[node] - 1)
+                               for child in (low[node], high[node]))
+        return (counts[root] << depth(root)) >> (n - len(atoms))
@@ -0,0 +1,88 @@
+from typing import Callable, Optional, Sequence, Tuple
+from .sentence import Sentence, Atomic, Negation, Operator, True_Sym, False_Sym
+from .errors import VariableNotAssignedError
+
+def variables(sentence: Sentence) -> Tuple[str, ...]:
+    """Get the propositional variables of a sentence in their default slot order.
+
+    Args:
+        sentence: Sentence to inspect
+
+    Returns:
+        Sorted tuple of the names of its atomic sentences, excluding TRUE and FALSE
+    """
+    return tuple(sorted(node.name for node in sentence.postorder()
+                        if isinstance(node, Atomic) and not isinstance(node, (True_Sym, False_Sym))))
+
+class CompiledSentence:
+    """A sentence lowered to a flat Python function over positional variable slots.
+
+    Each distinct subsentence is computed once, by one assignment in straight-line code, so
+    evaluating skips the tree walk, the operator dispatch and the dictionary lookups of
+    Sentence.evaluate.
+    """
+    sentence: Sentence
+    atoms: Tuple[str, ...]
+    function: Callable[..., bool]
+    def __init__(self, sentence: Sentence, atoms: Optional[Sequence[str]] = None):
+        """Compile a sentence.
+
+        Args:
+            sentence: Sentence to compile
+            atoms: Variable names in slot order; defaults to variables(sentence)
+
+        Raises:
+            VariableNotAssignedError: If the sentence uses a variable missing from atoms
+        """
+        self.sentence = sentence
+        self.atoms = variables(sentence) if atoms is None else tuple(atoms)
+        slots = {name: f"v{i}" for i, name in enumerate(self.atoms)}
+
+        names = {}
+        lines = []
+        for i, node in enumerate(sentence.postorder()):
+            if isinstance(node, True_Sym):
+                names[node] = "True"
+            elif isinstance(node, False_Sym):
+                names[node] = "False"
+            elif isinstance(node, Atomic):
+                try:
+                    names[node] = slots[node.name]
+                except KeyError:
+                    raise VariableNotAssignedError(f"Variable {node.name} not found in the compiled atoms!") from None
+            else:
+                names[node] = f"t{i}"
+                if isinstance(node, Negation):
+                    lines.append(f"    t{i} = not {names[node.inner]}")
+                elif node.oper == Operator.AND:
+                    lines.append(f"    t{i} = {names[node.left]} and {names[node.right]}")
+                elif node.oper == Operator.OR:
+                    lines.append(f"    t{i} = {names[node.left]} or {names[node.right]}")
+                elif node.oper == Operator.IMPLIES:
+                    lines.append(f"    t{i} = (not {names[node.left]}) or {names[node.right]}")
+                else:
+                    raise NotImplementedError()
+        lines.append(f"    return {names[sentence]}")
+
+        source = f"def evaluate({', '.join(slots.values())}):\n" + "\n".join(lines) + "\n"
+        namespace = {}
+        exec(compile(source, f"<compiled {type(sentence).__name__}>", "exec"), namespace)
+        self.function = namespace["evaluate"]
+
+    def __call__(self, *values) -> bool:
+        """Evaluate the sentence with one positional value per slot of self.atoms."""
+        return self.function(*values)
+
+    def evaluate(self, variable_assignment: dict) -> bool:
+        """Evaluate the sentence under a variable assignment, like Sentence.evaluate.
+
+        Args:
+            variable_assignment: Dict mapping variable names to boolean values
+
+        Returns:
+            Boolean value of the sentence under the assignment
+        """
+        try:
+            return self.function(*[variable_assignment[name] for name in self.atoms])
+        except KeyError as e:
+            raise VariableNotAssignedError(f"Variable {e.args[0]} not found in variable assignment!") from None
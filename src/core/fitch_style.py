@@ -3,38 +3,51 @@ from .sentence import Sentence, TwoSided, Atomic, Negation, Operator, True_Sym,
 
 class FitchSubProof():
     """A subproof in Fitch-style natural deduction.
+
+    Every subproof is a scope over its outer proof: it holds only its own assumptions, and
+    its context is the outer context extended with them. All scopes of a proof share one
+    sequent-style Proof in which inherited assumptions are implicit axioms, so each
+    assumption is loaded exactly once regardless of nesting depth.
     
     Generated automatically by Claude.
     """
     assumptions: Gamma
     outer_proof: "FitchSubProof"
-    def __init__(self, outer_proof: "FitchSubProof"=None):
+    def __init__(self, outer_proof: "FitchSubProof"=None, proof: Proof = None):
         """Initialize a Fitch subproof.
         
         Args:
             outer_proof: The outer proof context, None for top-level proof
+            proof: Sequent-style proof the top-level proof adds its lines to; defaults to a
+                new Proof with implicit axioms
             
         Generated automatically by Claude.
         """
         if outer_proof:
             self.has_outer = True
+            self.pr = outer_proof.pr
         else:
             self.has_outer = False
+            self.pr = Proof(implicit_axioms=True) if proof is None else proof
 
         self.outer_proof = outer_proof
 
+        # own assumptions only; the full context is built when the scope is loaded
         self.gamma = Gamma()
-        self.pr = Proof()
+        self.assumption_lines = []
+        self.context_gamma = None
+        self.context = None
 
         self.loaded = False
 
         self.inners = []
 
-    def add_assumption(self, sentence) -> bool:
+    def add_assumption(self, sentence, line: int = None) -> bool:
         """Add an assumption to this subproof.
         
         Args:
             sentence: The assumption to add
+            line: Line number other lines use to cite this assumption
             
         Returns:
             True if assumption was added successfully
@@ -43,59 +56,73 @@ class FitchSubProof():
         """
         if not self.loaded:
             self.gamma += [sentence]
+            self.assumption_lines.append(line)
             return True
         else:
             return False
 
-    def load_assumptions(self, additional_gamma: Gamma = Gamma()):
-        """Load assumptions into the proof system.
+    def load_assumptions(self):
+        """Close this subproof's assumptions and load them into the proof system.
+
+        Outer scopes that are not loaded yet are loaded first, since a subproof's context
+        extends theirs.
         
-        Args:
-            additional_gamma: Additional assumptions to load
-            
         Generated automatically by Claude.
         """
-        temp_gamma = self.gamma + additional_gamma
-        if not self.has_outer:
-            # need to load both combinations of assumptions (current assumptions as well as
-            # current assumptions + inner proof assumptions), eventually though maybe
-            # we can switch to only loading one and updating the inference rules.
-            for sentence in self.gamma:
-                self.pr.add_sequent(Sequent(self.gamma, sentence, InferenceRule.axiom))
-
-            for sentence in temp_gamma:
-                self.pr.add_sequent(Sequent(temp_gamma, sentence, InferenceRule.axiom))
-        else:
-            # again, loading both combinations of assumptions
-            self.outer_proof.load_assumptions(temp_gamma)
-            self.outer_proof.load_assumptions(self.gamma)
+        pending = []
+        scope = self
+        while scope is not None and not scope.loaded:
+            pending.append(scope)
+            scope = scope.outer_proof
 
-        self.loaded = True
+        for scope in reversed(pending):
+            if scope.has_outer:
+                outer_gamma, outer_context = scope.outer_proof.context_gamma, scope.outer_proof.context
+            else:
+                outer_gamma, outer_context = Gamma(), 0
 
-    def add_conclusion(self, sentence: Sentence, inf_rule: InferenceRule, additional_gamma: Gamma = Gamma(), is_assumption: bool = False) -> bool:
+            scope.context_gamma = outer_gamma + scope.gamma
+            scope.context = outer_context | scope.pr.context(scope.gamma)
+            for sentence, line in zip(scope.gamma, scope.assumption_lines):
+                scope.pr.add_sequent(Sequent(scope.context_gamma, sentence, InferenceRule.axiom), scope.context, line)
+
+            scope.loaded = True
+
+    def close(self):
+        """Close this subproof, loading its assumptions if no conclusion has yet.
+
+        A subproof made only of assumptions still opens its scope, so other lines can use
+        and cite its assumptions.
+        """
+        if not self.loaded:
+            self.load_assumptions()
+
+    def add_conclusion(self, sentence: Sentence, inf_rule: InferenceRule, *, premises: tuple = None, line: int = None) -> bool:
         """Add a conclusion to the proof.
+
+        The scope's assumptions come from its subproof structure, so there are no extra
+        assumptions to pass; premises and line are keyword-only.
         
         Args:
             sentence: The conclusion sentence
             inf_rule: The inference rule used
-            additional_gamma: Additional assumptions
-            is_assumption: Whether this is an assumption
+            premises: Line numbers of the lines the rule is applied to, if cited
+            line: Line number other lines use to cite this conclusion
             
         Returns:
             True if conclusion was added successfully
             
         Generated automatically by Claude.
         """
-        if not is_assumption and not self.loaded:
+        if not self.loaded:
             self.load_assumptions()
 
-        if self.has_outer:
-            return self.outer_proof.add_conclusion(sentence, inf_rule, self.gamma + additional_gamma, is_assumption)
-        else:
-            return self.pr.add_sequent(Sequent(self.gamma + additional_gamma, sentence, inf_rule))
+        return self.pr.add_sequent(Sequent(self.context_gamma, sentence, inf_rule, premises), self.context, line)
 
     def sequent_style(self) -> Proof:
         """Convert this Fitch proof to sequent style.
+
+        Assumptions inherited from outer scopes are implicit axioms of the returned proof.
         
         Returns:
             The equivalent sequent-style proof
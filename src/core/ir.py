@@ -0,0 +1,417 @@
+from array import array
+from hashlib import blake2b
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import pickle
+from .arena import SentenceArena, TRUE, FALSE, NOT, AND, OR, IMPLIES
+from .proof import InferenceRule, Sequent
+from .sentence import Sentence
+
+# Rule opcodes are the positions of the rules in InferenceRule.
+RULES = tuple(InferenceRule)
+OPCODES = {rule: code for code, rule in enumerate(RULES)}
+
+# Outcomes of reported lines that are not decided by checking a row.
+ACCEPTED = -1
+REJECTED = -2
+PARSE_ERROR = -3
+
+# Stands in for cited line numbers too large to store; it is never the number of a line.
+NO_LINE = -1
+_MAX_LINE = 2 ** 63 - 1
+
+class ProofIR:
+    """A proof lowered to integer-indexed arrays.
+
+    Sentences are node ids in a SentenceArena, a context id indexes a tuple of assumption
+    sentence ids (in gamma order, so sequents can be printed back), and each row is one
+    sequent to check: (line, context id, conclusion id, rule opcode, cited lines). Rows are in
+    the order the checker must process them, which for Fitch proofs is not always line order.
+
+    Separately, every reported line maps to the row that decides it or to one of ACCEPTED,
+    REJECTED (both for Fitch assumptions, which are not checked) and PARSE_ERROR.
+    """
+    __slots__ = ("implicit_axioms", "arena", "contexts", "lines", "context_ids", "conclusions",
+                 "rules", "premise_starts", "premise_counts", "premises", "report_lines",
+                 "report_rows", "errors", "false_id", "_context_ids")
+    implicit_axioms: bool
+    arena: SentenceArena
+    contexts: List[Tuple[int, ...]]
+    errors: Dict[int, str]
+    def __init__(self, implicit_axioms: bool = False):
+        """Initialize an empty IR.
+
+        Args:
+            implicit_axioms: Treat every assumption of a context opened by an axiom row as
+                derived in it, as Fitch proofs do
+        """
+        self.implicit_axioms = implicit_axioms
+        self.arena = SentenceArena()
+        self.contexts = []
+        self._context_ids = {}
+        # line numbers are 64-bit; see add_row for citations that do not fit
+        self.lines = array("q")
+        self.context_ids = array("i")
+        self.conclusions = array("i")
+        self.rules = array("b")
+        self.premise_starts = array("i")
+        self.premise_counts = array("i")  # -1 when the row cites no lines
+        self.premises = array("q")
+        self.report_lines = array("q")
+        self.report_rows = array("i")
+        self.errors = {}  # line -> parse error message
+        self.false_id = self.arena.node(FALSE)
+
+    def __len__(self):
+        """Get the number of rows."""
+        return len(self.lines)
+
+    def context_id(self, gamma: Iterable[Sentence]) -> int:
+        """Get the id of a context, adding it if needed.
+
+        Args:
+            gamma: Assumptions of the context, in order
+
+        Returns:
+            Id of the context
+        """
+        key = tuple(self.arena.add(sentence) for sentence in gamma)
+        cid = self._context_ids.get(key)
+        if cid is None:
+            cid = self._context_ids[key] = len(self.contexts)
+            self.contexts.append(key)
+        return cid
+
+    def add_row(self, sequent: Sequent, line: int) -> int:
+        """Lower a sequent into a new row.
+
+        Args:
+            sequent: Sequent to check
+            line: Line number other sequents use to cite it
+
+        Returns:
+            Index of the row
+        """
+        row = len(self.lines)
+        conclusion = self.arena.add(sequent.conclusion)
+        if sequent.rule == InferenceRule.contra:
+            # the checker only reads the arena, so the negation it assumes must exist
+            self.arena.node(NOT, conclusion)
+        self.lines.append(line)
+        self.context_ids.append(self.context_id(sequent.gamma))
+        self.conclusions.append(conclusion)
+        self.rules.append(OPCODES[sequent.rule])
+        self.premise_starts.append(len(self.premises))
+        if sequent.premises is None:
+            self.premise_counts.append(-1)
+        else:
+            self.premise_counts.append(len(sequent.premises))
+            # a citation too large for the array cannot name a line, so it becomes NO_LINE
+            self.premises.extend(line if line <= _MAX_LINE else NO_LINE for line in sequent.premises)
+        return row
+
+    def report(self, line: int, row: int, error: Optional[str] = None):
+        """Record the outcome of a reported line.
+
+        Args:
+            line: Line number
+            row: Row deciding the line, or ACCEPTED, REJECTED or PARSE_ERROR
+            error: Parse error message, for PARSE_ERROR
+        """
+        self.report_lines.append(line)
+        self.report_rows.append(row)
+        if row == PARSE_ERROR:
+            self.errors[line] = error
+
+    def row_premises(self, row: int) -> Optional[Tuple[int, ...]]:
+        """Get the lines cited by a row, or None if it cites none."""
+        count = self.premise_counts[row]
+        if count < 0:
+            return None
+        start = self.premise_starts[row]
+        return tuple(self.premises[start:start + count])
+
+    def __getstate__(self):
+        arena = self.arena
+        return (self.implicit_axioms, arena.ops, arena.lefts, arena.rights, arena.names, self.contexts,
+                self.lines, self.context_ids, self.conclusions, self.rules, self.premise_starts,
+                self.premise_counts, self.premises, self.report_lines, self.report_rows, self.errors)
+
+    def __setstate__(self, state):
+        (implicit_axioms, ops, lefts, rights, names, contexts, *rows, errors) = state
+        self.__init__(implicit_axioms)
+        arena = self.arena
+        for op, left, right in zip(ops, lefts, rights):
+            arena.node(op, left, right)
+        for name in names:
+            arena.atom(name)
+        for context in contexts:
+            self._context_ids[context] = len(self.contexts)
+            self.contexts.append(context)
+        (self.lines, self.context_ids, self.conclusions, self.rules, self.premise_starts,
+         self.premise_counts, self.premises, self.report_lines, self.report_rows) = rows
+        self.errors = errors
+
+    def to_bytes(self) -> bytes:
+        """Serialize the IR."""
+        return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "ProofIR":
+        """Deserialize an IR produced by to_bytes."""
+        ir = pickle.loads(data)
+        if not isinstance(ir, ProofIR):
+            raise TypeError(f"Expected a serialized ProofIR, got {type(ir)}!")
+        return ir
+
+    def digest(self) -> str:
+        """Get a hash of the IR's content, stable across processes."""
+        h = blake2b(digest_size=16)
+        h.update(b"1" if self.implicit_axioms else b"0")
+        arena = self.arena
+        for a in (arena.ops, arena.lefts, arena.rights, self.lines, self.context_ids, self.conclusions,
+                  self.rules, self.premise_counts, self.premises, self.report_lines, self.report_rows):
+            h.update(len(a).to_bytes(8, "little"))
+            h.update(a.tobytes())
+        h.update(repr((arena.names, self.contexts, sorted(self.errors.items()))).encode())
+        return h.hexdigest()
+
+
+class _IRFacts:
+    """Derived (context, conclusion) facts over IR ids, the counterpart of Proof's fact store."""
+    __slots__ = ("ir", "derived", "conjunctions", "disjunctions", "implications", "negations",
+                 "contexts_for", "bits", "assumed", "scopes")
+    def __init__(self, ir: ProofIR, bits: Dict[int, int], assumed: Optional["_IRAssumptions"], scopes: Set[int]):
+        self.ir = ir
+        self.derived = set()  # (context mask, conclusion id)
+        self.conjunctions = set()  # (context mask, conjunct id)
+        self.disjunctions = {}  # context mask -> disjunction ids
+        self.implications = {}  # (context mask, consequent id) -> implication ids
+        self.negations = {}  # context mask -> inner ids
+        self.contexts_for = {}  # conclusion id -> context masks
+        self.bits = bits  # assumption sentence id -> bit index, shared by all stores of a check
+        self.assumed = assumed
+        self.scopes = scopes  # context masks opened by an accepted axiom row, shared like bits
+
+    def bit(self, sid: int) -> int:
+        index = self.bits.get(sid)
+        if index is None:
+            index = self.bits[sid] = len(self.bits)
+            if self.assumed is not None:
+                self.assumed.add(sid)
+        return 1 << index
+
+    def known_bit(self, sid: int) -> int:
+        # like Proof._known_bit, lookups leave the assumption table alone
+        index = self.bits.get(sid)
+        return 0 if index is None else 1 << index
+
+    def index(self, ctx: int, conclusion: int):
+        key = (ctx, conclusion)
+        if key in self.derived:
+            return
+        self.derived.add(key)
+        self.contexts_for.setdefault(conclusion, []).append(ctx)
+        arena = self.ir.arena
+        op = arena.ops[conclusion]
+        if op == NOT:
+            self.negations.setdefault(ctx, []).append(arena.lefts[conclusion])
+        elif op == AND:
+            self.conjunctions.add((ctx, arena.lefts[conclusion]))
+            self.conjunctions.add((ctx, arena.rights[conclusion]))
+        elif op == OR:
+            self.disjunctions.setdefault(ctx, []).append(conclusion)
+        elif op == IMPLIES:
+            self.implications.setdefault((ctx, arena.rights[conclusion]), []).append(conclusion)
+
+    def implicit(self, ctx: int) -> bool:
+        # assumptions count as derived only in the contexts of loaded scopes
+        return self.assumed is not None and ctx in self.scopes
+
+    def proves(self, ctx: int, conclusion: int) -> bool:
+        if (ctx, conclusion) in self.derived:
+            return True
+        return self.implicit(ctx) and self.known_bit(conclusion) & ctx != 0
+
+    def proves_assuming(self, ctx: int, assumption: int, conclusion: int) -> bool:
+        # proves conclusion in ctx extended by assumption; an assumption without a bit is in
+        # no derived fact's context
+        bit = self.known_bit(assumption)
+        return bit != 0 and self.proves(ctx | bit, conclusion)
+
+    def has_conjunct(self, ctx: int, conjunct: int) -> bool:
+        if (ctx, conjunct) in self.conjunctions:
+            return True
+        return self.implicit(ctx) and self.assumed.conjunctions.get(conjunct, 0) & ctx != 0
+
+    def disjunctions_in(self, ctx: int) -> Iterator[int]:
+        yield from self.disjunctions.get(ctx, ())
+        if self.implicit(ctx):
+            yield from self.assumed.select(self.assumed.disjunctions & ctx)
+
+    def implications_in(self, ctx: int, consequent: int) -> Iterator[int]:
+        yield from self.implications.get((ctx, consequent), ())
+        if self.implicit(ctx):
+            yield from self.assumed.select(self.assumed.implications.get(consequent, 0) & ctx)
+
+    def negated_in(self, ctx: int) -> Iterator[int]:
+        yield from self.negations.get(ctx, ())
+        if self.implicit(ctx):
+            lefts = self.ir.arena.lefts
+            for negation in self.assumed.select(self.assumed.negations & ctx):
+                yield lefts[negation]
+
+    def weakens(self, ctx: int, conclusion: int) -> bool:
+        if self.implicit(ctx) and self.known_bit(conclusion) & ctx:
+            return True
+        for seq_ctx in self.contexts_for.get(conclusion, ()):
+            if seq_ctx & ~ctx == 0:
+                return True
+        return False
+
+
+class _IRAssumptions:
+    """Assumption ids grouped by main connective as bitmasks, like Proof's assumption index."""
+    __slots__ = ("arena", "sids", "conjunctions", "disjunctions", "implications", "negations")
+    def __init__(self, arena: SentenceArena):
+        self.arena = arena
+        self.sids = []  # bit index -> sentence id
+        self.conjunctions = {}
+        self.disjunctions = 0
+        self.implications = {}
+        self.negations = 0
+
+    def add(self, sid: int):
+        bit = 1 << len(self.sids)
+        self.sids.append(sid)
+        op = self.arena.ops[sid]
+        if op == NOT:
+            self.negations |= bit
+        elif op == AND:
+            for conjunct in (self.arena.lefts[sid], self.arena.rights[sid]):
+                self.conjunctions[conjunct] = self.conjunctions.get(conjunct, 0) | bit
+        elif op == OR:
+            self.disjunctions |= bit
+        elif op == IMPLIES:
+            right = self.arena.rights[sid]
+            self.implications[right] = self.implications.get(right, 0) | bit
+
+    def select(self, mask: int) -> Iterator[int]:
+        while mask:
+            low = mask & -mask
+            yield self.sids[low.bit_length() - 1]
+            mask ^= low
+
+
+(AX, AI, AE, OI, OE, II, IE, NI, NE, TI, FE, EX, IP) = (OPCODES[rule] for rule in (
+    InferenceRule.axiom, InferenceRule.and_intro, InferenceRule.and_elim, InferenceRule.or_intro,
+    InferenceRule.or_elim, InferenceRule.implies_intro, InferenceRule.implies_elim,
+    InferenceRule.not_intro, InferenceRule.not_elim, InferenceRule.true_intro,
+    InferenceRule.false_elim, InferenceRule.expand, InferenceRule.contra))
+
+
+def check_ir(ir: ProofIR) -> List[bool]:
+    """Check every row of an IR, with the same rules as Proof.add_sequent.
+
+    Args:
+        ir: Lowered proof
+
+    Returns:
+        Whether each row was accepted, in row order
+    """
+    arena = ir.arena
+    ops, lefts, rights = arena.ops, arena.lefts, arena.rights
+    false_id = ir.false_id
+    bits = {}
+    facts = _IRFacts(ir, bits, _IRAssumptions(arena) if ir.implicit_axioms else None, set())
+    bit, known_bit = facts.bit, facts.known_bit
+    context_masks = {}
+    lines = {}  # line -> (context mask, conclusion id)
+    accepted = []
+
+    for row in range(len(ir.lines)):
+        cid = ir.context_ids[row]
+        ctx = context_masks.get(cid)
+        if ctx is None:
+            ctx = 0
+            for sid in ir.contexts[cid]:
+                ctx |= bit(sid)
+            context_masks[cid] = ctx
+        c = ir.conclusions[row]
+        rule = ir.rules[row]
+
+        premises = ir.row_premises(row)
+        if premises is None:
+            store = facts
+        else:
+            store = _IRFacts(ir, bits, facts.assumed, facts.scopes)
+            for line in premises:
+                if line not in lines:
+                    store = None
+                    break
+                store.index(*lines[line])
+
+        op = ops[c]
+        if store is None:
+            valid = False
+        elif rule == AX:
+            valid = known_bit(c) & ctx != 0
+        elif rule == AI:
+            valid = op == AND and store.proves(ctx, lefts[c]) and store.proves(ctx, rights[c])
+        elif rule == AE:
+            valid = store.has_conjunct(ctx, c)
+        elif rule == OI:
+            valid = op == OR and (store.proves(ctx, lefts[c]) or store.proves(ctx, rights[c]))
+        elif rule == OE:
+            valid = any(store.proves_assuming(ctx, lefts[d], c) and store.proves_assuming(ctx, rights[d], c)
+                        for d in store.disjunctions_in(ctx))
+        elif rule == II:
+            valid = op == IMPLIES and store.proves_assuming(ctx, lefts[c], rights[c])
+        elif rule == IE:
+            valid = any(store.proves(ctx, lefts[i]) for i in store.implications_in(ctx, c))
+        elif rule == NI:
+            valid = op == NOT and store.proves_assuming(ctx, lefts[c], false_id)
+        elif rule == NE:
+            valid = op == FALSE and any(store.proves(ctx, inner) for inner in store.negated_in(ctx))
+        elif rule == TI:
+            valid = op == TRUE
+        elif rule == FE:
+            valid = store.proves(ctx, false_id)
+        elif rule == IP:
+            valid = store.proves_assuming(ctx, arena.node(NOT, c), false_id)
+        elif rule == EX:
+            valid = store.weakens(ctx, c)
+        else:
+            raise ValueError(f"Rule opcode {rule} not supported!")
+
+        if valid:
+            lines[ir.lines[row]] = (ctx, c)
+            facts.index(ctx, c)
+            if rule == AX and facts.assumed is not None:
+                facts.scopes.add(ctx)
+        accepted.append(valid)
+    return accepted
+
+
+class IRRecorder:
+    """Stands in for Proof while lowering: records each added sequent as a row of an IR.
+
+    Every sequent is reported as added, since it is only checked later by check_ir. The
+    contexts of rows come from the sequents' gammas, so context masks are not tracked.
+    """
+    ir: ProofIR
+    last_row: Optional[int]
+    def __init__(self, ir: ProofIR):
+        """Initialize a recorder.
+
+        Args:
+            ir: IR receiving the rows
+        """
+        self.ir = ir
+        self.last_row = None
+
+    def context(self, gamma) -> int:
+        return 0
+
+    def add_sequent(self, sequent: Sequent, context: Optional[int] = None, line: Optional[int] = None) -> bool:
+        self.last_row = self.ir.add_row(sequent, line)
+        return True
@@ -1,6 +1,10 @@
 from .sentence import TwoSided, Atomic, Negation, Sentence, True_Sym, False_Sym
 from .sentence import Operator, Gamma
-from typing import List, MutableSequence
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from heapq import heappush, heappop
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+from array import array
 from enum import Enum
 
 class InferenceRule(Enum):
@@ -26,22 +30,26 @@ class Sequent:
     
     Generated automatically by Claude.
     """
+    __slots__ = ("gamma", "conclusion", "rule", "premises")
     gamma: Gamma
     conclusion: Sentence
     rule: InferenceRule
-    def __init__(self, gamma: Gamma, conclusion: Sentence, rule: InferenceRule):
+    premises: Optional[Tuple[int, ...]]
+    def __init__(self, gamma: Gamma, conclusion: Sentence, rule: InferenceRule, premises: Optional[Tuple[int, ...]] = None):
         """Initialize a sequent.
         
         Args:
             gamma: Collection of assumptions
             conclusion: The conclusion sentence
             rule: The inference rule used
+            premises: Line numbers of the sequents the rule is applied to, if cited
             
         Generated automatically by Claude.
         """
         self.gamma = gamma
         self.conclusion = conclusion
         self.rule = rule
+        self.premises = premises
 
     def __str__(self):
         s = "["
@@ -52,21 +60,351 @@ class Sequent:
         s += "] proves "
         s += self.conclusion.__str__()
         s += f" :{self.rule.value}"
+        if self.premises is not None:
+            s += " " + ",".join(str(line) for line in self.premises)
         return s
 
 
-class Proof:
+class _ContextIndex:
+    """Facts derived under one context, grouped for the elimination rules."""
+    __slots__ = ("conjunctions", "disjunctions", "implications", "negations")
+    conjunctions: Dict[Sentence, List[TwoSided]]
+    disjunctions: List[TwoSided]
+    implications: Dict[Sentence, List[TwoSided]]
+    negations: Dict[Sentence, Negation]
+    def __init__(self):
+        self.conjunctions = {}  # conjunct -> conjunctions having it as one side
+        self.disjunctions = []
+        self.implications = {}  # consequent -> implications
+        self.negations = {}  # inner -> negation
+
+    def add(self, conclusion: Sentence):
+        """Index a newly derived conclusion by its main connective.
+
+        Args:
+            conclusion: Conclusion derived under this context for the first time
+        """
+        if isinstance(conclusion, Negation):
+            self.negations[conclusion.inner] = conclusion
+        elif isinstance(conclusion, TwoSided):
+            if conclusion.oper == Operator.AND:
+                self.conjunctions.setdefault(conclusion.left, []).append(conclusion)
+                if conclusion.right is not conclusion.left:
+                    self.conjunctions.setdefault(conclusion.right, []).append(conclusion)
+            elif conclusion.oper == Operator.OR:
+                self.disjunctions.append(conclusion)
+            elif conclusion.oper == Operator.IMPLIES:
+                self.implications.setdefault(conclusion.right, []).append(conclusion)
+
+    def remove(self, conclusion: Sentence):
+        """Drop a conclusion that is no longer derived under this context.
+
+        Args:
+            conclusion: Conclusion previously passed to add
+        """
+        if isinstance(conclusion, Negation):
+            del self.negations[conclusion.inner]
+        elif isinstance(conclusion, TwoSided):
+            if conclusion.oper == Operator.AND:
+                for conjunct in {conclusion.left, conclusion.right}:
+                    self.conjunctions[conjunct].remove(conclusion)
+                    if not self.conjunctions[conjunct]:
+                        del self.conjunctions[conjunct]
+            elif conclusion.oper == Operator.OR:
+                self.disjunctions.remove(conclusion)
+            elif conclusion.oper == Operator.IMPLIES:
+                self.implications[conclusion.right].remove(conclusion)
+                if not self.implications[conclusion.right]:
+                    del self.implications[conclusion.right]
+
+
+_EMPTY_INDEX = _ContextIndex()
+
+
+class _AssumptionIndex:
+    """Assumptions of a proof grouped for the elimination rules, as bitmasks over the
+    proof's assumption table, so the assumptions available in a context are found with
+    a single AND against the context's bitmask."""
+    __slots__ = ("sentences", "conjunctions", "disjunctions", "implications", "negations")
+    sentences: List[Sentence]
+    conjunctions: Dict[Sentence, int]
+    disjunctions: int
+    implications: Dict[Sentence, int]
+    negations: int
+    def __init__(self):
+        self.sentences = []  # bit index -> sentence
+        self.conjunctions = {}  # conjunct -> conjunctions having it as one side
+        self.disjunctions = 0
+        self.implications = {}  # consequent -> implications
+        self.negations = 0
+
+    def add(self, sentence: Sentence):
+        """Index the sentence that was given the next bit of the assumption table.
+
+        Args:
+            sentence: Sentence with bit index len(self.sentences)
+        """
+        bit = 1 << len(self.sentences)
+        self.sentences.append(sentence)
+        if isinstance(sentence, Negation):
+            self.negations |= bit
+        elif isinstance(sentence, TwoSided):
+            if sentence.oper == Operator.AND:
+                self.conjunctions[sentence.left] = self.conjunctions.get(sentence.left, 0) | bit
+                self.conjunctions[sentence.right] = self.conjunctions.get(sentence.right, 0) | bit
+            elif sentence.oper == Operator.OR:
+                self.disjunctions |= bit
+            elif sentence.oper == Operator.IMPLIES:
+                self.implications[sentence.right] = self.implications.get(sentence.right, 0) | bit
+
+    def select(self, mask: int) -> Iterator[Sentence]:
+        """Iterate over the sentences whose bits are set in mask.
+
+        Args:
+            mask: Bitmask over the assumption table
+
+        Returns:
+            Iterator over the selected sentences
+        """
+        while mask:
+            low = mask & -mask
+            yield self.sentences[low.bit_length() - 1]
+            mask ^= low
+
+
+class _FactStore:
+    """Derived (context, conclusion) facts, indexed for the lookups the inference rules need.
+
+    Contexts are bitmasks over an assumption table that may be shared between stores.
+    """
+    __slots__ = ("_derived", "_contexts", "_contexts_for", "_assumption_ids", "_assumed", "_scopes", "_limit", "_reads")
+    _derived: Dict[Tuple[int, Optional[Sentence]], int]
+    _contexts: Dict[int, _ContextIndex]
+    _contexts_for: Dict[Sentence, List[int]]
+    _assumption_ids: Dict[Sentence, int]
+    _assumed: Optional[_AssumptionIndex]
+    _scopes: "_FactStore"
+    _limit: Optional[int]
+    _reads: Optional[List[Tuple[int, Sentence]]]
+    def __init__(self, assumption_ids: Dict[Sentence, int], assumed: Optional[_AssumptionIndex],
+                 scopes: Optional["_FactStore"] = None):
+        # (context, conclusion) -> line of the first sequent deriving it
+        self._derived = {}
+        self._contexts = {}
+        # conclusion -> contexts deriving it, for the subset lookups of the expand rule
+        self._contexts_for = {}
+        # every distinct assumption gets a bit, so a context is an int bitmask: equality is an
+        # int compare, subset is a & ~b == 0 and extending a context is a single OR
+        self._assumption_ids = assumption_ids
+        self._assumed = assumed
+        # with implicit axioms, the store whose (context, None) facts mark the contexts opened
+        # as scopes by an axiom line; only there do all assumptions count as derived
+        self._scopes = self if scopes is None else scopes
+        # when set, only facts first derived before this line are visible, so a line that is
+        # re-checked after an edit sees the same facts it would in a check from scratch
+        self._limit = None
+        # when set, every fact that makes a lookup succeed is appended to it
+        self._reads = None
+
+    def _bit(self, sentence: Sentence) -> int:
+        index = self._assumption_ids.get(sentence)
+        if index is None:
+            index = self._assumption_ids[sentence] = len(self._assumption_ids)
+            if self._assumed is not None:
+                self._assumed.add(sentence)
+        return 1 << index
+
+    def _known_bit(self, sentence: Sentence) -> int:
+        # lookups must not grow the assumption table: a sentence without a bit is in no
+        # context, so nothing is derived under a context extended by it
+        index = self._assumption_ids.get(sentence)
+        return 0 if index is None else 1 << index
+
+    def _index(self, ctx: int, conclusion: Sentence, line: int):
+        # a sequent that re-derives a known fact is not re-indexed
+        key = (ctx, conclusion)
+        first = self._derived.get(key)
+        if first is None:
+            self._derived[key] = line
+            self._contexts.setdefault(ctx, _ContextIndex()).add(conclusion)
+            self._contexts_for.setdefault(conclusion, []).append(ctx)
+        elif line < first:
+            self._derived[key] = line
+
+    def _unindex(self, ctx: int, conclusion: Sentence):
+        del self._derived[(ctx, conclusion)]
+        self._contexts[ctx].remove(conclusion)
+        contexts = self._contexts_for[conclusion]
+        contexts.remove(ctx)
+        if not contexts:
+            del self._contexts_for[conclusion]
+
+    def _visible(self, key: Tuple[int, Sentence]) -> bool:
+        line = self._derived.get(key)
+        if line is None or self._limit is not None and line >= self._limit:
+            return False
+        if self._reads is not None:
+            self._reads.append(key)
+        return True
+
+    def _in_scope(self, ctx: int) -> bool:
+        # implicit axioms hold only in contexts an axiom line has opened, so a context made
+        # up by a rule (such as ctx | bit(A) for II) needs a subproof assuming A
+        return self._scopes._visible((ctx, None))
+
+    def _assumed_in(self, mask: int, ctx: int) -> int:
+        # the assumptions selected by mask that count as derived in ctx
+        if self._assumed is None or mask & ctx == 0 or not self._in_scope(ctx):
+            return 0
+        return mask & ctx
+
+    def _proves(self, ctx: int, conclusion: Sentence) -> bool:
+        if self._visible((ctx, conclusion)):
+            return True
+        return self._assumed is not None and self._assumed_in(self._known_bit(conclusion), ctx) != 0
+
+    def _proves_assuming(self, ctx: int, assumption: Sentence, conclusion: Sentence) -> bool:
+        # proves conclusion in ctx extended by assumption, as the introduction rules need
+        bit = self._known_bit(assumption)
+        return bit != 0 and self._proves(ctx | bit, conclusion)
+
+    def _has_conjunct(self, ctx: int, conjunct: Sentence) -> bool:
+        for conjunction in self._contexts.get(ctx, _EMPTY_INDEX).conjunctions.get(conjunct, ()):
+            if self._visible((ctx, conjunction)):
+                return True
+        return self._assumed is not None and self._assumed_in(self._assumed.conjunctions.get(conjunct, 0), ctx) != 0
+
+    def _disjunctions(self, ctx: int) -> Iterator[TwoSided]:
+        for disjunction in self._contexts.get(ctx, _EMPTY_INDEX).disjunctions:
+            if self._visible((ctx, disjunction)):
+                yield disjunction
+        if self._assumed is not None:
+            yield from self._assumed.select(self._assumed_in(self._assumed.disjunctions, ctx))
+
+    def _implications(self, ctx: int, consequent: Sentence) -> Iterator[TwoSided]:
+        for implication in self._contexts.get(ctx, _EMPTY_INDEX).implications.get(consequent, ()):
+            if self._visible((ctx, implication)):
+                yield implication
+        if self._assumed is not None:
+            yield from self._assumed.select(self._assumed_in(self._assumed.implications.get(consequent, 0), ctx))
+
+    def _negated(self, ctx: int) -> Iterator[Sentence]:
+        for inner, negation in self._contexts.get(ctx, _EMPTY_INDEX).negations.items():
+            if self._visible((ctx, negation)):
+                yield inner
+        if self._assumed is not None:
+            for negation in self._assumed.select(self._assumed_in(self._assumed.negations, ctx)):
+                yield negation.inner
+
+    def _weakens(self, ctx: int, conclusion: Sentence) -> bool:
+        if self._assumed is not None and self._assumed_in(self._known_bit(conclusion), ctx):
+            return True
+        for seq_ctx in self._contexts_for.get(conclusion, ()):
+            if seq_ctx & ~ctx == 0 and self._visible((seq_ctx, conclusion)):
+                return True
+        return False
+
+
+# key spacing given to lines once they can be inserted and removed, so a new line usually
+# fits between its neighbours' keys without re-keying the others
+_GAP = 1 << 32
+
+
+class Proof(_FactStore):
     """A proof in sequent calculus style.
+
+    Besides checking lines as they are added, a proof records which derived facts and which
+    cited lines each accepted line relied on. That lets replace_line, delete_line, insert_line
+    and remove_line re-check only the lines an edit can affect: the lines that used a fact the
+    edit removed, the rejected lines after a fact the edit added, and the lines whose
+    citations now point at a different line.
+
+    Internally a line is identified by a key that keeps its order when other lines are
+    inserted or removed. Keys are the line numbers themselves until the first insert or
+    remove; from then on _order maps line numbers to keys, so moving lines does not re-key
+    every table.
+
+    A proof that is only ever added to, such as one checked as it streams in, can skip this
+    bookkeeping with track_edits=False. It then keeps only the derived facts and, for each
+    accepted line, the line that first derived its fact, so rejected and repeated lines do
+    not add to its size.
     
     Generated automatically by Claude.
     """
-    sequents: List[Sequent]
-    def __init__(self):
+    __slots__ = ("_sequents", "_lines", "_next_line", "_order", "_line_facts", "_entries", "_derivers",
+                 "_uses", "_dependents", "_citers", "_rejected", "_ordered", "_pending")
+    _sequents: Optional[List[Sequent]]
+    _lines: Dict[int, Tuple[int, Sequent]]
+    _next_line: int
+    _order: Optional[List[int]]
+    _line_facts: Optional[array]
+    _entries: Dict[int, Tuple[Sequent, int]]
+    _derivers: Dict[Tuple[int, Sentence], Set[int]]
+    _uses: Dict[int, List[Tuple[int, Sentence]]]
+    _dependents: Dict[Tuple[int, Sentence], Set[int]]
+    _citers: Dict[int, Set[int]]
+    _rejected: List[int]
+    _ordered: bool
+    _pending: Optional[List[int]]
+    def __init__(self, implicit_axioms: bool = False, track_edits: bool = True):
         """Initialize an empty proof.
+
+        Args:
+            implicit_axioms: Treat every assumption of a context as derived in it, without
+                explicit axiom lines, once an axiom line has opened the context as a scope
+                (this is how Fitch-style proofs inherit assumptions)
+            track_edits: Keep what the edit methods need; without it the proof cannot be
+                edited, and sequents only holds the first line deriving each fact
         
         Generated automatically by Claude.
         """
-        self.sequents = []
+        super().__init__({}, _AssumptionIndex() if implicit_axioms else None)
+        # the accepted lines in order for output, rebuilt from _lines after an edit
+        self._sequents = []
+        # line key -> (context, accepted sequent), for premise citations
+        self._lines = {}
+        self._next_line = 1
+        # line number - 1 -> line key, once lines have been inserted or removed
+        self._order = None
+        # without edit tracking, line number - 1 -> first line deriving the line's fact, 0 if
+        # the line was not accepted; only those first lines are in _lines
+        self._line_facts = None if track_edits else array("q")
+        # line key -> (sequent, context) for every line added, accepted or not
+        self._entries = {}
+        # fact -> accepted lines deriving it
+        self._derivers = {}
+        # accepted line -> facts it used, and the reverse
+        self._uses = {}
+        self._dependents = {}
+        # line number -> keys of the lines citing it
+        self._citers = {}
+        # keys of the rejected lines, sorted
+        self._rejected = []
+        # edits need lines in check order, which holds if they were added in increasing order
+        self._ordered = True
+        # lines waiting to be re-checked during an edit, as a heap
+        self._pending = None
+
+    @property
+    def sequents(self) -> List[Sequent]:
+        """The accepted sequents, in line order once the proof has been edited."""
+        if self._sequents is None:
+            self._sequents = [sequent for _, (_, sequent) in sorted(self._lines.items())]
+        return self._sequents
+
+    def context(self, gamma) -> int:
+        """Encode a collection of assumptions as a bitmask over this proof's assumptions.
+
+        Args:
+            gamma: Gamma or any iterable of sentences
+
+        Returns:
+            Bitmask with one bit set per distinct sentence in gamma
+        """
+        mask = 0
+        for sentence in gamma:
+            mask |= self._bit(sentence)
+        return mask
 
     def proof_exists(self, gamma, conclusion):
         """Check if a proof exists for the given gamma and conclusion.
@@ -80,28 +418,387 @@ class Proof:
             
         Generated automatically by Claude.
         """
-        for sequent in self.sequents:
-            if gamma == sequent.gamma and sequent.conclusion == conclusion:
-                return True
+        return self._proves(self.context(gamma), conclusion)
 
-        return False
-
-    def add_sequent(self, sequent: Sequent) -> bool:
+    def add_sequent(self, sequent: Sequent, context: Optional[int] = None, line: Optional[int] = None) -> bool:
         """Add a sequent to the proof if it's valid.
+
+        A sequent that cites premises is checked against the cited lines only; otherwise the
+        whole proof is searched for premises that fit its rule.
         
         Args:
             sequent: The sequent to add
+            context: Bitmask of the sequent's gamma, if the caller already has it
+            line: Line number other sequents use to cite this one; defaults to the line
+                after the previous call's
             
         Returns:
             True if the sequent was added successfully
             
         Generated automatically by Claude.
         """
-        if self.check_sequent(sequent):
-            self.sequents.append(sequent)
-            return True
+        if line is None:
+            line = self._next_line
+        if self._entries and line < self._next_line:
+            self._ordered = False
+        ctx = self.context(sequent.gamma) if context is None else context
+        if self._line_facts is not None:
+            self._next_line = line + 1
+            return self._add_untracked(line, sequent, ctx)
+        key = self._extend(line)
+        self._next_line = line + 1
+
+        self._set_entry(key, sequent, ctx)
+        accepted, reads = self._evaluate(sequent, ctx)
+        if accepted:
+            if self._sequents is not None:
+                self._sequents.append(sequent)
+            self._accept(key, ctx, sequent, reads)
         else:
+            self._reject(key)
+        return accepted
+
+    def _add_untracked(self, line: int, sequent: Sequent, ctx: int) -> bool:
+        if not self._check(sequent, ctx, self._facts_for(sequent)):
             return False
+        first = self._derived.get((ctx, sequent.conclusion))
+        if first is None:
+            first = line
+            self._lines[line] = (ctx, sequent)
+            self._sequents.append(sequent)
+        for key in self._facts(ctx, sequent):
+            self._index(*key, line)
+        facts = self._line_facts
+        if len(facts) < line:
+            facts.extend(repeat(0, line - len(facts)))
+        facts[line - 1] = first
+        return True
+
+    def replace_line(self, line: int, sequent: Sequent) -> Dict[int, bool]:
+        """Replace the sequent at a line, or add it if the line is empty, and re-check the
+        lines the change can affect.
+
+        Only proofs whose lines were added in increasing line order, like sequent-style
+        proofs, can be edited.
+
+        Args:
+            line: Line number to replace
+            sequent: New sequent for the line
+
+        Returns:
+            Dict mapping each re-checked line, including this one, to whether it is accepted
+        """
+        self._require_ordered()
+        key = self._extend(line)
+        self._set_entry(key, sequent, self.context(sequent.gamma))
+        self._pending = []
+        results = {key: self._recheck(key)}
+        return self._numbered(self._drain(results))
+
+    def delete_line(self, line: int) -> Dict[int, bool]:
+        """Remove the sequent at a line, leaving the line empty, and re-check the lines the
+        removal can affect.
+
+        Args:
+            line: Line number to remove
+
+        Returns:
+            Dict mapping each re-checked line to whether it is accepted
+
+        Raises:
+            KeyError: If the line is not in the proof
+        """
+        self._require_ordered()
+        key = self._key(line)
+        if key not in self._entries:
+            raise KeyError(f"Line {line} is not in the proof!")
+        return self._numbered(self._delete(key))
+
+    def insert_line(self, line: int, sequent: Optional[Sequent] = None) -> Dict[int, bool]:
+        """Insert a line, moving it and every later line down by one, and re-check the lines
+        the change can affect.
+
+        Citations are line numbers, so besides the new line this re-checks the later lines
+        that cite a moved line.
+
+        Args:
+            line: Line number the new line gets
+            sequent: Sequent for the new line, or None to insert an empty line
+
+        Returns:
+            Dict mapping each re-checked line, in the new numbering, to whether it is accepted
+        """
+        self._require_ordered()
+        if self._order is None:
+            self._relabel()
+        key = self._insert_key(line)
+        self._pending = []
+        results = {}
+        if sequent is not None:
+            self._set_entry(key, sequent, self.context(sequent.gamma))
+            results[key] = self._recheck(key)
+        self._queue_moved_citers(line, len(self._order))
+        return self._numbered(self._drain(results))
+
+    def remove_line(self, line: int) -> Dict[int, bool]:
+        """Remove a line, moving every later line up by one, and re-check the lines the
+        change can affect.
+
+        Unlike delete_line, which leaves the line empty, the line itself disappears.
+
+        Args:
+            line: Line number to remove
+
+        Returns:
+            Dict mapping each re-checked line, in the new numbering, to whether it is accepted
+        """
+        self._require_ordered()
+        if self._order is None:
+            self._relabel()
+        key = self._key(line)
+        results = self._delete(key) if key in self._entries else {}
+        end = len(self._order)
+        if key is not None:
+            del self._order[line - 1]
+            self._next_line = len(self._order) + 1
+        self._pending = []
+        self._queue_moved_citers(line, end)
+        # lines re-checked before the move may need another look, so they are not skipped
+        results.update(self._drain({}))
+        return self._numbered(results)
+
+    def _delete(self, key: int) -> Dict[int, bool]:
+        self._pending = []
+        self._set_entry(key, None, 0)
+        if key in self._lines:
+            self._retract(key)
+            self._queue_citers(key)
+        self._unreject(key)
+        return self._drain({})
+
+    def _key(self, line: int) -> Optional[int]:
+        # the key of a line number, None for a line past the end once lines have moved
+        if self._line_facts is not None:
+            # without edit tracking, a line is looked up as the first line deriving its fact
+            if 1 <= line <= len(self._line_facts):
+                return self._line_facts[line - 1] or None
+            return None
+        if self._order is None:
+            return line
+        if 1 <= line <= len(self._order):
+            return self._order[line - 1]
+        return None
+
+    def _line(self, key: int) -> int:
+        # the current line number of a key
+        return key if self._order is None else bisect_left(self._order, key) + 1
+
+    def _numbered(self, results: Dict[int, bool]) -> Dict[int, bool]:
+        return {self._line(key): accepted for key, accepted in results.items()}
+
+    def _extend(self, line: int) -> int:
+        # the key of a line, adding empty lines up to it past the end
+        self._next_line = max(self._next_line, line + 1)
+        order = self._order
+        if order is None:
+            return line
+        while len(order) < line:
+            order.append(order[-1] + _GAP if order else _GAP)
+        return order[line - 1]
+
+    def _insert_key(self, line: int) -> int:
+        # a key between those of the lines around a new line, which moves later lines down
+        order = self._order
+        if line > 1:
+            self._extend(line - 1)
+        before = order[line - 2] if line > 1 else 0
+        after = order[line - 1] if line <= len(order) else before + 2 * _GAP
+        if after - before < 2:
+            self._relabel()
+            return self._insert_key(line)
+        key = (before + after) // 2
+        order.insert(line - 1, key)
+        self._next_line = len(order) + 1
+        return key
+
+    def _relabel(self):
+        # space the keys of all lines _GAP apart, re-keying every table; this happens before
+        # the first insert or remove, and afterwards only when inserts use up a gap
+        old = range(1, self._next_line) if self._order is None else self._order
+        self._order = [line * _GAP for line in range(1, len(old) + 1)]
+        move = dict(zip(old, self._order)).__getitem__
+
+        self._entries = {move(line): entry for line, entry in self._entries.items()}
+        self._lines = {move(line): entry for line, entry in self._lines.items()}
+        self._uses = {move(line): reads for line, reads in self._uses.items()}
+        self._rejected = [move(line) for line in self._rejected]
+        for key, first in self._derived.items():
+            self._derived[key] = move(first)
+        for table in (self._derivers, self._dependents, self._citers):
+            for key, lines in table.items():
+                table[key] = {move(line) for line in lines}
+        self._sequents = None
+
+    def _queue_moved_citers(self, start: int, end: int):
+        # after lines moved from line number start on, a citation of start or a later line
+        # up to end, the last line before or after the move, refers to a different line
+        first = self._key(start)
+        if first is None:
+            return
+        moved = range(start, end + 1)
+        if len(self._citers) < len(moved):
+            moved = [cited for cited in self._citers if start <= cited <= end]
+        for cited in moved:
+            for citer in self._citers.get(cited, ()):
+                if citer >= first:
+                    heappush(self._pending, citer)
+
+    def _require_ordered(self):
+        if self._line_facts is not None:
+            raise ValueError("Proofs created with track_edits=False cannot be edited!")
+        if not self._ordered:
+            raise ValueError("Only proofs whose lines were added in increasing order can be edited!")
+
+    def _set_entry(self, key: int, sequent: Optional[Sequent], ctx: int):
+        # record the sequent at a line, keeping the citation index in sync; None removes it
+        old = self._entries.get(key)
+        if old is not None and old[0].premises is not None:
+            for cited in old[0].premises:
+                self._citers[cited].discard(key)
+        if sequent is None:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (sequent, ctx)
+        if sequent.premises is not None:
+            for cited in sequent.premises:
+                self._citers.setdefault(cited, set()).add(key)
+
+    def _reject(self, line: int):
+        i = bisect_left(self._rejected, line)
+        if i == len(self._rejected) or self._rejected[i] != line:
+            self._rejected.insert(i, line)
+
+    def _unreject(self, line: int):
+        i = bisect_left(self._rejected, line)
+        if i < len(self._rejected) and self._rejected[i] == line:
+            del self._rejected[i]
+
+    def _evaluate(self, sequent: Sequent, ctx: int) -> Tuple[bool, List[Tuple[int, Sentence]]]:
+        # check a sequent, collecting the facts it relied on
+        self._reads = reads = []
+        try:
+            accepted = self._check(sequent, ctx, self._facts_for(sequent))
+        finally:
+            self._reads = None
+        return accepted, reads
+
+    def _facts(self, ctx: int, sequent: Sequent) -> Tuple[Tuple[int, Optional[Sentence]], ...]:
+        # the facts an accepted line derives; with implicit axioms an axiom line also opens
+        # its context as a scope
+        key = (ctx, sequent.conclusion)
+        if self._assumed is not None and sequent.rule == InferenceRule.axiom:
+            return key, (ctx, None)
+        return key,
+
+    def _accept(self, line: int, ctx: int, sequent: Sequent, reads: List[Tuple[int, Sentence]]):
+        self._lines[line] = (ctx, sequent)
+        self._set_uses(line, reads)
+        for key in self._facts(ctx, sequent):
+            first = self._derived.get(key)
+            self._derivers.setdefault(key, set()).add(line)
+            self._index(*key, line)
+            if self._pending is not None and (first is None or line < first):
+                # the fact is new or now available earlier, so rejected lines in between may pass
+                start = bisect_right(self._rejected, line)
+                end = len(self._rejected) if first is None else bisect_right(self._rejected, first)
+                for rejected in self._rejected[start:end]:
+                    heappush(self._pending, rejected)
+
+    def _retract(self, line: int):
+        ctx, sequent = self._lines.pop(line)
+        self._set_uses(line, ())
+        for key in self._facts(ctx, sequent):
+            derivers = self._derivers[key]
+            derivers.discard(line)
+            first = self._derived[key]
+            if not derivers:
+                del self._derivers[key]
+                self._unindex(*key)
+                new_first = None
+            elif line == first:
+                new_first = self._derived[key] = min(derivers)
+            else:
+                continue
+            if self._pending is not None:
+                # lines that used the fact before its new first derivation lost it
+                for dependent in self._dependents.get(key, ()):
+                    if new_first is None or dependent <= new_first:
+                        heappush(self._pending, dependent)
+
+    def _set_uses(self, line: int, reads):
+        for key in self._uses.pop(line, ()):
+            dependents = self._dependents[key]
+            dependents.discard(line)
+            if not dependents:
+                del self._dependents[key]
+        if reads:
+            reads = self._uses[line] = tuple(dict.fromkeys(reads))
+            for key in reads:
+                self._dependents.setdefault(key, set()).add(line)
+
+    def _queue_citers(self, line: int):
+        for citer in self._citers.get(self._line(line), ()):
+            if citer > line:
+                heappush(self._pending, citer)
+
+    def _recheck(self, line: int) -> bool:
+        # check a line again with only the facts of earlier lines visible, then update what
+        # it contributes, queueing the lines affected by the difference
+        sequent, ctx = self._entries[line]
+        self._limit = line
+        try:
+            accepted, reads = self._evaluate(sequent, ctx)
+        finally:
+            self._limit = None
+
+        old = self._lines.get(line)
+        if old is not None and accepted and self._facts(*old) == self._facts(ctx, sequent):
+            self._lines[line] = (ctx, sequent)
+            self._set_uses(line, reads)
+            return True
+        if old is not None:
+            self._retract(line)
+            self._queue_citers(line)
+        if accepted:
+            self._unreject(line)
+            self._accept(line, ctx, sequent, reads)
+            self._queue_citers(line)
+        else:
+            self._reject(line)
+        return accepted
+
+    def _drain(self, results: Dict[int, bool]) -> Dict[int, bool]:
+        # re-check queued lines in order; lines are only ever queued after the current one
+        while self._pending:
+            line = heappop(self._pending)
+            if line not in results and line in self._entries:
+                results[line] = self._recheck(line)
+        self._pending = None
+        self._sequents = None
+        return results
+
+    def _facts_for(self, sequent: Sequent) -> Optional[_FactStore]:
+        # the facts a sequent may use: its cited lines if it has citations, else the whole proof
+        if sequent.premises is None:
+            return self
+        cited = _FactStore(self._assumption_ids, self._assumed, self)
+        for line in sequent.premises:
+            key = self._key(line)
+            if key not in self._lines or self._limit is not None and key >= self._limit:
+                return None
+            ctx, premise = self._lines[key]
+            cited._index(ctx, premise.conclusion, key)
+        return cited
 
     def check_sequent(self, potential: Sequent):
         """Check if a sequent is valid according to the inference rules.
@@ -114,80 +811,64 @@ class Proof:
             
         Generated automatically by Claude.
         """
-        if potential.rule == InferenceRule.axiom:
-            for sentence in potential.gamma:
-                if sentence == potential.conclusion:
-                    return True
+        return self._check(potential, self.context(potential.gamma), self._facts_for(potential))
+
+    def _check(self, potential: Sequent, ctx: int, facts: Optional[_FactStore]):
+        if facts is None:
             return False
 
+        if potential.rule == InferenceRule.axiom:
+            return self._known_bit(potential.conclusion) & ctx != 0
+
         elif potential.rule == InferenceRule.and_intro:
             if not isinstance(potential.conclusion, TwoSided) or potential.conclusion.oper != Operator.AND:
                 return False
-            if self.proof_exists(potential.gamma, potential.conclusion.left) and self.proof_exists(potential.gamma, potential.conclusion.right):
+            if facts._proves(ctx, potential.conclusion.left) and facts._proves(ctx, potential.conclusion.right):
                 return True
             return False
 
         elif potential.rule == InferenceRule.and_elim:
-            for seq in self.sequents:
-                if isinstance(seq.conclusion, TwoSided) and seq.conclusion.oper == Operator.AND:
-                    if seq.gamma == potential.gamma:
-                        if seq.conclusion.right == potential.conclusion or seq.conclusion.left == potential.conclusion:
-                            return True
-            return False
+            return facts._has_conjunct(ctx, potential.conclusion)
 
         elif potential.rule == InferenceRule.or_intro:
             if not isinstance(potential.conclusion, TwoSided) or potential.conclusion.oper != Operator.OR:
                 return False
-            if self.proof_exists(potential.gamma, potential.conclusion.left) or self.proof_exists(potential.gamma, potential.conclusion.right):
+            if facts._proves(ctx, potential.conclusion.left) or facts._proves(ctx, potential.conclusion.right):
                 return True
             return False
 
         elif potential.rule == InferenceRule.or_elim:
-            phi_psi_options = []
-            for seq in self.sequents:
-                if seq.gamma == potential.gamma:
-                    if isinstance(seq.conclusion, TwoSided) and seq.conclusion.oper == Operator.OR:
-                        phi_psi_options.append(seq.conclusion)
-
-            for option in phi_psi_options:
-                gamma_prime_one = potential.gamma + [option.left]
-                gamma_prime_two = potential.gamma + [option.right]
-
-                if self.proof_exists(gamma_prime_one, potential.conclusion) and self.proof_exists(gamma_prime_two, potential.conclusion):
+            for option in facts._disjunctions(ctx):
+                if facts._proves_assuming(ctx, option.left, potential.conclusion) and facts._proves_assuming(ctx, option.right, potential.conclusion):
                     return True
             return False
 
         elif potential.rule == InferenceRule.implies_intro:
             if not isinstance(potential.conclusion, TwoSided) or potential.conclusion.oper != Operator.IMPLIES:
                 return False
-            gamma_prime = potential.gamma + [potential.conclusion.left]
-            if self.proof_exists(gamma_prime, potential.conclusion.right):
+            if facts._proves_assuming(ctx, potential.conclusion.left, potential.conclusion.right):
                 return True
             return False
 
         elif potential.rule == InferenceRule.implies_elim:
-            for seq in self.sequents:
-                if isinstance(seq.conclusion, TwoSided) and seq.conclusion.oper == Operator.IMPLIES:
-                    if seq.gamma == potential.gamma:
-                        if seq.conclusion.right == potential.conclusion and self.proof_exists(seq.gamma, seq.conclusion.left):
-                            return True
+            for implication in facts._implications(ctx, potential.conclusion):
+                if facts._proves(ctx, implication.left):
+                    return True
 
             return False
 
         elif potential.rule == InferenceRule.not_intro:
             if not isinstance(potential.conclusion, Negation):
                 return False
-            gamma_prime = potential.gamma + [potential.conclusion.inner]
-
-            if self.proof_exists(gamma_prime, False_Sym()):
+            if facts._proves_assuming(ctx, potential.conclusion.inner, False_Sym()):
                 return True
             return False
 
         elif potential.rule == InferenceRule.not_elim:
             if not isinstance(potential.conclusion, False_Sym):
                 return False
-            for seq in self.sequents:
-                if seq.gamma == potential.gamma and self.proof_exists(seq.gamma, Negation(seq.conclusion)):
+            for inner in facts._negated(ctx):
+                if facts._proves(ctx, inner):
                     return True
 
             return False
@@ -198,22 +879,17 @@ class Proof:
             return True
 
         elif potential.rule == InferenceRule.false_elim:
-            if self.proof_exists(potential.gamma, False_Sym()):
+            if facts._proves(ctx, False_Sym()):
                 return True
             return False
 
         elif potential.rule == InferenceRule.contra:
-            gamma_prime = potential.gamma + [Negation(potential.conclusion)]
-            if self.proof_exists(gamma_prime, False_Sym()):
+            if facts._proves_assuming(ctx, Negation(potential.conclusion), False_Sym()):
                 return True
             return False
 
         elif potential.rule == InferenceRule.expand:
-            for seq in self.sequents:
-                if seq.gamma.is_subset_of(potential.gamma) and potential.conclusion == seq.conclusion:
-                    return True
-
-            return False
+            return facts._weakens(ctx, potential.conclusion)
 
         else:
             raise ValueError(f"Rule of inference {potential.rule} not supported!")
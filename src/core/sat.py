@@ -0,0 +1,374 @@
+from heapq import heappush, heappop
+from typing import Dict, Iterable, List, Optional
+from .sentence import Sentence, Atomic, Negation, Operator, True_Sym, False_Sym
+
+# Literals are ints: variable v is 2 * v when positive and 2 * v + 1 when negated, so
+# lit ^ 1 is the negation of lit and lit >> 1 its variable.
+
+class Solver:
+    """A conflict-driven clause-learning SAT solver.
+
+    Uses two watched literals per clause for unit propagation, first-UIP clause learning with
+    non-chronological backtracking, VSIDS-style variable activities, phase saving and
+    geometric restarts.
+    """
+    def __init__(self):
+        """Initialize a solver with no variables or clauses."""
+        self.clauses = []
+        self.watches = []  # literal -> clauses watching it, visited when it becomes false
+        self.values = []  # literal -> 1 true, -1 false, 0 unassigned
+        self.level = []
+        self.reason = []
+        self.activity = []
+        self.phase = []
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.heap = []
+        self.var_inc = 1.0
+        self.ok = True
+        self.model = None
+
+    @property
+    def num_vars(self) -> int:
+        return len(self.level)
+
+    def new_var(self) -> int:
+        """Add a fresh variable.
+
+        Returns:
+            Index of the new variable
+        """
+        var = self.num_vars
+        self.watches += [[], []]
+        self.values += [0, 0]
+        self.level.append(0)
+        self.reason.append(None)
+        self.activity.append(0.0)
+        self.phase.append(False)
+        heappush(self.heap, (0.0, var))
+        return var
+
+    def add_clause(self, lits: Iterable[int]) -> bool:
+        """Add a clause, given as literals, before solving.
+
+        Args:
+            lits: Literals of the clause
+
+        Returns:
+            False if the clauses added so far are already unsatisfiable
+        """
+        if not self.ok:
+            return False
+        clause = []
+        for lit in set(lits):
+            if lit ^ 1 in clause or self.values[lit] == 1:
+                return True
+            if self.values[lit] == 0:
+                clause.append(lit)
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._assign(clause[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self._attach(clause)
+        return self.ok
+
+    def _attach(self, clause: List[int]) -> int:
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches[clause[0]].append(index)
+        self.watches[clause[1]].append(index)
+        return index
+
+    def _assign(self, lit: int, reason: Optional[int]):
+        self.values[lit] = 1
+        self.values[lit ^ 1] = -1
+        var = lit >> 1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def _propagate(self) -> Optional[int]:
+        # returns the index of a conflicting clause, or None
+        values = self.values
+        while self.qhead < len(self.trail):
+            false_lit = self.trail[self.qhead] ^ 1
+            self.qhead += 1
+            watching = self.watches[false_lit]
+            i = j = 0
+            while i < len(watching):
+                index = watching[i]
+                i += 1
+                clause = self.clauses[index]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                if values[first] == 1:
+                    watching[j] = index
+                    j += 1
+                    continue
+                for k in range(2, len(clause)):
+                    if values[clause[k]] != -1:
+                        clause[1], clause[k] = clause[k], false_lit
+                        self.watches[clause[1]].append(index)
+                        break
+                else:
+                    watching[j] = index
+                    j += 1
+                    if values[first] == -1:
+                        while i < len(watching):
+                            watching[j] = watching[i]
+                            j += 1
+                            i += 1
+                        del watching[j:]
+                        self.qhead = len(self.trail)
+                        return index
+                    self._assign(first, index)
+            del watching[j:]
+        return None
+
+    def _bump(self, var: int):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.heap = [(-self.activity[v], v) for v in range(self.num_vars) if self.values[2 * v] == 0]
+            self.heap.sort()
+        elif self.values[2 * var] == 0:
+            heappush(self.heap, (-self.activity[var], var))
+
+    def _analyze(self, conflict: int):
+        # first-UIP learning: returns the learnt clause (asserting literal first) and the
+        # level to backtrack to
+        seen = set()
+        learnt = [None]
+        current = len(self.trail_lim)
+        pending = 0
+        lit = None
+        index = len(self.trail) - 1
+        clause = self.clauses[conflict]
+        while True:
+            for q in (clause if lit is None else clause[1:]):
+                var = q >> 1
+                if var not in seen and self.level[var] > 0:
+                    seen.add(var)
+                    self._bump(var)
+                    if self.level[var] == current:
+                        pending += 1
+                    else:
+                        learnt.append(q)
+            while self.trail[index] >> 1 not in seen:
+                index -= 1
+            lit = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.clauses[self.reason[lit >> 1]]
+        learnt[0] = lit ^ 1
+
+        if len(learnt) == 1:
+            return learnt, 0
+        # the literal with the highest level among the rest becomes the second watch
+        best = max(range(1, len(learnt)), key=lambda k: self.level[learnt[k] >> 1])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, self.level[learnt[1] >> 1]
+
+    def _backtrack(self, level: int):
+        if len(self.trail_lim) <= level:
+            return
+        start = self.trail_lim[level]
+        for lit in self.trail[start:]:
+            var = lit >> 1
+            self.values[lit] = self.values[lit ^ 1] = 0
+            self.reason[var] = None
+            self.phase[var] = not lit & 1
+            heappush(self.heap, (-self.activity[var], var))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = start
+
+    def _decide(self) -> Optional[int]:
+        while self.heap:
+            _, var = heappop(self.heap)
+            if self.values[2 * var] == 0:
+                return 2 * var if self.phase[var] else 2 * var + 1
+        return None
+
+    def solve(self) -> bool:
+        """Search for a satisfying assignment of the clauses.
+
+        Returns:
+            True if the clauses are satisfiable; the assignment is then in self.model
+        """
+        self.model = None
+        if not self.ok:
+            return False
+        if self._propagate() is not None:
+            self.ok = False
+            return False
+
+        conflicts = 0
+        restart_limit = 100
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                conflicts += 1
+                learnt, level = self._analyze(conflict)
+                self._backtrack(level)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    self._assign(learnt[0], self._attach(learnt))
+                self.var_inc /= 0.95
+                if conflicts >= restart_limit:
+                    conflicts = 0
+                    restart_limit = int(restart_limit * 1.5)
+                    self._backtrack(0)
+            else:
+                lit = self._decide()
+                if lit is None:
+                    self.model = [self.values[2 * var] == 1 for var in range(self.num_vars)]
+                    self._backtrack(0)
+                    return True
+                self.trail_lim.append(len(self.trail))
+                self._assign(lit, None)
+
+
+class CNFEncoder:
+    """Tseitin encoding of sentences into a Solver's clauses.
+
+    Every distinct subsentence gets one literal defined by clauses equivalent to its
+    connective, so the encoding is linear in the size of the sentences.
+    """
+    solver: Solver
+    atoms: Dict[str, int]
+    def __init__(self, solver: Optional[Solver] = None):
+        """Initialize an encoder.
+
+        Args:
+            solver: Solver receiving the clauses; a new one by default
+        """
+        self.solver = Solver() if solver is None else solver
+        self.atoms = {}  # variable name -> solver variable
+        self._literals = {}  # sentence -> literal
+        self._true = None
+
+    def literal(self, sentence: Sentence) -> int:
+        """Get a literal equivalent to a sentence, adding its defining clauses if needed.
+
+        Args:
+            sentence: Sentence to encode
+
+        Returns:
+            Literal that is true exactly when the sentence is
+        """
+        solver = self.solver
+        literals = self._literals
+        for node in sentence.postorder():
+            if node in literals:
+                continue
+            if isinstance(node, (True_Sym, False_Sym)):
+                if self._true is None:
+                    self._true = 2 * solver.new_var()
+                    solver.add_clause([self._true])
+                lit = self._true if isinstance(node, True_Sym) else self._true ^ 1
+            elif isinstance(node, Atomic):
+                if node.name not in self.atoms:
+                    self.atoms[node.name] = solver.new_var()
+                lit = 2 * self.atoms[node.name]
+            elif isinstance(node, Negation):
+                lit = literals[node.inner] ^ 1
+            else:
+                a, b = literals[node.left], literals[node.right]
+                lit = 2 * solver.new_var()
+                if node.oper == Operator.AND:
+                    solver.add_clause([lit ^ 1, a])
+                    solver.add_clause([lit ^ 1, b])
+                    solver.add_clause([lit, a ^ 1, b ^ 1])
+                elif node.oper == Operator.OR:
+                    solver.add_clause([lit ^ 1, a, b])
+                    solver.add_clause([lit, a ^ 1])
+                    solver.add_clause([lit, b ^ 1])
+                elif node.oper == Operator.IMPLIES:
+                    solver.add_clause([lit ^ 1, a ^ 1, b])
+                    solver.add_clause([lit, a])
+                    solver.add_clause([lit, b ^ 1])
+                else:
+                    raise NotImplementedError()
+            literals[node] = lit
+        return literals[sentence]
+
+    def assert_true(self, sentence: Sentence):
+        """Require a sentence to hold in every model.
+
+        Args:
+            sentence: Sentence to assert
+        """
+        self.solver.add_clause([self.literal(sentence)])
+
+    def assignment(self) -> Dict[str, bool]:
+        """Read the variable assignment of the solver's last model.
+
+        Returns:
+            Dict mapping each encoded variable name to its value
+        """
+        return {name: self.solver.model[var] for name, var in self.atoms.items()}
+
+
+def satisfying_assignment(sentences: Iterable[Sentence]) -> Optional[Dict[str, bool]]:
+    """Find an assignment making every given sentence true.
+
+    Args:
+        sentences: Sentences to satisfy together
+
+    Returns:
+        Dict mapping the variables of the sentences to values, or None if they are
+        unsatisfiable
+    """
+    encoder = CNFEncoder()
+    for sentence in sentences:
+        encoder.assert_true(sentence)
+    if encoder.solver.solve():
+        return encoder.assignment()
+    return None
+
+
+class Entailment:
+    """Result of an entailment query; true when the entailment holds."""
+    holds: bool
+    counter_model: Optional[Dict[str, bool]]
+    def __init__(self, counter_model: Optional[Dict[str, bool]]):
+        """Initialize a result.
+
+        Args:
+            counter_model: Assignment making the premises true and the conclusion false,
+                or None if the entailment holds
+        """
+        self.holds = counter_model is None
+        self.counter_model = counter_model
+
+    def __bool__(self):
+        return self.holds
+
+    def __repr__(self):
+        return f"Entailment(holds={self.holds}, counter_model={self.counter_model})"
+
+
+def entails(gamma, conclusion: Sentence) -> Entailment:
+    """Decide whether the premises semantically entail a conclusion.
+
+    Args:
+        gamma: Gamma or any iterable of premise sentences
+        conclusion: Sentence that should follow from them
+
+    Returns:
+        Entailment that holds when every model of gamma satisfies conclusion, carrying a
+        counter-model otherwise
+    """
+    return Entailment(satisfying_assignment(list(gamma) + [Negation(conclusion)]))
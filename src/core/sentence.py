@@ -1,16 +1,145 @@
 from abc import ABC
 from enum import Enum
-from typing import List, Iterable, MutableSequence
-from copy import deepcopy
+from typing import List, Iterable, Optional, Sequence
+from itertools import chain as chain_iterables
+from hashlib import blake2b
+import threading
+import weakref
 from .errors import VariableNotAssignedError
 
+# Unique table for hash-consing: structurally equal sentences are built only once, so
+# equality is an identity check. Children are interned before their parents, which means
+# a node is fully identified by its class, its own fields and the identity of its children.
+# The same order lets a new node derive its metadata (size, depth, structural hash) from its
+# children's in constant time.
+_unique_table = weakref.WeakValueDictionary()
+_unique_lock = threading.Lock()
+
+
+def _intern(cls, key, fields):
+    """Return the interned node for key, building it from fields if it does not exist yet.
+
+    Args:
+        cls: Concrete sentence class to instantiate
+        key: Hashable key identifying the node structurally
+        fields: Sequence of (attribute, value) pairs to set on a new node
+
+    Returns:
+        The unique node for key
+    """
+    node = _unique_table.get(key)
+    if node is not None:
+        return node
+    with _unique_lock:
+        node = _unique_table.get(key)
+        if node is None:
+            node = object.__new__(cls)
+            for attr, value in fields:
+                object.__setattr__(node, attr, value)
+            node._derive_metadata()
+            _unique_table[key] = node
+    return node
+
+
 class Sentence(ABC):
     """Abstract base class for logical sentences in propositional logic.
+
+    Sentences are immutable and hash-consed: constructing a sentence that is structurally
+    equal to a live one returns the existing object, so equality is an identity check and
+    sentences can be used as dict or set keys.
+
+    Every node also carries metadata computed once: ``size`` (number of nodes in the tree),
+    ``depth`` (0 for atomic sentences), ``structural_hash`` (a blake2b-based hash that only
+    depends on the structure, so it is stable across processes) and the lazily computed
+    ``atoms``.
     
     Generated automatically by Claude.
     """
+    __slots__ = ("size", "depth", "structural_hash", "_atoms", "__weakref__")
+    size: int
+    depth: int
+    structural_hash: int
+    _atoms: Optional[frozenset]
+
+    def _derive_metadata(self):
+        # called once by _intern on a new node, after its fields are set
+        children = self.children()
+        digest = blake2b(self._tag(), digest_size=8)
+        for child in children:
+            digest.update(child.structural_hash.to_bytes(8, "little", signed=True))
+        object.__setattr__(self, "structural_hash", int.from_bytes(digest.digest(), "little", signed=True))
+        object.__setattr__(self, "size", 1 + sum(child.size for child in children))
+        object.__setattr__(self, "depth", 1 + max(child.depth for child in children) if children else 0)
+        object.__setattr__(self, "_atoms", None)
+
+    def _tag(self) -> bytes:
+        # identifies the node's class and own fields in the structural hash
+        raise NotImplementedError()
+
+    @property
+    def atoms(self) -> frozenset:
+        """Names of the atomic sentences in this sentence, computed on first use."""
+        if self._atoms is None:
+            names = set()
+            visited = set()
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                if node._atoms is not None:
+                    names |= node._atoms
+                elif isinstance(node, Atomic):
+                    names.add(node.name)
+                elif node not in visited:
+                    visited.add(node)
+                    stack.extend(node.children())
+            object.__setattr__(self, "_atoms", frozenset(names))
+        return self._atoms
+
+    def __reduce__(self):
+        # nested constructor calls would make pickle recurse once per level, so a compound
+        # sentence is written as the flat node arrays of an arena and rebuilt bottom-up
+        from .arena import SentenceArena
+        arena = SentenceArena()
+        arena.add(self)
+        return (_from_nodes, (arena.ops, arena.lefts, arena.rights, arena.names))
+
+    def children(self) -> tuple:
+        """Get the direct subsentences of this sentence.
+
+        Returns:
+            Tuple of the operands, empty for atomic sentences
+        """
+        raise NotImplementedError()
+
+    def postorder(self) -> List["Sentence"]:
+        """Get the distinct nodes of this sentence, each one after all of its subsentences.
+
+        Subsentences shared between branches appear once. The traversal uses an explicit
+        stack, so it works at any nesting depth.
+
+        Returns:
+            List of nodes ending with this sentence
+        """
+        order = []
+        visited = set()
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+            elif node not in visited:
+                visited.add(node)
+                stack.append((node, True))
+                for child in reversed(node.children()):
+                    if child not in visited:
+                        stack.append((child, False))
+        return order
+
     def evaluate(self, variable_assignment: dict) -> bool:
         """Evaluate the sentence under the given variable assignment.
+
+        Connectives short-circuit like Python's ``and``/``or``, so variables in an operand that
+        does not affect the result need not be assigned.
         
         Args:
             variable_assignment: Dict mapping variable names to boolean values
@@ -20,23 +149,105 @@ class Sentence(ABC):
             
         Generated automatically by Claude.
         """
-        raise NotImplementedError()
+        known = {}
+        values = []
+        # stages: 0 = not visited, 1 = left operand evaluated, 2 = right operand evaluated,
+        # 3 = negated operand evaluated; operand values are kept on the values stack
+        stack = [(self, 0)]
+        while stack:
+            node, stage = stack.pop()
+            if stage == 0:
+                if node in known:
+                    values.append(known[node])
+                elif isinstance(node, Atomic):
+                    values.append(node.evaluate(variable_assignment))
+                elif isinstance(node, Negation):
+                    stack.append((node, 3))
+                    stack.append((node.inner, 0))
+                else:
+                    if node.oper not in (Operator.AND, Operator.OR, Operator.IMPLIES):
+                        raise NotImplementedError()
+                    stack.append((node, 1))
+                    stack.append((node.left, 0))
+            elif stage == 1:
+                left = values[-1]
+                if node.oper == Operator.AND:
+                    decided = not left
+                elif node.oper == Operator.OR:
+                    decided = bool(left)
+                else:
+                    decided = not left
+                    if decided:
+                        values[-1] = True
+                if decided:
+                    known[node] = values[-1]
+                else:
+                    # the right operand's value becomes the node's value
+                    values.pop()
+                    stack.append((node, 2))
+                    stack.append((node.right, 0))
+            elif stage == 2:
+                known[node] = values[-1]
+            else:
+                values[-1] = not values[-1]
+                known[node] = values[-1]
+        return values[-1]
+
+    def compile(self, atoms=None):
+        """Lower the sentence to a flat function for repeated evaluation.
+
+        Args:
+            atoms: Variable names in the order the function takes them; defaults to the
+                sorted names of the sentence's variables
+
+        Returns:
+            CompiledSentence callable with one positional value per atom
+        """
+        from .compiled import CompiledSentence
+        return CompiledSentence(self, atoms)
 
     def get_atomics(self) -> Iterable:
         """Get all atomic variables that appear in this sentence.
         
         Returns:
-            Set of atomic variable names
+            Frozen set of atomic variable names
             
         Generated automatically by Claude.
         """
-        raise NotImplementedError()
+        return self.atoms
 
     def __str__(self):
-        raise NotImplementedError()
+        parts = []
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+            elif isinstance(item, Atomic):
+                parts.append(item.name)
+            elif isinstance(item, Negation):
+                stack.extend((")", item.inner, f"({Operator.NOT.value} "))
+            else:
+                stack.extend((")", item.right, f" {item.oper.value} ", item.left, "("))
+        return "".join(parts)
 
     def __eq__(self, value):
-        raise NotImplementedError()
+        # sentences are hash-consed, so structural equality is identity
+        return self is value
+
+    __hash__ = object.__hash__
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable!")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable!")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
 class Operator(Enum):
     OR = "OR"
@@ -44,21 +255,28 @@ class Operator(Enum):
     IMPLIES = "IMPLIES"
     NOT = "NOT"
 
+def _from_nodes(ops, lefts, rights, names) -> Sentence:
+    # unpickles what Sentence.__reduce__ wrote; the sentence is the arena's last node
+    from .arena import SentenceArena
+    return SentenceArena.from_nodes(ops, lefts, rights, names).sentence(len(ops) - 1)
+
+
 class Atomic(Sentence):
     """Atomic propositional variable.
     
     Generated automatically by Claude.
     """
+    __slots__ = ("name",)
     name: str
-    def __init__(self, name: str):
-        """Initialize an atomic sentence.
+    def __new__(cls, name: str):
+        """Return the atomic sentence with the given name.
         
         Args:
             name: The name of the propositional variable
             
         Generated automatically by Claude.
         """
-        self.name = name
+        return _intern(cls, (cls, name), (("name", name),))
 
     def evaluate(self, variable_assignment: dict) -> bool:
         try:
@@ -66,15 +284,14 @@ class Atomic(Sentence):
         except KeyError as e:
             raise VariableNotAssignedError(f"Variable {self.name} not found in variable assignment!") from None
 
-    def get_atomics(self) -> Iterable:
-        s = set()
-        s.add(self.name)
-        return s
+    def children(self) -> tuple:
+        return ()
 
-    def __eq__(self, value):
-        if not isinstance(value, Atomic):
-            return False
-        return self.name == value.name
+    def _tag(self) -> bytes:
+        return f"{type(self).__name__}:{self.name}".encode()
+
+    def __reduce__(self):
+        return (type(self), (self.name,))
 
     def __str__(self):
         return self.name
@@ -85,14 +302,15 @@ class True_Sym(Atomic):
     
     Generated automatically by Claude.
     """
-    def __init__(self):
-        super().__init__("TRUE")
+    __slots__ = ()
+    def __new__(cls):
+        return super().__new__(cls, "TRUE")
 
     def evaluate(self, variable_assignment):
         return True
 
-    def __eq__(self, value):
-        return isinstance(value, True_Sym)
+    def __reduce__(self):
+        return (type(self), ())
 
 
 class False_Sym(Atomic):
@@ -100,14 +318,15 @@ class False_Sym(Atomic):
     
     Generated automatically by Claude.
     """
-    def __init__(self):
-        super().__init__("FALSE")
+    __slots__ = ()
+    def __new__(cls):
+        return super().__new__(cls, "FALSE")
 
     def evaluate(self, variable_assignment):
         return False
 
-    def __eq__(self, value):
-        return isinstance(value, False_Sym)
+    def __reduce__(self):
+        return (type(self), ())
 
 
 class Negation(Sentence):
@@ -115,42 +334,35 @@ class Negation(Sentence):
     
     Generated automatically by Claude.
     """
+    __slots__ = ("inner",)
     inner: Sentence
-    def __init__(self, inner):
-        """Initialize a negation.
+    def __new__(cls, inner):
+        """Return the negation of a sentence.
         
         Args:
             inner: The sentence to negate
             
         Generated automatically by Claude.
         """
-        super().__init__()
-        self.inner = inner
-
-    def evaluate(self, variable_assignment) -> bool:
-        return not self.inner.evaluate(variable_assignment)
+        return _intern(cls, (cls, inner), (("inner", inner),))
 
-    def get_atomics(self) -> Iterable:
-        return self.inner.get_atomics()
+    def children(self) -> tuple:
+        return (self.inner,)
 
-    def __eq__(self, value):
-        if not isinstance(value, Negation):
-            return False
-        return self.inner.__eq__(value.inner)
-
-    def __str__(self):
-        return f"({Operator.NOT.value} {self.inner})"
+    def _tag(self) -> bytes:
+        return b"Negation:"
 
 class TwoSided(Sentence):
     """Binary connective sentence (AND, OR, IMPLIES).
     
     Generated automatically by Claude.
     """
+    __slots__ = ("left", "right", "oper")
     left: Sentence
     right: Sentence
     oper: Operator
-    def __init__(self, left, right, oper):
-        """Initialize a binary connective sentence.
+    def __new__(cls, left, right, oper):
+        """Return the binary connective sentence over two operands.
         
         Args:
             left: Left operand sentence
@@ -159,43 +371,31 @@ class TwoSided(Sentence):
             
         Generated automatically by Claude.
         """
-        super().__init__()
-        self.oper = oper
-        self.left = left
-        self.right = right
+        return _intern(cls, (cls, left, right, oper), (("oper", oper), ("left", left), ("right", right)))
 
-    def get_atomics(self):
-        return self.left.get_atomics() | self.right.get_atomics()
+    def children(self) -> tuple:
+        return (self.left, self.right)
 
-    def evaluate(self, variable_assignment):
-        if self.oper == Operator.AND:
-            return self.left.evaluate(variable_assignment) and self.right.evaluate(variable_assignment)
-        if self.oper == Operator.OR:
-            return self.left.evaluate(variable_assignment) or self.right.evaluate(variable_assignment)
-        if self.oper == Operator.IMPLIES:
-            return (not self.left.evaluate(variable_assignment)) or self.right.evaluate(variable_assignment)
-        else:
-            raise NotImplementedError()
+    def _tag(self) -> bytes:
+        return f"TwoSided:{self.oper.value}:".encode()
 
-    def __eq__(self, value):
-        if not isinstance(value, TwoSided):
-            return False
 
-        if self.oper != value.oper:
-            return False
-
-        return self.left.__eq__(value.left) and self.right.__eq__(value.right)
-
-    def __str__(self):
-        return "(" + self.left.__str__() + " " + self.oper.value + " " + self.right.__str__() + ")"
-
-
-class Gamma(MutableSequence):
+class Gamma(Sequence):
     """Collection of sentences representing assumptions or premises.
+
+    A gamma is immutable and persistent: extending it with ``gamma + [sentence]`` creates a
+    new node that points at the original gamma and holds only the added sentences, so contexts
+    that grow one assumption at a time share all of their structure. Items keep their insertion
+    order for display, but comparisons treat a gamma as a set.
     
     Generated automatically by Claude.
     """
-    _items: List[Sentence]
+    __slots__ = ("_parent", "_segment", "_len", "_flat", "_frozen")
+    _parent: Optional["Gamma"]
+    _segment: tuple
+    _len: int
+    _flat: Optional[tuple]
+    _frozen: Optional[frozenset]
     def __init__(self, *args):
         """Initialize a gamma collection.
         
@@ -205,45 +405,97 @@ class Gamma(MutableSequence):
         Generated automatically by Claude.
         """
         if len(args) == 0:
-            self._items = []
+            items = ()
         elif len(args) == 1:
             arg = args[0]
             if isinstance(arg, Sentence):
-                self._items = [arg]
-            elif isinstance(arg, (list, tuple)):
-                self._items = list(arg)
+                items = (arg,)
+            elif isinstance(arg, (list, tuple, Gamma)):
+                items = tuple(arg)
             else:
-                pass
+                raise TypeError(f"Cannot build a gamma from {type(arg)}!")
         else:
-            self._items = list(args)
+            items = tuple(args)
+        self._parent = None
+        self._segment = items
+        self._len = len(items)
+        self._flat = items
+        self._frozen = None
+
+    def _extend(self, segment: tuple) -> "Gamma":
+        if not segment:
+            return self
+        node = object.__new__(Gamma)
+        node._parent = self
+        node._segment = segment
+        node._len = self._len + len(segment)
+        node._flat = None
+        node._frozen = None
+        return node
+
+    def _chain(self) -> List["Gamma"]:
+        # nodes from the root (or the nearest node whose items are flattened) down to self
+        chain = []
+        node = self
+        while node is not None:
+            chain.append(node)
+            if node._flat is not None:
+                break
+            node = node._parent
+        chain.reverse()
+        return chain
+
+    def _items(self) -> tuple:
+        if self._flat is None:
+            chain = self._chain()
+            items = list(chain[0]._flat)
+            for node in chain[1:]:
+                items.extend(node._segment)
+            self._flat = tuple(items)
+        return self._flat
 
     def __getitem__(self, index) -> Sentence:
-        return self._items[index]
-
-    def __setitem__(self, index, value: Sentence):
-        self._items[index] = value
+        return self._items()[index]
 
-    def __delitem__(self, index):
-        del self._items[index]
+    def __iter__(self):
+        if self._flat is not None:
+            return iter(self._flat)
+        chain = self._chain()
+        return chain_iterables(chain[0]._flat, *(node._segment for node in chain[1:]))
 
     def __len__(self):
-        return len(self._items)
+        return self._len
+
+    def __contains__(self, value):
+        return value in self.frozen()
 
-    def insert(self, index, value: Sentence):
-        self._items.insert(index, value)
+    def frozen(self) -> frozenset:
+        """Get the distinct sentences of this gamma as a frozenset.
+
+        The frozenset (and therefore its hash) is computed once, starting from the nearest
+        ancestor whose frozenset is already known.
+
+        Returns:
+            Frozenset of the sentences in this gamma
+        """
+        if self._frozen is None:
+            pending = []
+            node = self
+            while node._frozen is None and node._parent is not None:
+                pending.append(node._segment)
+                node = node._parent
+            base = node._frozen if node._frozen is not None else frozenset(node._segment)
+            self._frozen = base.union(*pending) if pending else base
+        return self._frozen
 
     def __eq__(self, other_gamma):
         if not isinstance(other_gamma, Gamma):
             return False
 
-        if len(self) != len(other_gamma):
-            return False
+        return self is other_gamma or self.frozen() == other_gamma.frozen()
 
-        for sentence in self._items:
-            if sentence not in other_gamma._items:
-                return False
-
-        return True
+    def __hash__(self):
+        return hash(self.frozen())
 
     def is_subset_of(self, other):
         """Check if this gamma is a subset of another gamma.
@@ -256,24 +508,15 @@ class Gamma(MutableSequence):
             
         Generated automatically by Claude.
         """
-        for sentence in self._items:
-            if sentence not in other:
-                return False
+        if isinstance(other, Gamma):
+            return self.frozen() <= other.frozen()
 
-        return True
-
-    def __iadd__(self, values):
-        self._items.__iadd__(values)
-        return self
+        return all(sentence in other for sentence in self.frozen())
 
     def __add__(self, values):
-        if isinstance(values, Gamma):
-            new_items = deepcopy(self._items).__add__(deepcopy(values._items))
-        elif isinstance(values, list):
-            new_items = deepcopy(self._items).__add__(values)
-        else:
-            raise AttributeError(f"values type {type(values)} not supported!")
-        return Gamma(new_items)
+        if isinstance(values, (Gamma, list, tuple)):
+            return self._extend(tuple(values))
+        raise AttributeError(f"values type {type(values)} not supported!")
 
     def __str__(self):
-        return [item.__str__() for item in self._items].__str__()
\ No newline at end of file
+        return [item.__str__() for item in self].__str__()
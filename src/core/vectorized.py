@@ -0,0 +1,108 @@
+from typing import List, Optional, Sequence
+from .sentence import Sentence, Atomic, Negation, Operator, True_Sym, False_Sym
+from .compiled import variables
+from .errors import VariableNotAssignedError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def truth_table_columns(k: int) -> List[int]:
+    """Build packed bit columns enumerating every assignment of k variables.
+
+    Row r assigns variable j the bit (r >> (k - 1 - j)) & 1, so rows follow the usual truth
+    table order with the first variable as the most significant bit.
+
+    Args:
+        k: Number of variables
+
+    Returns:
+        List of k ints; bit r of column j is the value of variable j in row r
+    """
+    rows = 1 << k
+    columns = []
+    for j in range(k):
+        half = 1 << (k - 1 - j)
+        # one period is half zeros followed by half ones; doubling repeats it over all rows
+        column = ((1 << half) - 1) << half
+        width = 2 * half
+        while width < rows:
+            column |= column << width
+            width *= 2
+        columns.append(column)
+    return columns
+
+def unpack(bits: int, rows: int) -> List[bool]:
+    """Expand a packed bit column into one bool per row.
+
+    Args:
+        bits: Packed column, bit r holding row r
+        rows: Number of rows
+
+    Returns:
+        List of row values
+    """
+    return [bool(bits >> r & 1) for r in range(rows)]
+
+def evaluate_many(sentence: Sentence, atoms: Optional[Sequence[str]], assignments, rows: Optional[int] = None):
+    """Evaluate a sentence under many assignments at once.
+
+    Each connective is one whole-column operation, either on NumPy arrays or on Python ints
+    used as packed bit columns.
+
+    Args:
+        sentence: Sentence to evaluate
+        atoms: Variable names in column order; defaults to the sorted variable names of the
+            sentence
+        assignments: Either an N x k NumPy bool array with one column per atom, or a sequence
+            of k ints holding packed bit columns (bit r of column j is atom j in row r)
+        rows: Number of rows N, required for packed bit columns
+
+    Returns:
+        N-length NumPy bool array for array input, or a packed int with bit r holding the
+        value of row r for packed input
+    """
+    atoms = variables(sentence) if atoms is None else tuple(atoms)
+
+    if np is not None and isinstance(assignments, np.ndarray):
+        if assignments.ndim != 2 or assignments.shape[1] != len(atoms):
+            raise ValueError(f"Expected an N x {len(atoms)} array of assignments!")
+        assignments = assignments.astype(bool, copy=False)
+        columns = {name: assignments[:, j] for j, name in enumerate(atoms)}
+        true = np.ones(assignments.shape[0], dtype=bool)
+        false = np.zeros(assignments.shape[0], dtype=bool)
+        negate = np.logical_not
+    else:
+        if rows is None:
+            raise ValueError("rows is required for packed bit columns!")
+        if len(assignments) != len(atoms):
+            raise ValueError(f"Expected {len(atoms)} packed columns!")
+        true = (1 << rows) - 1
+        false = 0
+        columns = {name: column & true for name, column in zip(atoms, assignments)}
+        negate = true.__xor__
+
+    values = {}
+    for node in sentence.postorder():
+        if isinstance(node, True_Sym):
+            value = true
+        elif isinstance(node, False_Sym):
+            value = false
+        elif isinstance(node, Atomic):
+            try:
+                value = columns[node.name]
+            except KeyError:
+                raise VariableNotAssignedError(f"Variable {node.name} not found in the assignment columns!") from None
+        elif isinstance(node, Negation):
+            value = negate(values[node.inner])
+        elif node.oper == Operator.AND:
+            value = values[node.left] & values[node.right]
+        elif node.oper == Operator.OR:
+            value = values[node.left] | values[node.right]
+        elif node.oper == Operator.IMPLIES:
+            value = negate(values[node.left]) | values[node.right]
+        else:
+            raise NotImplementedError()
+        values[node] = value
+    return values[sentence]
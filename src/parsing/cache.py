@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from typing import Callable, Hashable
+import threading
+
+_MISSING = object()
+
+class LRUCache:
+    """Bounded, thread-safe least-recently-used cache with usage counters.
+
+    Intended for memoizing parse results, which are immutable and safe to share.
+    """
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    def __init__(self, maxsize: int = 4096):
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries kept; the least recently used entry is evicted
+                when it is exceeded
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive!")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable):
+        """Get the value cached for key, computing and caching it on a miss.
+
+        compute runs outside the lock, so concurrent misses on the same key may both compute
+        it; exceptions raised by compute propagate and nothing is cached.
+
+        Args:
+            key: Cache key
+            compute: Function of key producing the value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = compute(key)
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def resize(self, maxsize: int):
+        """Change the maximum number of entries, evicting the oldest ones if needed.
+
+        Args:
+            maxsize: New maximum number of entries
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive!")
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Get the usage counters of the cache.
+
+        Returns:
+            Dict with hits, misses, evictions, the current size and maxsize
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+    def __len__(self):
+        return len(self._entries)
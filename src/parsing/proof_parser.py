@@ -0,0 +1,103 @@
+from src.core.errors import ParseError
+from src.core.proof import Sequent, InferenceRule
+from src.core.sentence import Gamma
+from src.parsing.propositional_parser import parse_string
+from src.parsing.cache import LRUCache
+
+# assumption list text -> Gamma; gammas are immutable, so sequents can share them
+gamma_cache = LRUCache(maxsize=4096)
+
+def line2conclusion(line):
+    """
+    Parse the following format: "conclusion :RULE". This will appear in both sequent-style and
+    fitch-style proofs. The rule may be followed by the line numbers of its premises, as in
+    "conclusion :IE 3,7", in which case only those lines are used to check it.
+    """
+    if ':' not in line:
+        raise ParseError('Invalid format. Missing inference rule.' \
+                         'Expected format: [assumption_1, assumption_2, ...] |- conclusion :RULE')
+
+    conclusion_str, rule_str = line.rsplit(':', 1)
+    conclusion_str = conclusion_str.strip()
+    rule_str, *citation_strs = rule_str.split(None, 1) or ['']
+
+    conclusion = parse_string(conclusion_str)
+
+    rule_map = {
+        'AX': InferenceRule.axiom,
+        'AI': InferenceRule.and_intro,
+        'AE': InferenceRule.and_elim,
+        'OI': InferenceRule.or_intro,
+        'OE': InferenceRule.or_elim,
+        'II': InferenceRule.implies_intro,
+        'IE': InferenceRule.implies_elim,
+        'NI': InferenceRule.not_intro,
+        'NE': InferenceRule.not_elim,
+        'TI': InferenceRule.true_intro,
+        'FE': InferenceRule.false_elim,
+        'EX': InferenceRule.expand,
+        'IP': InferenceRule.contra
+    }
+
+    if rule_str not in rule_map:
+        raise ParseError(f'{rule_str} is not one of the valid rules of inference!')
+
+    premises = None
+    if citation_strs:
+        line_strs = [s.strip() for s in citation_strs[0].split(',')]
+        # isdigit alone also accepts digits such as "²" that int() rejects
+        if not all(s.isascii() and s.isdigit() for s in line_strs):
+            raise ParseError(f'{citation_strs[0]} is not a comma-separated list of premise line numbers!')
+        premises = tuple(int(s) for s in line_strs)
+
+    return conclusion, rule_map[rule_str], premises
+
+def parse_gamma(assumptions_str):
+    """Parse a comma-separated list of assumptions.
+
+    Args:
+        assumptions_str: Assumptions without the surrounding brackets
+
+    Returns:
+        Gamma of the parsed assumptions
+    """
+    if assumptions_str == '':
+        return Gamma()
+
+    assumption_strs = [s.strip() for s in assumptions_str.split(',') if s.strip()]
+    return Gamma([parse_string(s) for s in assumption_strs])
+
+def line2sequent(line):
+    """Parse a line into a sequent object.
+    
+    Args:
+        line: String in format "[assumptions] |- conclusion :RULE"
+        
+    Returns:
+        Sequent object
+        
+    Generated automatically by Claude.
+    """
+    """
+    Parse the line format: "[assumption_1, assumption_2, ...] |- conclusion :RULE"
+    """
+    if '|-' not in line:
+        raise ParseError('Invalid format. Missing a turnstile |- separator.' \
+                         'Expected format: [assumption_1, assumption_2, ...] |- conclusion :RULE')
+
+    parts = line.split('|-')
+    if len(parts) != 2:
+        raise ParseError('Invalid format. Expected single turnstile |- separator.' \
+                         'Expected format: [assumption_1, assumption_2, ...] |- conclusion :RULE')
+
+    assumptions_str = parts[0].strip()
+    conclusion_rule = parts[1].strip()
+
+    assumptions_str = assumptions_str.strip('[]')
+    assumptions_str = assumptions_str.strip()
+
+    gamma = gamma_cache.get_or_compute(assumptions_str, parse_gamma)
+
+    conclusion, rule, premises = line2conclusion(conclusion_rule)
+
+    return Sequent(gamma, conclusion, rule, premises)
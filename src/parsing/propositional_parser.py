@@ -1,14 +1,21 @@
 from src.core.errors import ParseError
 from src.core.sentence import Atomic,  Negation, TwoSided, Operator, True_Sym, False_Sym
 
-import re
+from src.parsing.cache import LRUCache
+from itertools import chain
+
+_OPERATORS = {r"\or": Operator.OR, r"\and": Operator.AND, r"\implies": Operator.IMPLIES}
+_UNBALANCED = "Must have the same number of opening and closing parentheses!"
+
+# parsed sentences are interned and immutable, so repeated inputs can share them
+parse_cache = LRUCache(maxsize=16384)
 
 def insert_spaces(expression):
     """
     Splits a logical expression into an array where each element is a symbol (removes whitespaces, and separates
     out parentheses).
     """
-    return [part for part in re.split(r'(\(|\)|\s+)', expression) if part and not re.match(r'^\s+$', part)]
+    return expression.replace("(", " ( ").replace(")", " ) ").split()
 
 def parse_atomic(atomic_expr):
     """Parse an atomic expression into a Sentence object.
@@ -46,31 +53,62 @@ def parse_single(s):
     else:
         return s
 
-def balanced_parentheses(expression):
-    """Check if parentheses are balanced in the expression.
-    
+def reduce_group(items):
+    """Reduce the contents of one pair of parentheses to a sentence.
+
     Args:
-        expression: List of tokens to check
-        
-    Returns:
-        True if parentheses are balanced
-        
-    Generated automatically by Claude.
-    """
-    count = 0
-    for char in expression:
-        if char == "(":
-            count += 1
-        elif char == ")":
-            count -= 1
+        items: Tokens and already reduced sentences between the parentheses
 
-        if count < 0:
-            return False
+    Returns:
+        Sentence object, or None for empty parentheses
 
-    return count == 0
+    Raises:
+        ParseError: If the contents are not an atomic, a negation or a binary connective
+    """
+    if len(items) == 1:
+        if isinstance(items[0], str) and items[0][0] == "\\" and items[0] not in ("\\true", "\\false"):
+            raise ParseError("Expressions must be accompanied with at least one operand!")
+
+        return parse_single(items[0])
+    elif len(items) == 2:
+        if items[0] != r"\not":
+            raise ParseError("Expression is ill-formed!")
+
+        return Negation(parse_single(items[1]))
+    elif len(items) == 3:
+        try:
+            oper = _OPERATORS[items[1]]
+        except KeyError:
+            raise ParseError(f"Operator {items[1]} not defined!")
+
+        left = parse_single(items[0])
+        right = parse_single(items[2])
+
+        return TwoSided(left, right, oper)
+    elif len(items) == 0:
+        return None
+    else:
+        raise ParseError(f"All inner expressions require explicit surrounding parentheses! {len(items) + 2}")
 
 def parse_string(s):
     """Parse a string into a logical sentence.
+
+    Results are memoized in parse_cache; inputs that fail to parse are not cached.
+
+    Args:
+        s: String representation of logical formula
+
+    Returns:
+        Sentence object representing the parsed formula
+    """
+    return parse_cache.get_or_compute(s, parse_uncached)
+
+def parse_uncached(s):
+    """Parse a string into a logical sentence, bypassing parse_cache.
+
+    The input is read as if it were wrapped in one more pair of parentheses, in a single pass
+    over its tokens: every closing parenthesis reduces its group as soon as it is seen.
+    Unbalanced parentheses are reported in preference to any other error.
     
     Args:
         s: String representation of logical formula
@@ -80,56 +118,35 @@ def parse_string(s):
         
     Generated automatically by Claude.
     """
-    s = "(" + s + ")"
-    s = insert_spaces(s)
-
-    if not balanced_parentheses(s):
-        raise ParseError(f"Must have the same number of opening and closing parentheses!")
-
-    stack = []
-    for char in s:
-        stack.append(char)
-
-        if char == ")":
-            ns = []
-            while True:
-                x = stack.pop()
-                ns.append(x)
-
-                if x == "(":
-                    break
-
-            # note that ns[0] = "(" and ns[-1] = ")"
-            ns = ns[::-1]
-
-            if len(ns) == 3:
-                if isinstance(ns[1], str) and ns[1][0] == "\\" and ns[1] not in ("\\true", "\\false"):
-                    raise ParseError("Expressions must be accompanied with at least one operand!")
-
-                stack.append(parse_single(ns[1]))
-            elif len(ns) == 4:
-                if ns[1] != r"\not":
-                    raise ParseError("Expression is ill-formed!")
-
-                inner = parse_single(ns[2])
-                stack.append(Negation(inner))
-            elif len(ns) == 5:
-                str_to_oper = {r"\or": Operator.OR, r"\and": Operator.AND, r"\implies": Operator.IMPLIES}
+    top = []
+    groups = [top, []]
+    error = None
+
+    for token in chain(insert_spaces(s), ")"):
+        if token == "(":
+            groups.append([])
+        elif token == ")":
+            if len(groups) == 1:
+                raise ParseError(_UNBALANCED)
+            items = groups.pop()
+            if error is None:
                 try:
-                    oper = str_to_oper[ns[2]]
-                except KeyError:
-                    raise ParseError(f"Operator {ns[2]} not defined!")
-
-                left = parse_single(ns[1])
-                right = parse_single(ns[3])
-
-                stack.append(TwoSided(left, right, oper))
-            elif len(ns) == 2:
-                pass
-            else:
-                raise ParseError(f"All inner expressions require explicit surrounding parentheses! {len(ns)}")
-
-    if stack:
-        return stack[0]
+                    sentence = reduce_group(items)
+                except ParseError as e:
+                    # keep scanning: an unbalanced input must still report the imbalance
+                    error = e
+                else:
+                    if sentence is not None:
+                        groups[-1].append(sentence)
+        elif error is None:
+            groups[-1].append(token)
+
+    if len(groups) != 1:
+        raise ParseError(_UNBALANCED)
+    if error is not None:
+        raise error
+
+    if top:
+        return top[0]
     else:
-        return None
\ No newline at end of file
+        return None
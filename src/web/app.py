@@ -1,16 +1,17 @@
-from flask import Flask, request, jsonify, render_template, abort
+from flask import Flask, Response, request, jsonify, render_template, abort, stream_with_context
 from flask_cors import CORS
-from src.parsing.propositional_parser import parse_string
-from src.core.proof import Proof, Sequent, InferenceRule
-from src.core.fitch_style import FitchSubProof
-from src.core.sentence import Gamma
-from src.core.errors import ParseError
+from src.check.proofs import iter_sequent_results, iter_fitch_results, summarize, STYLES
+from src.check.sessions import SessionStore
+from src.check.stream import FORMATS
 import traceback
 import sys
 
 app = Flask(__name__)
 CORS(app)
 
+# proofs being edited live, see /sessions
+sessions = SessionStore()
+
 @app.route('/')
 def index():
     """Serve the main index page.
@@ -19,82 +20,6 @@ def index():
     """
     return render_template('index.html')
 
-def line2conclusion(line):
-    """
-    Parse the following format: "conclusion :RULE". This will appear in both sequent-style and
-    fitch-style proofs.
-    """
-    if ':' not in line:
-        raise ParseError('Invalid format. Missing inference rule.' \
-                         'Expected format: [assumption_1, assumption_2, ...] |- conclusion :RULE')
-
-    conclusion_str, rule_str = line.rsplit(':', 1)
-    conclusion_str = conclusion_str.strip()
-    rule_str = rule_str.strip()
-
-    conclusion = parse_string(conclusion_str)
-
-    rule_map = {
-        'AX': InferenceRule.axiom,
-        'AI': InferenceRule.and_intro,
-        'AE': InferenceRule.and_elim,
-        'OI': InferenceRule.or_intro,
-        'OE': InferenceRule.or_elim,
-        'II': InferenceRule.implies_intro,
-        'IE': InferenceRule.implies_elim,
-        'NI': InferenceRule.not_intro,
-        'NE': InferenceRule.not_elim,
-        'TI': InferenceRule.true_intro,
-        'FE': InferenceRule.false_elim,
-        'EX': InferenceRule.expand,
-        'IP': InferenceRule.contra
-    }
-
-    if rule_str not in rule_map:
-        raise ParseError(f'{rule_str} is not one of the valid rules of inference!')
-
-    return conclusion, rule_map[rule_str]
-
-def line2sequent(line):
-    """Parse a line into a sequent object.
-    
-    Args:
-        line: String in format "[assumptions] |- conclusion :RULE"
-        
-    Returns:
-        Sequent object
-        
-    Generated automatically by Claude.
-    """
-    """
-    Parse the line format: "[assumption_1, assumption_2, ...] |- conclusion :RULE"
-    """
-    if '|-' not in line:
-        raise ParseError('Invalid format. Missing a turnstile |- separator.' \
-                         'Expected format: [assumption_1, assumption_2, ...] |- conclusion :RULE')
-
-    parts = line.split('|-')
-    if len(parts) != 2:
-        raise ParseError('Invalid format. Expected single turnstile |- separator.' \
-                         'Expected format: [assumption_1, assumption_2, ...] |- conclusion :RULE')
-
-    assumptions_str = parts[0].strip()
-    conclusion_rule = parts[1].strip()
-
-    assumptions_str = assumptions_str.strip('[]')
-    assumptions_str = assumptions_str.strip()
-
-    if assumptions_str == '':
-        gamma = Gamma()
-    else:
-        assumption_strs = [s.strip() for s in assumptions_str.split(',') if s.strip()]
-        assumptions = [parse_string(s) for s in assumption_strs]
-        gamma = Gamma(assumptions)
-
-    conclusion, rule = line2conclusion(conclusion_rule)
-
-    return Sequent(gamma, conclusion, rule)
-
 @app.route('/check-sequent-proof', methods=['POST'])
 def check_sequent_proof():
     """Check the validity of a sequent-style proof.
@@ -114,44 +39,7 @@ def check_sequent_proof():
             'traceback': traceback.format_exc()
         }), 500
 
-    proof = Proof()
-    results = []
-
-    for i, line in enumerate(proof_lines):
-        line = line.strip()
-        if not line:
-            continue
-
-        try:
-            sequent = line2sequent(line)
-        except ParseError as e:
-            results.append({
-                'line': i + 1,
-                'valid': False,
-                'error': e.args[0]
-            })
-            continue
-
-        if proof.add_sequent(sequent):
-            results.append({
-                'line': i + 1,
-                'valid': True,
-                'sequent': str(sequent)
-            })
-        else:
-            results.append({
-                'line': i + 1,
-                'valid': False,
-                'error': f'Invalid inference for rule {sequent.rule}'
-            })
-
-    all_valid = all(result['valid'] for result in results)
-
-    return jsonify({
-        'valid': all_valid,
-        'results': results,
-        'total_lines': len(results)
-    })
+    return jsonify(summarize(list(iter_sequent_results(proof_lines))))
 
 @app.route('/check-fitch-proof', methods=['POST'])
 def check_fitch_proof():
@@ -172,66 +60,115 @@ def check_fitch_proof():
             'traceback': traceback.format_exc()
         }), 500
 
-    fs = FitchSubProof()
-    results = []
-    space_count = 0
-
-    for i, line in enumerate(proof_lines):
-        if line == "--":
-            fs = fs.outer_proof
-            space_count -= 1
-            continue
-
-        line = line.rstrip()
-        if not line:
-            continue
-
-        ind = 0
-        while line[ind] == " ":
-            ind += 1
-
-        if ind < space_count:
-            fs = fs.outer_proof
-        elif ind > space_count:
-            fs = fs.add_subproof()
-
-        space_count = ind
-
-        try:
-            conclusion, rule = line2conclusion(line[ind:])
-        except ParseError as e:
-            results.append({
-                'line': i + 1,
-                'valid': False,
-                'error': e.args[0]
-            })
-            continue
-
-        if rule == InferenceRule.axiom:
-            val = fs.add_assumption(conclusion)
-        else:
-            val = fs.add_conclusion(conclusion, rule)
-
-        if val:
-            results.append({
-                'line': i + 1,
-                'valid': True,
-                'sequent': "hi"
-            })
-        else:
-            results.append({
-                'line': i + 1,
-                'valid': False,
-                'error': f'Invalid inference for rule {rule}'
-            })
-
-    all_valid = all(result['valid'] for result in results)
-
-    return jsonify({
-        'valid': all_valid,
-        'results': results,
-        'total_lines': len(results)
-    })
+    return jsonify(summarize(list(iter_fitch_results(proof_lines))))
+
+def _stream_results(iter_results):
+    # the body is read before streaming starts; each line's result is sent as soon as it is checked
+    try:
+        data = request.json
+        proof_lines = data.get('proof', '').strip().split('\n')
+    except Exception as e:
+        return jsonify({
+            'valid': False,
+            'error': f'Server error: {str(e)}',
+            'traceback': traceback.format_exc()
+        }), 500
+
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in FORMATS:
+        return jsonify({'error': f'Stream format {fmt} not supported! Expected one of {tuple(FORMATS)}'}), 400
+    mimetype, encode = FORMATS[fmt]
+    return Response(stream_with_context(encode(iter_results(proof_lines))), mimetype=mimetype,
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/check-sequent-proof/stream', methods=['POST'])
+def stream_sequent_proof():
+    """Check a sequent-style proof, streaming each line's result as it is checked.
+
+    The format query parameter picks "ndjson" (default) or "sse". The last record has 'done'
+    set and carries the overall validity.
+
+    Returns:
+        Streamed response with one record per line and a final summary
+    """
+    return _stream_results(iter_sequent_results)
+
+@app.route('/check-fitch-proof/stream', methods=['POST'])
+def stream_fitch_proof():
+    """Check a Fitch-style proof, streaming each line's result as it is checked.
+
+    The format query parameter picks "ndjson" (default) or "sse". The last record has 'done'
+    set and carries the overall validity.
+
+    Returns:
+        Streamed response with one record per line and a final summary
+    """
+    return _stream_results(iter_fitch_results)
+
+@app.route('/sessions', methods=['POST'])
+def create_session():
+    """Start a proof session that later requests edit line by line.
+
+    Expects {"proof": text, "style": "sequent" or "fitch"}.
+
+    Returns:
+        JSON response with the session id and the validation results, status 201
+    """
+    try:
+        data = request.json
+        proof = data.get('proof', '')
+        style = data.get('style', 'sequent')
+    except Exception as e:
+        return jsonify({
+            'valid': False,
+            'error': f'Server error: {str(e)}',
+            'traceback': traceback.format_exc()
+        }), 500
+
+    if style not in STYLES:
+        return jsonify({'error': f'Proof style {style} not supported! Expected one of {STYLES}'}), 400
+
+    session_id, result = sessions.create(proof, style)
+    return jsonify({'session': session_id, **result}), 201
+
+@app.route('/sessions/<session_id>', methods=['PATCH'])
+def patch_session(session_id):
+    """Edit the proof of a session.
+
+    Expects {"patches": [{"op": "insert" | "replace" | "delete", "line": k, "text": line}]},
+    applied in order. Line numbers in the response are those after the patches; the client
+    moves its own results the way the patches move lines and applies the response on top.
+
+    Returns:
+        JSON response with the changed results and the line numbers that no longer have one
+    """
+    try:
+        data = request.json
+        patches = data.get('patches', [])
+    except Exception as e:
+        return jsonify({
+            'valid': False,
+            'error': f'Server error: {str(e)}',
+            'traceback': traceback.format_exc()
+        }), 500
+
+    try:
+        return jsonify(sessions.patch(session_id, patches))
+    except KeyError as e:
+        return jsonify({'error': e.args[0]}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/sessions/<session_id>', methods=['DELETE'])
+def close_session(session_id):
+    """End a proof session.
+
+    Returns:
+        Empty response with status 204, or 404 if the session does not exist
+    """
+    if not sessions.close(session_id):
+        return jsonify({'error': f'Session {session_id} not found!'}), 404
+    return '', 204
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,18 @@
+import pytest
+
+# Proofs shared by the tests of the checking entry points.
+
+@pytest.fixture
+def sequent_proof():
+    return r"""[A \implies B, A] |- A \implies B :AX
+[A \implies B, A] |- A :AX
+[A \implies B, A] |- B :IE 1,2
+[A \implies B, A] |- C :IE"""
+
+@pytest.fixture
+def fitch_proof():
+    return r"""A \and B :AX
+A :AE
+ C :AX
+ A :EX
+C \implies A :II"""
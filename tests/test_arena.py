@@ -0,0 +1,42 @@
+import pickle
+
+import pytest
+from src.core.arena import SentenceArena, ATOM, NOT, AND
+from src.core.errors import VariableNotAssignedError
+from src.core.proof import Sequent, Proof, InferenceRule
+from src.core.sentence import Atomic, Negation, TwoSided, Operator, Gamma
+from src.parsing.propositional_parser import parse_string
+
+def test_arena_round_trip():
+    arena = SentenceArena()
+    s = parse_string(r"((A \and B) \or (\not (A \and B))) \implies (\true \and \false)")
+    root = arena.add(s)
+    assert arena.sentence(root) is s
+    # A, B, A and B, its negation, the disjunction, TRUE, FALSE, their conjunction, the root
+    assert len(arena) == 9
+    assert arena.add(parse_string(r"\not (A \and B)")) < root
+    assert arena.nbytes() == 9 * (1 + 4 + 4)
+
+    a, b = arena.atom("A"), arena.atom("B")
+    assert arena.ops[a] == ATOM and arena.names[arena.lefts[a]] == "A"
+    both = arena.node(AND, a, b)
+    assert arena.sentence(arena.node(NOT, both)) is Negation(TwoSided(Atomic("A"), Atomic("B"), Operator.AND))
+
+def test_arena_evaluate():
+    arena = SentenceArena()
+    s = parse_string(r"(A \and B) \or ((\not A) \implies C)")
+    root = arena.add(s)
+    for a in (False, True):
+        for c in (False, True):
+            assignment = {"A": a, "B": True, "C": c}
+            assert arena.evaluate(root, assignment) == s.evaluate(assignment)
+    with pytest.raises(VariableNotAssignedError):
+        arena.evaluate(root, {"A": True})
+
+def test_slotted_classes():
+    sequent = Sequent(Gamma(Atomic("A")), Atomic("A"), InferenceRule.axiom)
+    for obj in (Atomic("A"), Negation(Atomic("A")), parse_string(r"A \and B"), Gamma(), sequent, Proof()):
+        assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        sequent.extra = 1
+    assert pickle.loads(pickle.dumps(parse_string(r"A \and B"))) is parse_string(r"A \and B")
@@ -0,0 +1,86 @@
+import gc
+import itertools
+import random
+import weakref
+
+import pytest
+from src.core.bdd import BDD, TRUE, FALSE
+from src.core.sentence import Atomic, Negation, TwoSided, Operator
+from src.parsing.propositional_parser import parse_string
+
+def random_sentence(rng, atoms, depth):
+    if depth == 0 or rng.random() < 0.2:
+        return Atomic(rng.choice(atoms))
+    if rng.random() < 0.25:
+        return Negation(random_sentence(rng, atoms, depth - 1))
+    oper = rng.choice([Operator.AND, Operator.OR, Operator.IMPLIES])
+    return TwoSided(random_sentence(rng, atoms, depth - 1), random_sentence(rng, atoms, depth - 1), oper)
+
+def test_equivalence_and_tautology():
+    bdd = BDD()
+    assert bdd.equivalent(parse_string(r"A \implies B"), parse_string(r"(\not A) \or B"))
+    assert bdd.equivalent(parse_string(r"\not (A \and B)"), parse_string(r"(\not A) \or (\not B)"))
+    assert not bdd.equivalent(parse_string(r"A \implies B"), parse_string(r"B \implies A"))
+    assert bdd.is_tautology(parse_string(r"((A \implies B) \and (B \implies C)) \implies (A \implies C)"))
+    assert not bdd.is_tautology(parse_string("A"))
+    assert not bdd.is_satisfiable(parse_string(r"A \and (\not A)"))
+    assert bdd.build(parse_string(r"\true \or A")) == TRUE
+    assert bdd.build(parse_string(r"\false")) == FALSE
+
+def test_count_models():
+    bdd = BDD()
+    assert bdd.count_models(parse_string(r"A \or B")) == 3
+    assert bdd.count_models(parse_string(r"A \or B"), ["A", "B", "C"]) == 6
+    assert bdd.count_models(parse_string(r"A \and (\not A)")) == 0
+    assert bdd.count_models(parse_string(r"\true")) == 1
+    with pytest.raises(ValueError):
+        bdd.count_models(parse_string(r"A \or B"), ["A"])
+
+def test_matches_truth_tables():
+    rng = random.Random(17)
+    atoms = ["A", "B", "C", "D"]
+    bdd = BDD(order=["D", "B"], cache_size=64)
+    sentences = [random_sentence(rng, atoms, 4) for _ in range(200)]
+    for s in sentences:
+        expected = sum(s.evaluate(dict(zip(atoms, values)))
+                       for values in itertools.product([False, True], repeat=4))
+        assert bdd.count_models(s, atoms) == expected
+    assert bdd.order[:2] == ["D", "B"]
+
+    for a, b in zip(sentences, sentences[1:]):
+        same = all(a.evaluate(dict(zip(atoms, values))) == b.evaluate(dict(zip(atoms, values)))
+                   for values in itertools.product([False, True], repeat=4))
+        assert bdd.equivalent(a, b) == same
+
+def test_equivalence_classes():
+    bdd = BDD()
+    a, b, c = parse_string(r"A \and B"), parse_string(r"B \and A"), parse_string(r"A \or B")
+    assert bdd.equivalence_classes([a, c, b]) == [[a, b], [c]]
+
+def test_many_variables():
+    # negating a 2000-variable conjunction walks the whole diagram without hitting the
+    # recursion limit
+    n = 2000
+    bdd = BDD()
+    s = Atomic(f"P{n - 1}")
+    for i in reversed(range(n - 1)):
+        s = TwoSided(Atomic(f"P{i}"), s, Operator.AND)
+    assert bdd.count_models(s) == 1
+    assert len(bdd) == 2 * n + 1  # one node per variable plus the chain
+    assert bdd.count_models(Negation(s)) == 2 ** n - 1
+    assert len(bdd) == 3 * n + 1
+
+def test_memo_does_not_keep_sentences_alive():
+    def sentence():
+        q = [Atomic(f"Q{i}") for i in range(4)]
+        return TwoSided(TwoSided(q[0], q[1], Operator.AND), TwoSided(q[2], Negation(q[3]), Operator.OR), Operator.IMPLIES)
+
+    bdd = BDD()
+    built = sentence()
+    node = bdd.build(built)
+    ref = weakref.ref(built)
+    del built
+    gc.collect()
+    assert ref() is None
+    # the diagram itself is kept, so rebuilding finds the same node
+    assert bdd.build(sentence()) == node
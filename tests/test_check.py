@@ -0,0 +1,109 @@
+import io
+import json
+import pytest
+from src.core.errors import ParseError
+from src.core.proof import InferenceRule
+from src.parsing.propositional_parser import parse_string
+from src.parsing.proof_parser import line2conclusion, line2sequent
+from src.check.proofs import check_proof, iter_line_results, iter_file_results
+from src.check.batch import check_proofs, check_files
+from src.check.__main__ import main
+
+def test_line2conclusion():
+    assert line2conclusion(r"A \and B :AI") == (parse_string(r"A \and B"), InferenceRule.and_intro, None)
+    assert line2conclusion(r"B :IE 3, 7") == (parse_string("B"), InferenceRule.implies_elim, (3, 7))
+
+    with pytest.raises(ParseError):
+        line2conclusion(r"B :IE 3,x")
+    with pytest.raises(ParseError):
+        line2conclusion(r"B :XX")
+    with pytest.raises(ParseError):
+        line2sequent(r"[A] |- A :AX ²")
+
+def test_line2sequent():
+    sequent = line2sequent(r"[A, B] |- A :AX")
+    assert list(sequent.gamma) == [parse_string("A"), parse_string("B")]
+    assert sequent.conclusion == parse_string("A")
+    assert sequent.premises is None
+
+def test_check_proof(sequent_proof, fitch_proof):
+    result = check_proof(sequent_proof)
+    assert not result['valid']
+    assert result['total_lines'] == 4
+    assert [r['valid'] for r in result['results']] == [True, True, True, False]
+    assert result['results'][2]['sequent'] == "[(A IMPLIES B), A] proves B :IE 1,2"
+
+    result = check_proof(fitch_proof, style="fitch")
+    assert result['valid']
+    assert [r['line'] for r in result['results']] == [1, 2, 3, 4, 5]
+
+    with pytest.raises(ValueError):
+        check_proof(fitch_proof, style="natural")
+
+def test_check_proofs(sequent_proof):
+    proofs = [sequent_proof, "[A] |- A :AX", "invalid format"] * 5
+
+    serial = list(check_proofs(proofs, workers=1))
+    parallel = list(check_proofs(iter(proofs), workers=2, chunksize=2))
+
+    assert len(parallel) == len(proofs)
+    for s, p in zip(serial, parallel):
+        assert p.pop('time') >= 0
+        s.pop('time')
+        assert s == p
+    assert [r['valid'] for r in parallel[:3]] == [False, True, False]
+
+def test_check_proofs_reports_errors():
+    # closing a subproof at the top level cannot be checked
+    result, = check_proofs(["A :AX\n--\nA :AX"], workers=1, style="fitch")
+    assert not result['valid']
+    assert result['error'].startswith('Server error')
+
+def test_line2sequent_shares_gammas():
+    first = line2sequent(r"[A \or B, A \implies C] |- A \or B :AX")
+    second = line2sequent(r"[ A \or B, A \implies C ] |- A \implies C :AX")
+    assert first.gamma is second.gamma
+
+def test_iter_line_results(tmp_path, sequent_proof, fitch_proof):
+    lines = io.StringIO(sequent_proof + "\n")
+    assert list(iter_line_results(lines)) == check_proof(sequent_proof)['results']
+
+    # "--" lines and indentation survive reading from a file, including with CRLF endings
+    path = tmp_path / "fitch.txt"
+    text = fitch_proof.replace(" A :EX", " A :EX\n--")
+    path.write_bytes(text.replace("\n", "\r\n").encode())
+    expected = check_proof(text, "fitch")['results']
+    assert [r['line'] for r in expected] == [1, 2, 3, 4, 6]
+    assert list(iter_file_results(path, "fitch")) == expected
+    with open(path, "rb") as f:
+        assert list(iter_line_results(f, "fitch")) == expected
+
+    with pytest.raises(TypeError):
+        iter_line_results(sequent_proof)
+    with pytest.raises(ValueError):
+        iter_file_results(path, "tableau")
+
+def test_cli(tmp_path, capsys, sequent_proof, fitch_proof):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_text(sequent_proof)
+    (tmp_path / "sub" / "b.txt").write_text(fitch_proof)
+    (tmp_path / "sub" / "notes.md").write_text("not a proof")
+
+    assert main(["-j", "1", "--include", "*.txt", str(tmp_path)]) == 1
+    a, b = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert (a['style'], b['style']) == ("sequent", "fitch")
+    assert a['results'] == check_proof(sequent_proof)['results']
+    assert b['valid'] and b['total_lines'] == 5
+
+    # globs expand recursively, and --summary leaves the per-line results out
+    assert main(["-j", "1", "--summary", str(tmp_path / "**" / "b.txt")]) == 0
+    result, = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert 'results' not in result and result['total_lines'] == 5
+
+    serial = list(check_files([tmp_path / "a.txt"] * 3, workers=1))
+    parallel = list(check_files([tmp_path / "a.txt"] * 3, workers=2))
+    for result in serial + parallel:
+        del result['time']
+    assert parallel == serial
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "missing.txt")])
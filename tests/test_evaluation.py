@@ -0,0 +1,81 @@
+import itertools
+
+import pytest
+from src.core.errors import VariableNotAssignedError
+from src.core.sentence import Atomic, Negation, TwoSided, Operator
+from src.parsing.propositional_parser import parse_string
+
+FORMULAS = [
+    r"A",
+    r"\true",
+    r"\not \false",
+    r"(A \and B) \or ((\not A) \implies C)",
+    r"((A \implies B) \and (B \implies C)) \implies (A \implies C)",
+    r"(\not (A \or \false)) \and (C \or \true)",
+]
+
+def test_compiled_matches_evaluate():
+    for formula in FORMULAS:
+        s = parse_string(formula)
+        compiled = s.compile(["A", "B", "C"])
+        for values in itertools.product([False, True], repeat=3):
+            assignment = dict(zip("ABC", values))
+            assert compiled(*values) == s.evaluate(assignment)
+            assert compiled.evaluate(assignment) == s.evaluate(assignment)
+
+def test_compile_default_atoms():
+    compiled = parse_string(r"(Z \and \true) \or A").compile()
+    assert compiled.atoms == ("A", "Z")
+    assert compiled(False, True)
+    assert not compiled(False, False)
+
+def test_compile_errors():
+    with pytest.raises(VariableNotAssignedError):
+        parse_string(r"A \and B").compile(["A"])
+    with pytest.raises(VariableNotAssignedError):
+        parse_string(r"A \and B").compile().evaluate({"A": True})
+
+def test_compile_deep_sentence():
+    s = Atomic("A")
+    for i in range(5000):
+        s = Negation(s) if i % 2 else TwoSided(s, Atomic("B"), Operator.OR)
+    compiled = s.compile()
+    for a, b in itertools.product([False, True], repeat=2):
+        assert compiled(a, b) == s.evaluate({"A": a, "B": b})
+
+def test_truth_table_columns():
+    from src.core.vectorized import truth_table_columns, unpack
+
+    a, b = truth_table_columns(2)
+    assert unpack(a, 4) == [False, False, True, True]
+    assert unpack(b, 4) == [False, True, False, True]
+
+def test_evaluate_many_packed():
+    from src.core.vectorized import evaluate_many, truth_table_columns, unpack
+
+    for formula in FORMULAS:
+        s = parse_string(formula)
+        result = unpack(evaluate_many(s, "ABC", truth_table_columns(3), rows=8), 8)
+        expected = [s.evaluate(dict(zip("ABC", values))) for values in itertools.product([False, True], repeat=3)]
+        assert result == expected
+
+def test_evaluate_many_wide():
+    from src.core.vectorized import evaluate_many, truth_table_columns
+
+    k = 20
+    s = Atomic("X0")
+    for i in range(1, k):
+        s = TwoSided(s, Atomic(f"X{i}"), Operator.OR)
+    atoms = [f"X{i}" for i in range(k)]
+    result = evaluate_many(s, atoms, truth_table_columns(k), rows=1 << k)
+    # only the all-false row falsifies the disjunction
+    assert result == (1 << (1 << k)) - 2
+
+def test_evaluate_many_numpy():
+    np = pytest.importorskip("numpy")
+    from src.core.vectorized import evaluate_many
+
+    s = parse_string(FORMULAS[3])
+    table = np.array(list(itertools.product([False, True], repeat=3)))
+    result = evaluate_many(s, "ABC", table)
+    assert result.tolist() == [s.evaluate(dict(zip("ABC", row))) for row in table.tolist()]
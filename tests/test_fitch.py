@@ -224,4 +224,78 @@ def test_10():
 
     inner1 = fs.add_subproof()
     assert inner1.add_assumption(g2)
-    assert inner1.add_conclusion(g1, InferenceRule.expand)
\ No newline at end of file
+    assert inner1.add_conclusion(g1, InferenceRule.expand)
+
+def test_11():
+    g1 = parse_string(r"A \and B")
+    g2 = parse_string(r"A \implies C")
+
+    fs = FitchSubProof()
+    assert fs.add_assumption(g1)
+    assert fs.add_assumption(g2)
+
+    scope = fs
+    for i in range(300):
+        scope = scope.add_subproof()
+        assert scope.add_assumption(parse_string(f"P{i}"))
+
+    # outer assumptions are available at any depth
+    assert scope.add_conclusion(parse_string(r"A"), InferenceRule.and_elim)
+    assert scope.add_conclusion(parse_string(r"C"), InferenceRule.implies_elim)
+    assert scope.add_conclusion(parse_string(r"P0"), InferenceRule.axiom)
+
+    # every assumption is loaded once
+    assert len(fs.sequent_style().sequents) == 2 + 300 + 3
+
+    # loading an inner scope closes the assumptions of the outer ones
+    assert not fs.add_assumption(parse_string(r"D"))
+    with pytest.raises(ValueError):
+        scope.sequent_style()
+
+def test_12():
+    fs = FitchSubProof()
+    assert fs.add_assumption(parse_string(r"P \implies Q"), line=1)
+    assert fs.add_assumption(parse_string(r"Q \implies R"), line=2)
+
+    inner = fs.add_subproof()
+    assert inner.add_assumption(parse_string(r"P"), line=3)
+    assert inner.add_conclusion(parse_string(r"Q"), InferenceRule.implies_elim, premises=(1, 3), line=4)
+    assert not inner.add_conclusion(parse_string(r"R"), InferenceRule.implies_elim, premises=(2, 3), line=5)
+    assert inner.add_conclusion(parse_string(r"R"), InferenceRule.implies_elim, premises=(2, 4), line=6)
+
+    assert not fs.add_conclusion(parse_string(r"P \implies R"), InferenceRule.implies_intro, premises=(4,), line=7)
+    assert fs.add_conclusion(parse_string(r"P \implies R"), InferenceRule.implies_intro, premises=(6,), line=8)
+
+    # the scope supplies the assumptions, so the old extra-assumption arguments are gone
+    with pytest.raises(TypeError):
+        fs.add_conclusion(parse_string(r"P"), InferenceRule.axiom, (1,))
+    with pytest.raises(TypeError):
+        fs.add_conclusion(parse_string(r"P"), InferenceRule.axiom, additional_gamma=Gamma(parse_string(r"P")))
+
+def test_13():
+    # assumptions only count as derived in contexts opened by a subproof, so the rules that
+    # extend the context need a subproof assuming the extra sentence
+    fs = FitchSubProof()
+    assert fs.add_assumption(parse_string(r"B"))
+    assert not fs.add_conclusion(parse_string(r"C \implies B"), InferenceRule.implies_intro)
+    assert not fs.add_conclusion(parse_string(r"\not C"), InferenceRule.not_intro)
+
+    inner = fs.add_subproof()
+    assert inner.add_assumption(parse_string(r"C"))
+    assert inner.add_conclusion(parse_string(r"B"), InferenceRule.expand)
+    assert fs.add_conclusion(parse_string(r"C \implies B"), InferenceRule.implies_intro)
+
+    fs = FitchSubProof()
+    assert fs.add_assumption(parse_string(r"\false"))
+    assert not fs.add_conclusion(parse_string(r"C"), InferenceRule.contra)
+    assert fs.add_conclusion(parse_string(r"C"), InferenceRule.false_elim)
+
+def test_14():
+    # a subproof of only assumptions opens its scope when it closes, so it can be cited
+    for cited in (None, (2,)):
+        fs = FitchSubProof()
+        assert fs.add_assumption(parse_string(r"A"), line=1)
+        inner = fs.add_subproof()
+        assert inner.add_assumption(parse_string(r"B"), line=2)
+        inner.close()
+        assert fs.add_conclusion(parse_string(r"B \implies B"), InferenceRule.implies_intro, premises=cited, line=3)
@@ -0,0 +1,73 @@
+import pickle
+
+from src.check.proofs import iter_results, lower_proof, iter_ir_results
+from src.core.ir import ProofIR, check_ir, OPCODES, ACCEPTED, REJECTED, PARSE_ERROR
+from src.core.proof import InferenceRule
+
+SEQUENT_LINES = [
+    r"[A \implies B, A] |- A \implies B :AX",
+    r"[A \implies B, A] |- A :AX",
+    r"[A \implies B, A] |- B :IE 1,2",
+    r"[A, A \implies B] |- B :IE",
+    r"[A \implies B] |- A \implies B :II",
+    r"[\not A, A] |- \false :NE",
+    r"[A] |- \not (\not A) :NI",
+    r"[\not (\not A)] |- A :IP",
+    "[A] |- B :XX",
+    r"[A \or B, A \implies C, B \implies C, A] |- C :IE 99",
+]
+
+FITCH_LINES = [
+    r"A \or B :AX",
+    r" A :AX",
+    r" B \or A :OI",
+    r" B :AX",
+    "--",
+    " B :AX",
+    r" B \or A :OI",
+    r"B \or A :OE",
+    r"A \and B :AI",
+    r"C :AX",
+    r"\true :TI",
+]
+
+def test_lowering_matches_checker():
+    for lines, style in [(SEQUENT_LINES, "sequent"), (FITCH_LINES, "fitch")]:
+        ir = lower_proof(lines, style)
+        assert list(iter_ir_results(ir)) == list(iter_results(lines, style))
+
+def test_implicit_axioms_need_a_scope():
+    for lines in (["B :AX", r"C \implies B :II"], [r"\false :AX", "C :IP"]):
+        ir = lower_proof(lines, "fitch")
+        assert [r['valid'] for r in iter_ir_results(ir)] == [True, False]
+        assert list(iter_ir_results(ir)) == list(iter_results(lines, "fitch"))
+
+def test_huge_citations():
+    lines = ["[A] |- A :AX", "[A] |- A :EX 99999999999", "[A] |- A :EX 99999999999999999999999", "[A] |- A :EX 1"]
+    ir = lower_proof(lines, "sequent")
+    assert list(iter_ir_results(ir)) == list(iter_results(lines, "sequent"))
+    assert [r['valid'] for r in iter_ir_results(ir)] == [True, False, False, True]
+
+def test_ir_layout():
+    ir = lower_proof(SEQUENT_LINES, "sequent")
+    assert len(ir) == 9
+    assert list(ir.report_lines) == list(range(1, 11))
+    assert ir.report_rows[8] == PARSE_ERROR and "XX" in ir.errors[9]
+    # the first three rows share one context
+    assert ir.context_ids[0] == ir.context_ids[1] == ir.context_ids[2]
+    assert ir.rules[2] == OPCODES[InferenceRule.implies_elim]
+    assert ir.row_premises(2) == (1, 2) and ir.row_premises(3) is None
+    assert check_ir(ir)[:4] == [True, True, True, True]
+
+    fitch = lower_proof(FITCH_LINES, "fitch")
+    rows = list(fitch.report_rows)
+    assert rows[0] == rows[1] == ACCEPTED
+    assert rows[3] == REJECTED  # an assumption after the scope's first conclusion
+
+def test_ir_serialization():
+    ir = lower_proof(SEQUENT_LINES, "sequent")
+    copy = ProofIR.from_bytes(ir.to_bytes())
+    assert copy.digest() == ir.digest()
+    assert list(iter_ir_results(copy)) == list(iter_ir_results(ir))
+    assert pickle.loads(pickle.dumps(ir)).digest() == ir.digest()
+    assert lower_proof(SEQUENT_LINES[:-1], "sequent").digest() != ir.digest()
@@ -1,6 +1,8 @@
 import pytest
 from src.core.proof import Proof, Sequent, InferenceRule
-from src.parsing.propositional_parser import parse_string
+from src.core.errors import ParseError
+from src.parsing.cache import LRUCache
+from src.parsing.propositional_parser import parse_string, parse_cache
 from src.core.sentence import Atomic, TwoSided, Operator, Negation, True_Sym, False_Sym
 
 def test_1():
@@ -34,4 +36,33 @@ def test_10():
     assert not parse_string(r"")
 
 def test_11():
-    assert not parse_string(r"()")
\ No newline at end of file
+    assert not parse_string(r"()")
+
+def test_12():
+    # an imbalance is reported even when an earlier group is ill-formed
+    with pytest.raises(ParseError, match="same number of opening and closing"):
+        parse_string(r"(\and) (")
+    with pytest.raises(ParseError, match="at least one operand"):
+        parse_string(r"(\and) ()")
+
+def test_13():
+    parse_cache.clear()
+    s = parse_string(r"A \or B")
+    assert parse_string(r"A \or B") is s
+    assert parse_cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'maxsize': parse_cache.maxsize}
+
+    cache = LRUCache(maxsize=2)
+    assert cache.get_or_compute("A", parse_string) is Atomic("A")
+    cache.get_or_compute("B", parse_string)
+    cache.get_or_compute("A", parse_string)
+    cache.get_or_compute("C", parse_string)
+    # B was the least recently used entry
+    assert cache.stats() == {'hits': 1, 'misses': 3, 'evictions': 1, 'size': 2, 'maxsize': 2}
+    cache.get_or_compute("A", parse_string)
+    assert cache.hits == 2
+
+    with pytest.raises(Exception):
+        cache.get_or_compute("(A", parse_string)
+    assert len(cache) == 2
+    cache.resize(1)
+    assert cache.evictions == 2 and len(cache) == 1
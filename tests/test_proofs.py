@@ -1,3 +1,4 @@
+import tracemalloc
 import pytest
 from src.core.proof import Proof, Sequent, InferenceRule, Gamma
 from src.core.sentence import Negation
@@ -231,3 +232,244 @@ def test_10():
     pr = Proof()
     assert pr.add_sequent(Sequent(gamma, g1, InferenceRule.axiom))
     assert pr.add_sequent(Sequent(gamma_one, g1, InferenceRule.expand))
+
+def test_11():
+    g1 = parse_string(r"A")
+    g2 = parse_string(r"B")
+
+    pr = Proof()
+    assert pr.add_sequent(Sequent(Gamma(g1, g2), g1, InferenceRule.axiom))
+    assert pr.add_sequent(Sequent(Gamma(g2, g1), g1, InferenceRule.axiom))
+
+    # contexts are compared as sets, regardless of order, repetition or container type
+    assert pr.proof_exists(Gamma(g2, g1), g1)
+    assert pr.proof_exists([g1, g2, g1], g1)
+    assert not pr.proof_exists(Gamma(g1), g1)
+    assert not pr.proof_exists(Gamma(g1, g2), g2)
+
+    # re-derivations are kept for output
+    assert len(pr.sequents) == 2
+
+def test_12():
+    g1 = parse_string(r"A \and B")
+    g2 = parse_string(r"A \implies C")
+    g3 = parse_string(r"\not C")
+
+    a = parse_string(r"A")
+    c = parse_string(r"C")
+    d = parse_string(r"\false")
+
+    gamma = Gamma(g1, g2, g3)
+    other = Gamma(g1)
+
+    pr = Proof()
+    assert pr.add_sequent(Sequent(other, g1, InferenceRule.axiom))
+    # eliminations only see facts derived under the same context
+    assert not pr.add_sequent(Sequent(gamma, a, InferenceRule.and_elim))
+    assert not pr.add_sequent(Sequent(gamma, d, InferenceRule.not_elim))
+
+    assert pr.add_sequent(Sequent(gamma, g1, InferenceRule.axiom))
+    assert pr.add_sequent(Sequent(gamma, g2, InferenceRule.axiom))
+    assert pr.add_sequent(Sequent(gamma, g3, InferenceRule.axiom))
+    assert not pr.add_sequent(Sequent(gamma, c, InferenceRule.implies_elim))
+    assert pr.add_sequent(Sequent(gamma, a, InferenceRule.and_elim))
+    assert not pr.add_sequent(Sequent(gamma, d, InferenceRule.not_elim))
+    assert pr.add_sequent(Sequent(gamma, c, InferenceRule.implies_elim))
+    assert pr.add_sequent(Sequent(gamma, d, InferenceRule.not_elim))
+
+def test_13():
+    a = parse_string(r"A")
+    b = parse_string(r"B")
+    c = parse_string(r"C")
+
+    pr = Proof()
+    ab = pr.context(Gamma(a, b))
+    assert ab == pr.context([b, a, b])
+    assert pr.context(Gamma(a)) & ~ab == 0
+    assert pr.context(Gamma(a) + [b]) == pr.context(Gamma(a)) | pr.context([b])
+    assert pr.context(Gamma(c)) & ~ab != 0
+    assert pr.context(Gamma()) == 0
+
+def test_14():
+    a = parse_string(r"A")
+    b = parse_string(r"B")
+    c = parse_string(r"C")
+
+    pr = Proof()
+    assert pr.add_sequent(Sequent(Gamma(a, b), a, InferenceRule.axiom))
+    assert pr.add_sequent(Sequent(Gamma(b), b, InferenceRule.axiom))
+
+    assert pr.add_sequent(Sequent(Gamma(a, b, c), a, InferenceRule.expand))
+    assert pr.add_sequent(Sequent(Gamma(b, c), b, InferenceRule.expand))
+    # a larger context cannot be weakened into a smaller one
+    assert not pr.add_sequent(Sequent(Gamma(a, c), a, InferenceRule.expand))
+    assert not pr.add_sequent(Sequent(Gamma(a, b, c), c, InferenceRule.expand))
+
+def test_15():
+    g1 = parse_string(r"A \implies B")
+    g2 = parse_string(r"A")
+    b = parse_string(r"B")
+
+    gamma = Gamma(g1, g2)
+
+    pr = Proof()
+    assert pr.add_sequent(Sequent(gamma, g1, InferenceRule.axiom))
+    assert pr.add_sequent(Sequent(gamma, g2, InferenceRule.axiom))
+    assert pr.add_sequent(Sequent(gamma, b, InferenceRule.implies_elim, (1, 2)))
+    assert str(pr.sequents[-1]) == "[(A IMPLIES B), A] proves B :IE 1,2"
+
+    # only the cited lines are used, even if other lines would justify the rule
+    assert not pr.add_sequent(Sequent(gamma, b, InferenceRule.implies_elim, (1,)))
+    assert not pr.add_sequent(Sequent(gamma, b, InferenceRule.implies_elim, (1, 9)))
+    assert not pr.add_sequent(Sequent(gamma, b, InferenceRule.implies_elim, (2, 3)))
+    # rejected lines cannot be cited
+    assert not pr.add_sequent(Sequent(gamma, b, InferenceRule.expand, (4,)))
+    assert pr.add_sequent(Sequent(gamma, b, InferenceRule.expand, (3,)))
+    assert pr.add_sequent(Sequent(gamma, b, InferenceRule.implies_elim))
+
+def test_16():
+    a = parse_string(r"A")
+    b = parse_string(r"B")
+    ab = parse_string(r"A \implies B")
+
+    pr = Proof()
+    assert pr.add_sequent(Sequent(Gamma(b), b, InferenceRule.axiom), line=10)
+    assert pr.add_sequent(Sequent(Gamma(b, a), b, InferenceRule.expand, (10,)), line=11)
+    assert pr.add_sequent(Sequent(Gamma(b), ab, InferenceRule.implies_intro, (11,)), line=12)
+    assert not pr.add_sequent(Sequent(Gamma(b), ab, InferenceRule.implies_intro, (10,)), line=13)
+
+def test_17():
+    a = parse_string(r"A")
+    b = parse_string(r"B")
+    ab = parse_string(r"A \implies B")
+    gamma = Gamma(ab, a)
+
+    pr = Proof()
+    assert pr.add_sequent(Sequent(gamma, ab, InferenceRule.axiom))
+    assert pr.add_sequent(Sequent(gamma, a, InferenceRule.axiom))
+    assert pr.add_sequent(Sequent(gamma, b, InferenceRule.implies_elim))
+    assert pr.add_sequent(Sequent(Gamma(ab), ab, InferenceRule.implies_intro))
+    assert pr.add_sequent(Sequent(gamma, b, InferenceRule.expand, (3,)))
+
+    # breaking line 2 takes down everything that relied on it, directly or through citations
+    assert pr.replace_line(2, Sequent(gamma, b, InferenceRule.axiom)) == {2: False, 3: False, 4: False, 5: False}
+    assert len(pr.sequents) == 1
+    # fixing it brings them back
+    assert pr.replace_line(2, Sequent(gamma, a, InferenceRule.axiom)) == {2: True, 3: True, 4: True, 5: True}
+    assert [str(s) for s in pr.sequents][-1] == "[(A IMPLIES B), A] proves B :EX 3"
+
+    # line 3 is also derived by a new line 6, but only line 5 cites line 3 itself
+    assert pr.add_sequent(Sequent(gamma, b, InferenceRule.implies_elim), line=6)
+    assert pr.delete_line(3) == {4: False, 5: False}
+    assert pr.replace_line(3, Sequent(gamma, b, InferenceRule.implies_elim)) == {3: True, 4: True, 5: True}
+    with pytest.raises(KeyError):
+        pr.delete_line(9)
+
+def test_18():
+    # editing near the end of a long proof only re-checks the lines that depend on the edit
+    pr = Proof()
+    for j in range(1, 1001):
+        p = parse_string(f"P{j}")
+        assert pr.add_sequent(Sequent(Gamma(p), p, InferenceRule.axiom), line=2 * j - 1)
+        assert pr.add_sequent(Sequent(Gamma(p), parse_string(rf"P{j} \or Q"), InferenceRule.or_intro), line=2 * j)
+
+    p = parse_string("P950")
+    assert pr.replace_line(1899, Sequent(Gamma(p), parse_string("Q"), InferenceRule.axiom)) == {1899: False, 1900: False}
+    assert pr.replace_line(1899, Sequent(Gamma(p), p, InferenceRule.axiom)) == {1899: True, 1900: True}
+    assert len(pr.sequents) == 2000
+
+    # proofs whose lines were not added in order cannot be edited
+    unordered = Proof()
+    unordered.add_sequent(Sequent(Gamma(p), p, InferenceRule.axiom), line=2)
+    unordered.add_sequent(Sequent(Gamma(p), p, InferenceRule.axiom), line=1)
+    with pytest.raises(ValueError):
+        unordered.delete_line(1)
+
+def test_19():
+    a = parse_string(r"A")
+    b = parse_string(r"B")
+    ab = parse_string(r"A \implies B")
+    gamma = Gamma(ab, a)
+
+    pr = Proof()
+    assert pr.add_sequent(Sequent(gamma, ab, InferenceRule.axiom))
+    assert pr.add_sequent(Sequent(gamma, a, InferenceRule.axiom))
+    assert pr.add_sequent(Sequent(gamma, b, InferenceRule.implies_elim, (1, 2)))
+
+    # inserting moves the later lines down, so line 4 now cites the new, rejected line 1
+    assert pr.insert_line(1, Sequent(gamma, b, InferenceRule.axiom)) == {1: False, 4: False}
+    assert len(pr.sequents) == 2
+    # removing it moves them back, and the citation holds again
+    assert pr.remove_line(1) == {3: True}
+    assert [str(s) for s in pr.sequents][-1] == "[(A IMPLIES B), A] proves B :IE 1,2"
+
+    # an empty line only moves the citing line, which now cites lines 1 and 2 of the new numbering
+    assert pr.insert_line(2) == {4: False}
+    assert pr.remove_line(2) == {3: True}
+    # removing a cited line moves its citer into its place, where it cites itself
+    assert pr.remove_line(2) == {2: False}
+    assert len(pr.sequents) == 1
+
+def test_20():
+    a = parse_string(r"A")
+    b = parse_string(r"B")
+
+    # checking rules against sentences in no gamma leaves the assumption table alone
+    for implicit_axioms in (False, True):
+        pr = Proof(implicit_axioms=implicit_axioms)
+        assert pr.add_sequent(Sequent(Gamma(a), a, InferenceRule.axiom))
+        assert not pr.add_sequent(Sequent(Gamma(a), b, InferenceRule.axiom))
+        assert not pr.add_sequent(Sequent(Gamma(a), parse_string(r"B \implies A"), InferenceRule.implies_intro))
+        assert not pr.add_sequent(Sequent(Gamma(a), parse_string(r"\not B"), InferenceRule.not_intro))
+        assert not pr.add_sequent(Sequent(Gamma(a), b, InferenceRule.contra))
+        assert not pr.add_sequent(Sequent(Gamma(a), b, InferenceRule.expand))
+        assert pr.context(()) == 0 and len(pr._assumption_ids) == 1
+
+def test_21():
+    a = parse_string(r"A")
+    b = parse_string(r"B")
+    gamma = Gamma(a, b)
+
+    pr = Proof()
+    assert pr.add_sequent(Sequent(gamma, a, InferenceRule.axiom))
+    assert pr.add_sequent(Sequent(gamma, b, InferenceRule.axiom))
+    assert pr.add_sequent(Sequent(gamma, parse_string(r"A \and B"), InferenceRule.and_intro, (1, 2)))
+
+    # inserting many lines at one place uses up the room between two lines' keys, and the
+    # moved citing line is still found and re-checked by its current number
+    for i in range(40):
+        assert pr.insert_line(2, Sequent(gamma, b, InferenceRule.axiom)) == {2: True, 4 + i: True}
+    assert len(pr.sequents) == 43
+    assert pr.remove_line(1) == {42: False}
+    assert [str(s) for s in pr.sequents] == ["[A, B] proves B :AX"] * 41
+
+def test_22():
+    a = parse_string(r"A")
+    gamma = Gamma(a)
+    axiom = Sequent(gamma, a, InferenceRule.axiom)
+    rejected = Sequent(gamma, parse_string(r"B"), InferenceRule.axiom)
+    cited = Sequent(gamma, parse_string(r"A \and A"), InferenceRule.and_intro, (1, 1))
+
+    def retained(lines, sequent):
+        # memory a proof without edit tracking holds after checking lines repeating one sequent
+        tracemalloc.start()
+        pr = Proof(track_edits=False)
+        assert pr.add_sequent(axiom)
+        for _ in range(lines):
+            pr.add_sequent(sequent)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return size, pr
+
+    for sequent in (axiom, rejected, cited):
+        small, _ = retained(2000, sequent)
+        large, pr = retained(20000, sequent)
+        # one 8-byte slot per accepted line at most, where an editable proof keeps hundreds of bytes
+        assert large - small < 16 * 18000
+        assert len(pr.sequents) == (1 if sequent is not cited else 2)
+
+    pr = Proof(track_edits=False)
+    assert pr.add_sequent(axiom) and pr.add_sequent(axiom)
+    assert pr.add_sequent(Sequent(gamma, parse_string(r"A \and A"), InferenceRule.and_intro, (2, 2)))
+    with pytest.raises(ValueError):
+        pr.replace_line(1, axiom)
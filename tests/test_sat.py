@@ -0,0 +1,82 @@
+import itertools
+import random
+import time
+
+from src.core.sat import Solver, entails, satisfying_assignment
+from src.core.sentence import Atomic, Negation, TwoSided, Operator, Gamma, True_Sym, False_Sym
+from src.parsing.propositional_parser import parse_string
+
+def random_sentence(rng, atoms, depth):
+    if depth == 0 or rng.random() < 0.2:
+        return Atomic(rng.choice(atoms))
+    if rng.random() < 0.25:
+        return Negation(random_sentence(rng, atoms, depth - 1))
+    oper = rng.choice([Operator.AND, Operator.OR, Operator.IMPLIES])
+    return TwoSided(random_sentence(rng, atoms, depth - 1), random_sentence(rng, atoms, depth - 1), oper)
+
+def test_entails_simple():
+    gamma = Gamma([parse_string(r"A \implies B"), parse_string("A")])
+    assert entails(gamma, parse_string("B"))
+    assert entails([], parse_string(r"A \or (\not A)"))
+    assert entails([parse_string(r"\false")], parse_string("Z"))
+
+    result = entails(gamma, parse_string("C"))
+    assert not result
+    assert result.counter_model == {"A": True, "B": True, "C": False}
+
+def test_counter_model_is_valid():
+    gamma = [parse_string(r"A \or B"), parse_string(r"(\not C) \implies A")]
+    conclusion = parse_string(r"A \and C")
+    result = entails(gamma, conclusion)
+    assert not result
+    model = result.counter_model
+    assert all(s.evaluate(model) for s in gamma)
+    assert not conclusion.evaluate(model)
+
+def test_constants():
+    assert entails([], True_Sym())
+    assert not entails([], False_Sym())
+    assert satisfying_assignment([False_Sym()]) is None
+    assert satisfying_assignment([True_Sym()]) == {}
+
+def test_matches_truth_tables():
+    rng = random.Random(16)
+    atoms = ["A", "B", "C", "D"]
+    for _ in range(300):
+        gamma = [random_sentence(rng, atoms, 3) for _ in range(rng.randint(0, 3))]
+        conclusion = random_sentence(rng, atoms, 4)
+        holds = True
+        for values in itertools.product([False, True], repeat=len(atoms)):
+            assignment = dict(zip(atoms, values))
+            if all(s.evaluate(assignment) for s in gamma) and not conclusion.evaluate(assignment):
+                holds = False
+                break
+        result = entails(gamma, conclusion)
+        assert bool(result) == holds
+        if not holds:
+            model = dict.fromkeys(atoms, False)
+            model.update(result.counter_model)
+            assert all(s.evaluate(model) for s in gamma)
+            assert not conclusion.evaluate(model)
+
+def test_solver_pigeonhole():
+    # 6 pigeons do not fit in 5 holes, which needs real conflict analysis to refute
+    solver = Solver()
+    var = [[solver.new_var() for _ in range(5)] for _ in range(6)]
+    for pigeon in var:
+        solver.add_clause([2 * v for v in pigeon])
+    for hole in range(5):
+        for a, b in itertools.combinations(range(6), 2):
+            solver.add_clause([2 * var[a][hole] + 1, 2 * var[b][hole] + 1])
+    assert not solver.solve()
+
+def test_many_atoms():
+    # a chain of 300 implications is far beyond truth tables
+    n = 300
+    gamma = Gamma([TwoSided(Atomic(f"P{i}"), Atomic(f"P{i + 1}"), Operator.IMPLIES) for i in range(n)])
+    start = time.perf_counter()
+    assert entails(gamma + [Atomic("P0")], Atomic(f"P{n}"))
+    result = entails(gamma, Atomic(f"P{n}"))
+    assert not result
+    assert not result.counter_model[f"P{n}"]
+    assert time.perf_counter() - start < 2
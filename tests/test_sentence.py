@@ -0,0 +1,168 @@
+import copy
+import gc
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+from src.core.sentence import Atomic, TwoSided, Operator, Negation, True_Sym, False_Sym, Gamma
+from src.parsing.propositional_parser import parse_string
+from src.core.errors import VariableNotAssignedError
+
+def test_1():
+    # structurally equal sentences are identical
+    a = TwoSided(Negation(Atomic("A")), Atomic("B"), Operator.AND)
+    b = TwoSided(Negation(Atomic("A")), Atomic("B"), Operator.AND)
+    assert a is b
+    assert parse_string(r"(\not A) \and B") is a
+
+def test_2():
+    # distinct sentences are not equal
+    assert Atomic("A") != Atomic("B")
+    assert TwoSided(Atomic("A"), Atomic("B"), Operator.AND) != TwoSided(Atomic("A"), Atomic("B"), Operator.OR)
+    assert Atomic("TRUE") != True_Sym()
+    assert True_Sym() is True_Sym()
+    assert False_Sym() is not True_Sym()
+
+def test_3():
+    # sentences are hashable
+    s = {parse_string(r"A \implies B"), parse_string(r"(A \implies B)"), Atomic("A")}
+    assert len(s) == 2
+
+    d = {parse_string(r"A \or B"): 1}
+    assert d[TwoSided(Atomic("A"), Atomic("B"), Operator.OR)] == 1
+
+def test_4():
+    # sentences are immutable
+    a = Atomic("A")
+    with pytest.raises(AttributeError):
+        a.name = "B"
+    with pytest.raises(AttributeError):
+        Negation(a).inner = a
+
+def test_5():
+    # copy and pickle preserve identity
+    s = parse_string(r"(\not (A \or \false)) \implies \true")
+    assert copy.copy(s) is s
+    assert copy.deepcopy(s) is s
+    assert pickle.loads(pickle.dumps(s)) is s
+    assert pickle.loads(pickle.dumps(True_Sym())) is True_Sym()
+
+def test_6():
+    # unique table does not keep sentences alive
+    from src.core.sentence import _unique_table
+
+    s = Negation(Atomic("only_used_here"))
+    key = (Negation, s.inner)
+    assert key in _unique_table
+    del s, key
+    gc.collect()
+    assert (Atomic, "only_used_here") not in _unique_table
+
+def test_7():
+    # gamma compares as a set
+    a, b, c = Atomic("A"), Atomic("B"), Atomic("C")
+
+    assert Gamma(a, b) == Gamma(b, a)
+    assert Gamma(a, b, a) == Gamma(a, b)
+    assert Gamma(a, b) != Gamma(a, c)
+    assert Gamma(a).is_subset_of(Gamma(b, a))
+    assert Gamma(a).is_subset_of([a, c])
+    assert not Gamma(a, c).is_subset_of(Gamma(a, b))
+
+def test_8():
+    # gamma extension shares structure
+    a, b, c = Atomic("A"), Atomic("B"), Atomic("C")
+
+    base = Gamma(a, b)
+    frozen = base.frozen()
+    assert base.frozen() is frozen
+
+    extended = base + [c]
+    assert extended._parent is base
+    assert list(base) == [a, b]
+    assert list(extended) == [a, b, c]
+    assert extended[2] is c and extended[-1] is c
+    assert len(extended) == 3 and c in extended and c not in base
+    assert extended.frozen() == frozenset({a, b, c})
+
+    grown = base
+    grown += [a]
+    assert grown is not base and grown == base
+    assert hash(grown) == hash(base)
+    assert str(grown + Gamma(c)) == "['A', 'B', 'A', 'C']"
+
+    with pytest.raises(TypeError):
+        base[0] = c
+
+def test_9():
+    # postorder lists shared nodes once
+    a, b = Atomic("A"), Atomic("B")
+    ab = TwoSided(a, b, Operator.AND)
+    s = TwoSided(ab, Negation(ab), Operator.OR)
+
+    order = s.postorder()
+    assert order == [a, b, ab, Negation(ab), s]
+    assert a.postorder() == [a]
+
+def test_10():
+    # deep sentences do not recurse
+    depth = 50000
+    s = Atomic("A")
+    for i in range(depth):
+        s = Negation(s) if i % 2 else TwoSided(s, Atomic(f"B{i % 7}"), Operator.IMPLIES)
+
+    assignment = {"A": True, **{f"B{i}": False for i in range(7)}}
+    assert s.evaluate(assignment) in (True, False)
+    assert s.get_atomics() == {"A"} | {f"B{i}" for i in range(7)}
+    assert len(s.postorder()) == depth + 8
+    text = str(s)
+    assert text.startswith("(NOT ((NOT") and text.count("(") == depth
+
+def test_11():
+    # deep sentences pickle without recursing
+    s = Atomic("A")
+    for i in range(20000):
+        s = Negation(s) if i % 2 else TwoSided(s, Atomic(f"B{i % 7}"), Operator.OR)
+
+    data = pickle.dumps(s)
+    assert pickle.loads(data) is s
+    assert copy.deepcopy(s) is s
+    assert len(data) < 20 * s.size
+
+def test_12():
+    # evaluate short circuits
+    s = parse_string(r"(A \and B) \or ((\not A) \implies C)")
+    # B is not needed once A is false, and C is not needed once A and B hold
+    assert s.evaluate({"A": True, "B": True})
+    assert not s.evaluate({"A": False, "C": False})
+    with pytest.raises(VariableNotAssignedError):
+        s.evaluate({"A": False})
+
+def test_13():
+    # cached metadata
+    s = parse_string(r"(A \and B) \or ((\not A) \implies \true)")
+    assert s.size == 8
+    assert s.depth == 3
+    assert s.atoms == frozenset({"A", "B", "TRUE"})
+    assert s.atoms is s.get_atomics()
+    assert Atomic("A").depth == 0 and Atomic("A").size == 1
+
+    shared = TwoSided(s, s, Operator.AND)
+    assert shared.size == 17
+    assert shared.atoms == s.atoms
+
+def test_14():
+    # structural hash is stable
+    s = parse_string(r"(A \and B) \implies (\not C)")
+    assert s.structural_hash == pickle.loads(pickle.dumps(s)).structural_hash
+    assert s.structural_hash != parse_string(r"(A \or B) \implies (\not C)").structural_hash
+    assert True_Sym().structural_hash != Atomic("TRUE").structural_hash
+
+    # the hash does not depend on the process's string hash seed
+    code = ("from src.parsing.propositional_parser import parse_string; "
+            r"print(parse_string(r'(A \and B) \implies (\not C)').structural_hash)")
+    env = dict(os.environ, PYTHONHASHSEED="123")
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert int(out.stdout) == s.structural_hash
@@ -0,0 +1,100 @@
+import pytest
+from src.check.proofs import check_proof
+from src.check.sessions import SessionStore, SequentSession, FitchSession
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_sequent_session_patches(sequent_proof):
+    session = SequentSession(sequent_proof)
+    assert session.results() == check_proof(sequent_proof)['results']
+
+    # breaking line 2 is reported along with the line citing it, and nothing else
+    out = session.apply([{'op': 'replace', 'line': 2, 'text': r"[A \implies B, A] |- B :AX"}])
+    assert [r['line'] for r in out['changed']] == [2, 3]
+    assert out['removed'] == [] and out['total_lines'] == 4 and not out['valid']
+
+    # inserting a blank line moves the citing line to 4, where it cites lines 1 and 2
+    out = session.apply([
+        {'op': 'replace', 'line': 2, 'text': r"[A \implies B, A] |- A :AX"},
+        {'op': 'insert', 'line': 3, 'text': ""},
+    ])
+    assert out['changed'] == [{'line': 2, 'valid': True, 'sequent': r"[(A IMPLIES B), A] proves A :AX"},
+                              {'line': 4, 'valid': True, 'sequent': r"[(A IMPLIES B), A] proves B :IE 1,2"}]
+
+    # the client drops deleted lines itself; removed only lists lines left without a result
+    out = session.apply([
+        {'op': 'delete', 'line': 5},
+        {'op': 'replace', 'line': 3, 'text': "not a sequent"},
+        {'op': 'replace', 'line': 4, 'text': ""},
+    ])
+    assert out['removed'] == [4]
+    assert [r['line'] for r in out['changed']] == [3]
+    assert session.results() == check_proof("\n".join(session.lines))['results']
+
+def test_fitch_session_patches(fitch_proof):
+    session = FitchSession(fitch_proof)
+    assert session.results() == check_proof(fitch_proof, "fitch")['results']
+
+    out = session.apply([{'op': 'replace', 'line': 4, 'text': " B :EX"}])
+    assert [r['line'] for r in out['changed']] == [4, 5]
+    # deriving B in the outer scope makes the moved line valid too
+    out = session.apply([{'op': 'insert', 'line': 3, 'text': r"B :AE"}])
+    assert [r['line'] for r in out['changed']] == [3, 5]
+    assert out['total_lines'] == 6
+
+def test_bad_patches_leave_session_untouched(sequent_proof):
+    session = SequentSession(sequent_proof)
+    lines = list(session.lines)
+    for patches in ([{'op': 'move', 'line': 1}],
+                    [{'op': 'delete', 'line': 1}, {'op': 'replace', 'line': 4, 'text': ""}],
+                    [{'op': 'insert', 'line': 6, 'text': ""}],
+                    [{'op': 'replace', 'line': 1, 'text': "a\nb"}],
+                    {'op': 'delete', 'line': 1}):
+        with pytest.raises(ValueError):
+            session.apply(patches)
+    assert session.lines == lines
+
+def test_store_ttl_and_line_cap(sequent_proof, fitch_proof):
+    clock = FakeClock()
+    store = SessionStore(ttl=60, max_lines=9, clock=clock)
+    first, result = store.create(sequent_proof)
+    assert result == check_proof(sequent_proof)
+    second, _ = store.create(fitch_proof, "fitch")
+    assert len(store) == 2
+
+    # using a session keeps it alive past the TTL of an idle one
+    clock.now = 50
+    store.patch(first, [{'op': 'delete', 'line': 4}])
+    clock.now = 100
+    assert first in store and second not in store
+    with pytest.raises(KeyError):
+        store.patch(second, [])
+
+    # past the line cap the least recently used session goes first
+    third, _ = store.create(fitch_proof, "fitch")
+    assert len(store) == 2
+    store.patch(first, [{'op': 'insert', 'line': 1, 'text': ""}, {'op': 'insert', 'line': 1, 'text': ""}])
+    assert first in store and third not in store
+
+    assert store.close(first)
+    assert not store.close(first)
+    assert len(store) == 0
+    with pytest.raises(ValueError):
+        store.create(sequent_proof, "tableau")
+
+def test_store_does_not_serialize_sessions(sequent_proof):
+    store = SessionStore()
+    first, _ = store.create(sequent_proof)
+    second, _ = store.create(sequent_proof)
+
+    # while one session is being edited, the others can still be used and closed
+    with store._sessions[first].lock:
+        assert store.patch(second, [{'op': 'delete', 'line': 4}])['valid']
+        assert store.close(first)
+    with pytest.raises(KeyError):
+        store.patch(first, [])
@@ -0,0 +1,32 @@
+import json
+from src.check.proofs import check_proof, iter_sequent_results, iter_fitch_results
+from src.check.stream import ndjson, sse
+
+def test_ndjson_matches_check_proof(sequent_proof):
+    records = [json.loads(line) for line in ndjson(iter_sequent_results(sequent_proof.split("\n")))]
+    expected = check_proof(sequent_proof)
+    assert records[:-1] == expected['results']
+    assert records[-1] == {'done': True, 'valid': False, 'total_lines': 4}
+
+def test_first_result_before_rest_is_read(sequent_proof):
+    read = []
+    def lines():
+        for line in sequent_proof.split("\n"):
+            read.append(line)
+            yield line
+
+    stream = ndjson(iter_sequent_results(lines()))
+    assert json.loads(next(stream))['line'] == 1
+    assert len(read) == 1
+
+def test_sse_events_and_errors(sequent_proof):
+    events = list(sse(iter_sequent_results(sequent_proof.split("\n"))))
+    assert len(events) == 5
+    assert events[0].startswith("event: result\ndata: ") and events[0].endswith("\n\n")
+    assert events[-1].startswith("event: done\n")
+
+    # closing a subproof at the top level fails part way through the stream
+    events = list(sse(iter_fitch_results(["A :AX", "--", "--", "A :AX"])))
+    done = json.loads(events[-1].split("data: ", 1)[1])
+    assert done['done'] and not done['valid'] and done['total_lines'] == 1
+    assert done['error'].startswith("Server error")